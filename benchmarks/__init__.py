@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks dos geradores de planilhas e guias (python -m benchmarks.geradores)"""
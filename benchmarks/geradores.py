@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+"""Benchmark dos quatro geradores com entradas sintéticas
+
+Cada gerador roda em um processo separado, a partir da raiz do repositório,
+com entradas de 10², 10⁴ e 10⁶ linhas (planilhas) ou N seções extras
+(guias em Word). São medidos tempo total, pico de memória (RSS máximo do
+processo) e tamanho do arquivo gerado. O resultado vai para um JSON, que
+pode ser comparado com um resultado anterior para apontar regressões.
+
+Com ``--compression`` cada caso roda uma vez por perfil de compressão
+(relatorios.saida), para comparar tempo e tamanho entre os perfis.
+
+    python -m benchmarks.geradores --sizes 100,10000 --sections 10,100 --output bench.json
+    python -m benchmarks.geradores --compare bench.json
+    python -m benchmarks.geradores --only planilha_apogeu,guia_gaia3 --compression fast,balanced,smallest,store
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from relatorios.fontes import create_sqlite_schema
+from relatorios.saida import COMPRESSION_PROFILES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_SIZES = (100, 10_000, 1_000_000)
+DEFAULT_SECTIONS = (10, 100, 1000)
+DEFAULT_TOLERANCE = 0.25
+
+BENCH_USER = 'bench'
+PLATFORMS = ('google_ads', 'meta_ads', 'tiktok_ads')
+
+
+# ============ ENTRADAS SINTÉTICAS ============
+
+def metrics_database(path, rows):
+    """SQLite com ``rows`` linhas de campaignMetrics (até 365 dias por campanha)"""
+    days = min(rows, 365)
+    campaigns = -(-rows // days)
+    first_day = datetime.datetime(2024, 1, 1, 10)
+
+    connection = sqlite3.connect(path)
+    try:
+        create_sqlite_schema(connection)
+        connection.executemany(
+            'INSERT INTO campaigns (id, userId, name, platform) VALUES (?, ?, ?, ?)',
+            ((f'c{c}', BENCH_USER, f'Campanha {c}', PLATFORMS[c % len(PLATFORMS)]) for c in range(campaigns)),
+        )
+        connection.executemany(
+            'INSERT INTO campaignMetrics (id, campaignId, date, impressions, clicks, conversions, spend, revenue) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (
+                (
+                    f'm{i}', f'c{i // days}', (first_day + datetime.timedelta(days=i % days)).isoformat(sep=' '),
+                    str(1000 + i % 9000), str(10 + i % 400), str(i % 40), f'{50 + i % 500}.{i % 100:02d}',
+                    f'{150 + i % 1500}.{i % 100:02d}',
+                )
+                for i in range(rows)
+            ),
+        )
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def tasks_csv(path, rows):
+    """CSV de tarefas do checklist do APOGEU com ``rows`` linhas"""
+    statuses = ('Pendente', 'Em Progresso', 'Concluído')
+    first_day = datetime.date(2024, 10, 1)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('#,Tarefa,Status,Data Conclusão,Responsável,Observações\n')
+        for i in range(rows):
+            status = statuses[i % 3]
+            done = (first_day + datetime.timedelta(days=i % 90)).strftime('%d/%m/%Y') if status == 'Concluído' else ''
+            f.write(f'{i + 1},Tarefa {i + 1},{status},{done},Equipe {i % 7},\n')
+
+
+def problems_json(path, sections):
+    """JSON com ``sections`` problemas extras para os guias"""
+    problems = [
+        {'titulo': f'Erro sintético {i}', 'passos': [f'Passo {j} do erro {i}' for j in range(1, 5)]}
+        for i in range(sections)
+    ]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(problems, f, ensure_ascii=False)
+
+
+# ============ CASOS ============
+
+def planilha_gaia3(workdir, size, output, mode=None):
+    database = os.path.join(workdir, f'metricas_{size}.db')
+    if not os.path.exists(database):
+        metrics_database(database, size)
+    args = ['gerar_planilha_gaia3.py', '--database', f'sqlite:///{database}', '--output', output]
+    return args + [mode] if mode else args
+
+
+def planilha_gaia3_streaming(workdir, size, output):
+    return planilha_gaia3(workdir, size, output, mode='--streaming')
+
+
+def planilha_gaia3_parallel(workdir, size, output):
+    return planilha_gaia3(workdir, size, output, mode='--parallel')
+
+
+def planilha_apogeu(workdir, size, output):
+    tasks = os.path.join(workdir, f'tarefas_{size}.csv')
+    if not os.path.exists(tasks):
+        tasks_csv(tasks, size)
+    return ['gerar_planilha_excel.py', '--tasks-file', tasks, '--output', output]
+
+
+def guia_gaia3(workdir, sections, output):
+    problems = os.path.join(workdir, f'problemas_{sections}.json')
+    if not os.path.exists(problems):
+        problems_json(problems, sections)
+    return ['gerar_documentacao_gaia3.py', '--problemas', problems, '--output', output]
+
+
+def guia_apogeu(workdir, sections, output):
+    problems = os.path.join(workdir, f'problemas_{sections}.json')
+    if not os.path.exists(problems):
+        problems_json(problems, sections)
+    return ['gerar_guia_word.py', '--problemas', problems, '--output', output]
+
+
+# nome -> (monta os argumentos, extensão, escala: 'rows' ou 'sections')
+CASES = {
+    'planilha_gaia3': (planilha_gaia3, '.xlsx', 'rows'),
+    'planilha_gaia3_streaming': (planilha_gaia3_streaming, '.xlsx', 'rows'),
+    'planilha_gaia3_parallel': (planilha_gaia3_parallel, '.xlsx', 'rows'),
+    'planilha_apogeu': (planilha_apogeu, '.xlsx', 'rows'),
+    'guia_gaia3': (guia_gaia3, '.docx', 'sections'),
+    'guia_apogeu': (guia_apogeu, '.docx', 'sections'),
+}
+
+
+# ============ MEDIÇÃO ============
+
+def measure(args, timeout=None):
+    """Roda ``python args`` na raiz do repositório
+
+    Devolve ``(segundos, pico de RSS em bytes, código de saída, fim do stderr)``.
+    O processo é coletado com os.wait4 para obter o RSS máximo só dele.
+    """
+    with tempfile.TemporaryFile() as stderr:
+        started = time.perf_counter()
+        process = subprocess.Popen([sys.executable] + args, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=stderr)
+        timer = threading.Timer(timeout, process.kill) if timeout else None
+        if timer is not None:
+            timer.start()
+        try:
+            _, status, usage = os.wait4(process.pid, 0)
+        finally:
+            if timer is not None:
+                timer.cancel()
+        seconds = time.perf_counter() - started
+        process.returncode = os.waitstatus_to_exitcode(status)
+
+        stderr.seek(0)
+        error_tail = stderr.read().decode(errors='replace')[-2000:]
+
+    # ru_maxrss: KB no Linux, bytes no macOS
+    peak_rss = usage.ru_maxrss if sys.platform == 'darwin' else usage.ru_maxrss * 1024
+    return seconds, peak_rss, process.returncode, error_tail
+
+
+def run_case(name, size, workdir, timeout=None, compression=None):
+    """Executa um caso (com o perfil de compressão ``compression``, se dado) e devolve o registro do resultado"""
+    build_args, extension, scale = CASES[name]
+    suffix = f'_{compression}' if compression else ''
+    output = os.path.join(workdir, f'{name}_{size}{suffix}{extension}')
+    if os.path.exists(output):
+        os.remove(output)
+
+    args = build_args(workdir, size, output)
+    if compression:
+        args += ['--compression', compression]
+    seconds, peak_rss, returncode, error_tail = measure(args, timeout)
+    result = {
+        'generator': name,
+        scale: size,
+        'compression': compression,
+        'seconds': round(seconds, 4),
+        'peak_rss_mb': round(peak_rss / 2 ** 20, 1),
+        'output_bytes': os.path.getsize(output) if os.path.exists(output) else None,
+        'returncode': returncode,
+    }
+    if returncode != 0:
+        result['error'] = error_tail.strip().splitlines()[-1] if error_tail.strip() else f'código {returncode}'
+    return result
+
+
+def case_key(result):
+    return result['generator'], result.get('rows', result.get('sections')), result.get('compression')
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Casos em que tempo ou pico de memória pioraram mais que ``tolerance``"""
+    previous = {case_key(r): r for r in baseline['results'] if r.get('returncode') == 0}
+    regressions = []
+    for result in results:
+        before = previous.get(case_key(result))
+        if before is None or result.get('returncode') != 0:
+            continue
+        for metric in ('seconds', 'peak_rss_mb'):
+            if before[metric] and result[metric] > before[metric] * (1 + tolerance):
+                regressions.append((case_key(result), metric, before[metric], result[metric]))
+    return regressions
+
+
+def parse_sizes(text):
+    return tuple(int(value) for value in text.split(',') if value.strip())
+
+
+def parse_profiles(text):
+    profiles = tuple(value.strip() for value in text.split(',') if value.strip())
+    unknown = [p for p in profiles if p not in COMPRESSION_PROFILES]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f'perfis desconhecidos: {", ".join(unknown)} (use {", ".join(COMPRESSION_PROFILES)})'
+        )
+    return profiles
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark dos geradores de planilhas e guias')
+    parser.add_argument(
+        '--sizes', type=parse_sizes, default=DEFAULT_SIZES, help='Linhas das entradas das planilhas (ex.: 100,10000)',
+    )
+    parser.add_argument(
+        '--sections', type=parse_sizes, default=DEFAULT_SECTIONS, help='Seções extras dos guias (ex.: 10,100)',
+    )
+    parser.add_argument(
+        '--compression',
+        type=parse_profiles,
+        default=(None,),
+        help='Perfis de compressão separados por vírgula; cada caso roda uma vez por perfil (ex.: fast,smallest)',
+    )
+    parser.add_argument('--only', help='Casos separados por vírgula (padrão: todos): ' + ', '.join(CASES))
+    parser.add_argument('--output', help='Grava os resultados neste JSON')
+    parser.add_argument('--compare', help='JSON de uma execução anterior; sai com erro se houver regressão')
+    parser.add_argument(
+        '--tolerance', type=float, default=DEFAULT_TOLERANCE, help='Piora aceita na comparação (0.25 = 25%%)',
+    )
+    parser.add_argument('--timeout', type=float, help='Tempo máximo por execução, em segundos')
+    parser.add_argument('--workdir', help='Pasta das entradas e saídas (padrão: temporária)')
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.only.split(',')] if args.only else list(CASES)
+    unknown = [n for n in names if n not in CASES]
+    if unknown:
+        parser.error(f'Casos desconhecidos: {", ".join(unknown)}')
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='bench_relatorios_')
+    os.makedirs(workdir, exist_ok=True)
+
+    results = []
+    for name in names:
+        scale = CASES[name][2]
+        for size in args.sizes if scale == 'rows' else args.sections:
+            for compression in args.compression:
+                result = run_case(name, size, workdir, args.timeout, compression)
+                results.append(result)
+                status = '✅' if result['returncode'] == 0 else '❌'
+                print(
+                    f'{status} {name:<26} {scale} {size:>9,} {compression or "":<9} {result["seconds"]:>9.2f}s  '
+                    f'{result["peak_rss_mb"]:>8.1f} MB  {result["output_bytes"] or 0:>12,} bytes'
+                )
+                if 'error' in result:
+                    print(f'   {result["error"]}')
+
+    report = {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for (name, size, compression), metric, before, after in regressions:
+            profile = f', {compression}' if compression else ''
+            print(f'⚠️  Regressão em {name} ({size:,}{profile}): {metric} {before} -> {after}')
+        if regressions:
+            raise SystemExit(1)
+
+    if any(r['returncode'] != 0 for r in results):
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
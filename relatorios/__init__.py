@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+"""Biblioteca compartilhada pelos geradores de planilhas e guias do APOGEU / GAIA 3.0"""
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""Ponto de entrada único dos geradores: python -m relatorios <artefato> [opções]
+
+    python -m relatorios planilha-gaia3 --database sqlite:///app.db --output controle.xlsx
+    python -m relatorios guia-apogeu --output guia.docx
+    python -m relatorios planilha-gaia3 --help
+
+Este módulo só usa a biblioteca padrão. openpyxl, python-docx e NumPy são
+importados pelo gerador escolhido, quando ele roda: ``--help`` e os guias
+em Word não pagam a importação do openpyxl, e as planilhas não pagam a do
+python-docx.
+"""
+
+import importlib
+import sys
+
+# subcomando -> (módulo do gerador em relatorios, descrição)
+ARTIFACTS = {
+    'planilha-gaia3': ('planilha_gaia3', 'Planilha de controle do GAIA 3.0 (.xlsx), também em lote por cliente'),
+    'planilha-apogeu': ('planilha_apogeu', 'Planilha de controle do APOGEU (.xlsx)'),
+    'guia-gaia3': ('guia_gaia3', 'Guia completo do GAIA 3.0 (.docx)'),
+    'guia-apogeu': ('guia_apogeu', 'Guia completo do APOGEU (.docx)'),
+}
+
+
+def usage():
+    lines = [
+        'uso: python -m relatorios <artefato> [opções]',
+        '',
+        'artefatos:',
+    ]
+    lines += [f'  {name:<18} {description}' for name, (_, description) in ARTIFACTS.items()]
+    lines += ['', 'Opções de cada artefato: python -m relatorios <artefato> --help']
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ('-h', '--help'):
+        print(usage())
+        return 0
+    name, options = argv[0], argv[1:]
+    if name not in ARTIFACTS:
+        print(f'Artefato desconhecido: {name}\n\n{usage()}', file=sys.stderr)
+        return 2
+
+    # O módulo do gerador só é importado aqui, depois de escolhido
+    module = importlib.import_module(f'relatorios.{ARTIFACTS[name][0]}')
+    sys.argv[0] = f'python -m relatorios {name}'
+    try:
+        module.main(options)
+    except SystemExit as exc:
+        return exc.code
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
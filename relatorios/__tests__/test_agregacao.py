@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import datetime
+
+import numpy as np
+
+from relatorios.agregacao import Rollup, bucket_starts, period_label, rollup_campaign_metrics, week_series
+from relatorios.decodificacao import MalformedValue
+from relatorios.fontes import DataSource, create_sqlite_schema
+
+
+def test_bucket_starts():
+    days = np.array(['2024-10-20', '2024-10-21', '2024-10-27', '2024-12-31'], dtype='datetime64[D]')
+
+    assert bucket_starts(days, 'week').astype(str).tolist() == ['2024-10-14', '2024-10-21', '2024-10-21', '2024-12-30']
+    assert bucket_starts(days, 'month').astype(str).tolist() == ['2024-10-01', '2024-10-01', '2024-10-01', '2024-12-01']
+    assert period_label(datetime.date(2024, 12, 30), 'week') == '2025-S01'
+
+
+def test_rollup_accumulates_across_batches():
+    rollup = Rollup(measures=('clicks', 'spend'))
+    rollup.add([('c1', 'meta_ads'), ('c2', 'google_ads')], ['2024-10-21', '2024-10-21'], [[10, 150], [5, 100]])
+    rollup.add([('c1', 'meta_ads'), ('c1', 'meta_ads')], ['2024-10-22', '2024-11-04'], [[1, 1], [2, 2]])
+
+    weeks = [(r.start, r.key, r.rows, r.totals.tolist()) for r in rollup.rows('week')]
+    assert weeks == [
+        (datetime.date(2024, 10, 21), ('c1', 'meta_ads'), 2, [11, 151]),
+        (datetime.date(2024, 10, 21), ('c2', 'google_ads'), 1, [5, 100]),
+        (datetime.date(2024, 11, 4), ('c1', 'meta_ads'), 1, [2, 2]),
+    ]
+
+    months = [(t.start, t.groups, t.rows, t.totals.tolist()) for t in rollup.totals('month')]
+    assert months == [
+        (datetime.date(2024, 10, 1), 2, 3, [16, 251]),
+        (datetime.date(2024, 11, 1), 1, 1, [2, 2]),
+    ]
+    assert len(list(rollup.rows('day'))) == 4
+
+
+def test_rows_without_date_are_ignored(tmp_path):
+    rollup = Rollup(measures=('clicks',))
+    rollup.add([('c1', 'meta_ads'), ('c2', 'google_ads')], [None, '2024-10-21'], [[10], [5]])
+    assert [(r.key, r.rows) for r in rollup.rows('week')] == [(('c2', 'google_ads'), 1)]
+
+    with DataSource.from_url(f'sqlite:///{tmp_path / "apogeu.db"}') as source:
+        create_sqlite_schema(source.connection)
+        source.connection.execute(
+            "INSERT INTO campaigns (id, userId, name, platform) VALUES ('c1', 'u1', 'Natal', 'meta_ads')",
+        )
+        source.connection.executemany(
+            'INSERT INTO campaignMetrics (id, campaignId, date, clicks) VALUES (?, ?, ?, ?)',
+            [('m1', 'c1', None, '7'), ('m2', 'c1', '2024-10-22 10:00', '3'), ('m3', 'c1', '2024-10-23 10:00', '4')],
+        )
+        rollup, malformed = rollup_campaign_metrics(source, batch_size=2)
+
+    assert malformed == [MalformedValue('m1', 'date', None)]
+    months = [(t.start, t.rows, t.totals[1]) for t in rollup.totals('month')]
+    assert months == [(datetime.date(2024, 10, 1), 2, 7)]
+
+
+def test_week_series_fills_gaps():
+    days = [datetime.date(2024, 10, 22), None, datetime.date(2024, 11, 6)]
+
+    assert week_series(days, min_weeks=4) == [
+        (datetime.date(2024, 10, 21), 1),
+        (datetime.date(2024, 10, 28), 0),
+        (datetime.date(2024, 11, 4), 1),
+        (datetime.date(2024, 11, 11), 0),
+    ]
+    assert week_series([], min_weeks=4) == []
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+from openpyxl import Workbook
+
+from relatorios.amostragem import chart_source, lttb_indices, minmax_indices
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    x = np.arange(1000, dtype=np.float64)
+    y = np.sin(x / 50)
+    y[437] = 25.0
+
+    indices = lttb_indices(x, y, 100)
+
+    assert len(indices) == 100
+    assert indices[0] == 0 and indices[-1] == 999
+    assert (np.diff(indices) > 0).all()
+    assert 437 in indices
+
+
+def test_minmax_keeps_extremes():
+    y = np.zeros(1000)
+    y[10], y[990] = -7.0, 9.0
+
+    indices = minmax_indices(y, 50)
+
+    assert 10 in indices and 990 in indices
+    assert len(indices) <= 50
+
+
+def test_chart_source_only_when_over_budget(tmp_path):
+    wb = Workbook(write_only=True)
+    wb.create_sheet('Métricas').append(['Data', 'ROI %'])
+
+    assert chart_source(wb, 'Reduzido', ['Data', 'ROI %'], range(10), range(10), budget=20) is None
+    assert wb.sheetnames == ['Métricas']
+
+    data, categories = chart_source(wb, 'Reduzido', ['Data', 'ROI %'], range(1000), range(1000), budget=20)
+    ws = wb['Reduzido']
+    assert ws.sheet_state == 'hidden'
+    assert (data.min_row, data.max_row) == (1, 21)
+    assert (categories.min_col, categories.min_row, categories.max_row) == (1, 2, 21)
+    wb.save(tmp_path / 'reduzido.xlsx')
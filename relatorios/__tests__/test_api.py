@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+import datetime
+import io
+import zipfile
+
+from docx import Document
+from openpyxl import load_workbook
+
+from relatorios import guia_apogeu, guia_gaia3, planilha_apogeu, planilha_gaia3
+
+METRICS = [
+    (datetime.date(2024, 11, 1), 2, 1000, 50, 5, 100.0, 300.0),
+    (datetime.date(2024, 11, 2), 2, 2000, 80, 8, 150.0, 450.0),
+]
+
+
+def test_spreadsheet_to_bytes_file_and_path(tmp_path):
+    content = planilha_gaia3.build_workbook(metrics=METRICS)
+    buffer = io.BytesIO()
+    assert planilha_gaia3.build_workbook(buffer, metrics=METRICS) is None
+    planilha_gaia3.build_workbook(tmp_path / 'controle.xlsx', metrics=METRICS)
+
+    assert zipfile.is_zipfile(io.BytesIO(content))
+    for source in (io.BytesIO(content), io.BytesIO(buffer.getvalue()), tmp_path / 'controle.xlsx'):
+        ws = load_workbook(source)['Métricas']
+        assert ws.max_row == len(METRICS) + 1
+        assert ws['C3'].value == 2000
+
+
+def test_spreadsheet_with_given_checklist():
+    checklist = [
+        ('1', 'Tarefa A', 'Concluído', '01/11/2024', 'Ana', ''),
+        ('2', 'Tarefa B', 'Pendente', '', 'Bia', ''),
+    ]
+    ws = load_workbook(io.BytesIO(planilha_apogeu.build_workbook(checklist=checklist))).active
+
+    assert ws['B6'].value == 'Tarefa A'
+    assert ws['B7'].value == 'Tarefa B'
+
+
+def test_status_colours_are_conditional_rules():
+    checklist = [('1', 'Tarefa A', 'Concluído', '01/11/2024', 'Ana', ''), ('2', 'Tarefa B', 'Pendente', '', 'Bia', '')]
+    ws = load_workbook(io.BytesIO(planilha_apogeu.build_workbook(checklist=checklist))).active
+
+    # Mesmo estilo base em toda a coluna; a cor vem das regras da aba
+    assert ws['C6'].style == ws['C7'].style == 'bordered-left'
+    rules = {str(cf.sqref): [r.formula for r in cf.rules] for cf in ws.conditional_formatting}
+    assert rules['C6:C7'] == [['"Concluído"'], ['"Em Progresso"']]
+
+
+def test_documents_with_extra_problems():
+    extra_problems = [('Erro de teste', ['Primeiro passo', 'Segundo passo'])]
+
+    for module in (guia_gaia3, guia_apogeu):
+        doc = Document(io.BytesIO(module.build_document(extra_problems=extra_problems)))
+        text = '\n'.join(p.text for p in doc.paragraphs)
+        assert 'Erro de teste' in text and 'Segundo passo' in text
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+import io
+import os
+import zipfile
+
+from openpyxl import load_workbook
+
+from relatorios import guia_apogeu, planilha_apogeu
+from relatorios.armazem import ArtifactStore, content_digest, input_fingerprint
+
+
+def package(core, body=b'<conteudo/>'):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('docProps/core.xml', core)
+        archive.writestr('xl/workbook.xml', body)
+    return buffer.getvalue()
+
+
+def test_identical_outputs_are_stored_once(tmp_path):
+    first, second = package('<criado>10:00</criado>'), package('<criado>10:01</criado>')
+    assert first != second and content_digest(first) == content_digest(second)
+    assert content_digest(package('', b'<outro/>')) != content_digest(first)
+
+    with ArtifactStore(str(tmp_path)) as store:
+        store.put('planilha-gaia3', 'u1', 'a', first)
+        store.put('planilha-gaia3', 'u2', 'a', second)
+        assert store.get('planilha-gaia3', 'u2', 'a') == first
+        assert store.get('planilha-gaia3', 'u3', 'a') is None
+        assert store.stats() == {'entries': 2, 'objects': 1, 'bytes': len(first), 'max_bytes': store.max_bytes}
+
+
+def test_compression_profiles_are_different_contents(tmp_path):
+    smallest = guia_apogeu.build_document(compression='smallest')
+    stored = guia_apogeu.build_document(compression='store')
+    assert content_digest(stored) != content_digest(smallest)
+    assert content_digest(stored) == content_digest(guia_apogeu.build_document(compression='store'))
+
+    with ArtifactStore(str(tmp_path)) as store:
+        store.put('guia-apogeu', None, 'fp-smallest', smallest)
+        store.put('guia-apogeu', None, 'fp-store', stored)
+        assert store.get('guia-apogeu', None, 'fp-smallest') == smallest
+        assert store.get('guia-apogeu', None, 'fp-store') == stored
+        assert store.stats()['bytes'] == len(smallest) + len(stored)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    contents = {name: name.encode() * 100 for name in 'abc'}
+    with ArtifactStore(str(tmp_path), max_bytes=250) as store:
+        store.put('guia-apogeu', None, 'a', contents['a'])
+        store.put('guia-apogeu', None, 'b', contents['b'])
+        assert store.get('guia-apogeu', None, 'a') == contents['a']
+        store.put('guia-apogeu', None, 'c', contents['c'])
+
+        assert store.get('guia-apogeu', None, 'b') is None
+        assert store.get('guia-apogeu', None, 'a') == contents['a']
+        assert store.stats()['bytes'] == 200
+        assert store.put('guia-apogeu', None, 'd', b'd' * 300) is None
+
+    # O limite fica gravado no armazém
+    with ArtifactStore(str(tmp_path)) as store:
+        assert store.max_bytes == 250
+        assert sum(len(files) for _, _, files in os.walk(tmp_path / 'objetos')) == 2
+
+
+def test_fingerprint_follows_the_inputs(tmp_path):
+    tasks = tmp_path / 'tarefas.csv'
+    tasks.write_text('#,Tarefa\n1,Instalar\n', encoding='utf-8')
+    before = input_fingerprint({'compression': None}, files=[str(tasks)])
+    assert input_fingerprint({'compression': None}, files=[str(tasks), None]) == before
+    assert input_fingerprint({'compression': 'fast'}, files=[str(tasks)]) != before
+
+    tasks.write_text('#,Tarefa\n1,Instalar\n2,Configurar\n', encoding='utf-8')
+    assert input_fingerprint({'compression': None}, files=[str(tasks)]) != before
+    assert input_fingerprint({}, database='mysql://app@localhost/apogeu') is None
+    assert input_fingerprint({}, database='mysql://app@localhost/apogeu', version='v1') is not None
+
+
+def test_cli_serves_unchanged_spreadsheet_from_store(tmp_path, capsys):
+    output = tmp_path / 'controle.xlsx'
+    argv = ['--output', str(output), '--store', str(tmp_path / 'armazem')]
+    planilha_apogeu.main(argv)
+    first = output.read_bytes()
+    output.unlink()
+    assert 'armazém' not in capsys.readouterr().out
+
+    planilha_apogeu.main(argv)
+    assert 'servida do armazém' in capsys.readouterr().out
+    assert output.read_bytes() == first
+    assert load_workbook(output)['Checklist Desenvolvimento']['B6'].value
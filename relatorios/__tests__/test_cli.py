@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Tempo máximo de python -m relatorios --help além do interpretador vazio
+COLD_START_BUDGET = 0.15
+
+
+def run(*args, importtime=False):
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + list(args)
+    return subprocess.run(command, cwd=ROOT, capture_output=True, text=True, env={**os.environ, 'PYTHONPATH': ROOT})
+
+
+def imported(stderr):
+    """Pacotes de topo importados, a partir da saída de -X importtime"""
+    return {line.rsplit('|', 1)[-1].strip().split('.')[0] for line in stderr.splitlines() if line.startswith('import time:')}
+
+
+def best_of(args, repeat=5):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run(*args)
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def test_help_lists_artifacts_without_heavy_imports():
+    result = run('-m', 'relatorios', '--help', importtime=True)
+
+    assert result.returncode == 0
+    assert 'planilha-gaia3' in result.stdout and 'guia-apogeu' in result.stdout
+    assert not imported(result.stderr) & {'openpyxl', 'docx', 'numpy', 'lxml'}
+
+
+def test_guide_does_not_import_openpyxl(tmp_path):
+    result = run('-m', 'relatorios', 'guia-gaia3', '--output', str(tmp_path / 'guia.docx'), importtime=True)
+
+    assert result.returncode == 0
+    assert (tmp_path / 'guia.docx').stat().st_size > 0
+    modules = imported(result.stderr)
+    assert 'docx' in modules
+    assert not modules & {'openpyxl', 'numpy'}
+
+
+def test_spreadsheet_does_not_import_docx(tmp_path):
+    result = run('-m', 'relatorios', 'planilha-apogeu', '--output', str(tmp_path / 'controle.xlsx'), importtime=True)
+
+    assert result.returncode == 0
+    modules = imported(result.stderr)
+    assert 'openpyxl' in modules
+    assert 'docx' not in modules
+
+
+def test_unknown_artifact():
+    result = run('-m', 'relatorios', 'relatorio-inexistente')
+
+    assert result.returncode == 2
+    assert 'Artefato desconhecido' in result.stderr
+
+
+def test_cold_start_time():
+    interpreter = best_of(['-c', 'pass'])
+    cli = best_of(['-m', 'relatorios', '--help'])
+
+    assert cli - interpreter < COLD_START_BUDGET, f'python -m relatorios --help: {cli:.3f}s (interpretador {interpreter:.3f}s)'
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+import datetime
+import io
+
+from openpyxl import load_workbook
+from openpyxl.utils.datetime import from_excel
+
+from relatorios import planilha_gaia3
+from relatorios.datas import DATE_FORMAT, to_excel_date
+
+
+def test_serial_numbers():
+    assert to_excel_date(datetime.date(2024, 10, 22)) == 45587
+    assert to_excel_date('22/10/2024') == 45587
+    assert to_excel_date(None) is None and to_excel_date('') is None
+
+    # Época em 30/12/1899: compensa o 29/02/1900 inexistente que o Excel conta
+    assert to_excel_date(datetime.date(1900, 3, 1)) == 61
+    assert from_excel(61) == datetime.datetime(1900, 3, 1)
+
+
+def test_datetime_keeps_only_the_day():
+    assert to_excel_date(datetime.datetime(2024, 10, 22, 23, 59)) == to_excel_date(datetime.date(2024, 10, 22))
+    assert isinstance(to_excel_date(datetime.datetime(2024, 10, 22, 12)), int)
+
+
+def test_metrics_dates_are_date_cells():
+    ws = load_workbook(io.BytesIO(planilha_gaia3.build_workbook()))['Métricas']
+
+    cells = [row[0] for row in ws.iter_rows(min_row=2)]
+    assert [cell.value.date() for cell in cells] == [row[0] for row in planilha_gaia3.metrics_data]
+    assert all(cell.is_date and cell.number_format == DATE_FORMAT for cell in cells)
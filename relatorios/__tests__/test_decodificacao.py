@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+from relatorios.decodificacao import decode_columns, decode_counts, decode_money
+
+
+def test_money_accepts_backend_and_brazilian_formats():
+    decoded = decode_money(['4230.5', 'R$ 1.234,56', 'R$\xa0987,1', '12,345', '-3.10', '0.005'])
+
+    assert decoded.values.tolist() == [423050, 123456, 98710, 1235, -310, 1]
+    assert decoded.errors == []
+
+
+def test_empty_and_null_are_zero():
+    decoded = decode_money(['', None, '  '])
+
+    assert decoded.values.tolist() == [0, 0, 0]
+    assert decoded.errors == []
+
+
+def test_counts_treat_three_digit_groups_as_thousands():
+    decoded = decode_counts(['125430', '125.430', '1.234.567', '3847.0'])
+
+    assert decoded.values.tolist() == [125430, 125430, 1234567, 3847]
+
+
+def test_malformed_values_are_reported_not_raised():
+    decoded = decode_money(['10', 'abc', '1-2', '-', '9' * 20])
+
+    assert decoded.values.tolist() == [1000, 0, 0, 0, 0]
+    assert decoded.errors == [1, 2, 3, 4]
+
+
+def test_mixed_separators_must_be_brazilian_thousands():
+    decoded = decode_money(['1,234.56', 'R$ 1,234.56', '1.234,56', '12.34,5', '1.234.567,8', '1.2345,6'])
+
+    assert decoded.values.tolist() == [0, 0, 123456, 0, 123456780, 0]
+    assert decoded.errors == [0, 1, 3, 5]
+    assert decode_counts(['1,234.56', '1.234']).errors == [0]
+
+
+def test_only_ascii_digits_are_numbers():
+    decoded = decode_counts(['12', '1²', '²', '٣٤', '12.5²'])
+
+    assert decoded.values.tolist() == [12, 0, 0, 0, 0]
+    assert decoded.errors == [1, 2, 3, 4]
+
+
+def test_decode_columns_reports_rows_by_key():
+    columns = ('id', 'clicks', 'spend')
+    rows = [('m1', '10', '1.50'), ('m2', 'x', '2,00')]
+
+    arrays, errors = decode_columns(rows, columns)
+
+    assert arrays['clicks'].tolist() == [10, 0]
+    assert arrays['spend'].tolist() == [150, 200]
+    assert [(e.row, e.column, e.raw) for e in errors] == [('m2', 'clicks', 'x')]
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+import io
+
+from openpyxl import Workbook, load_workbook
+
+from relatorios.estilos import GAIA3_PALETTE, HEADER, PENDING, build_styles, register_styles
+
+STYLE_NAMES = [style.name for style in build_styles(GAIA3_PALETTE)]
+
+
+def test_register_styles_is_idempotent():
+    wb = Workbook()
+    register_styles(wb, GAIA3_PALETTE)
+    named = list(wb.named_styles)
+    register_styles(wb, GAIA3_PALETTE)
+
+    assert list(wb.named_styles) == named
+    assert set(STYLE_NAMES) <= set(named)
+
+
+def test_named_styles_are_saved():
+    wb = Workbook()
+    register_styles(wb, GAIA3_PALETTE)
+    for row in range(1, 1001):
+        wb.active.cell(row=row, column=1, value=row).style = HEADER
+    wb.active['B1'].style = PENDING
+    buffer = io.BytesIO()
+    wb.save(buffer)
+
+    saved = load_workbook(buffer)
+    assert set(STYLE_NAMES) <= set(saved.named_styles)
+    assert saved.active['A1000'].style == HEADER and saved.active['B1'].style == PENDING
+    assert saved.active['A1'].fill.start_color.rgb == '00' + GAIA3_PALETTE[HEADER]
+    # Um estilo nomeado por nome, não um registro de estilo por célula
+    assert len(saved._cell_styles) < 10
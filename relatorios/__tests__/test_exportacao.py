@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+import datetime
+import io
+
+import pytest
+
+from relatorios.exportacao import ColumnTable, export_table, write_csv
+
+ROWS = [
+    (datetime.date(2024, 10, 22), 3, 125430, 4230.50),
+    (datetime.date(2024, 10, 23), 3, 145230, 4890.75),
+    (datetime.date(2024, 10, 24), 4, 165890, 5234.25),
+]
+
+
+def test_table_from_rows_in_chunks():
+    table = ColumnTable.from_rows(('date', 'campaigns', 'impressions', 'spend'), iter(ROWS), chunk_size=2)
+
+    assert len(table) == 3
+    assert str(table['date'].dtype) == 'datetime64[D]'
+    assert table['impressions'].tolist() == [125430, 145230, 165890]
+    assert list(table.rows(chunk_size=2)) == ROWS
+
+
+def test_column_type_comes_from_non_null_values():
+    rows = [(None, 1), (datetime.date(2024, 10, 23), 2)]
+    table = ColumnTable.from_rows(('date', 'campaigns'), rows)
+
+    assert str(table['date'].dtype) == 'datetime64[D]'
+    assert list(table.rows()) == rows
+
+
+def test_write_csv():
+    table = ColumnTable.from_rows(('date', 'campaigns', 'impressions', 'spend'), ROWS)
+    buffer = io.StringIO()
+
+    write_csv(table, buffer, chunk_size=2)
+
+    assert buffer.getvalue().splitlines() == [
+        'date,campaigns,impressions,spend',
+        '2024-10-22,3,125430,4230.5',
+        '2024-10-23,3,145230,4890.75',
+        '2024-10-24,4,165890,5234.25',
+    ]
+
+
+def test_export_parquet(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    table = ColumnTable.from_rows(('date', 'campaigns', 'impressions', 'spend'), ROWS)
+
+    export_table(table, {'csv': tmp_path / 'm.csv', 'parquet': tmp_path / 'm.parquet'}, chunk_size=2)
+
+    loaded = pq.read_table(tmp_path / 'm.parquet')
+    assert loaded.num_rows == 3
+    assert loaded.column('spend').to_pylist() == [4230.50, 4890.75, 5234.25]
+    assert (tmp_path / 'm.csv').read_text(encoding='utf-8').count('\n') == 4
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+import datetime
+import sqlite3
+
+import pytest
+
+from relatorios.fontes import DataSource, create_sqlite_schema
+
+
+@pytest.fixture
+def source(tmp_path):
+    source = DataSource.from_url(f'sqlite:///{tmp_path / "apogeu.db"}')
+    create_sqlite_schema(source.connection)
+    source.connection.executemany(
+        'INSERT INTO campaigns (id, userId, name, platform) VALUES (?, ?, ?, ?)',
+        [('c1', 'u1', 'Black Friday', 'google_ads'), ('c2', 'u1', 'Natal', 'meta_ads'), ('c3', 'u2', 'Outra', 'tiktok_ads')],
+    )
+    source.connection.executemany(
+        'INSERT INTO campaignMetrics (id, campaignId, date, impressions, clicks, spend) VALUES (?, ?, ?, ?, ?, ?)',
+        [
+            (f'm{i}', campaign, f'2024-10-{22 + i % 3} 10:00:00', str(1000 + i), str(10 + i), '12.50')
+            for i, campaign in enumerate(['c1', 'c2', 'c3'] * 3)
+        ],
+    )
+    source.connection.commit()
+    yield source
+    source.close()
+
+
+def test_schema_matches_drizzle_defaults(source):
+    row = next(source.rows('SELECT conversions, revenue, createdAt FROM campaignMetrics'))
+
+    assert row[:2] == ('0', '0')
+    assert isinstance(row[2], datetime.datetime)
+
+
+def test_timestamps_are_parsed_without_a_global_converter(source):
+    # O conversor padrão do sqlite3 continua o mesmo para as outras conexões do processo
+    assert sqlite3.converters['TIMESTAMP'].__module__ == 'sqlite3.dbapi2'
+
+    rows = list(source.rows('SELECT id, date, createdAt FROM campaignMetrics ORDER BY id'))
+    assert rows[0][:2] == ('m0', datetime.datetime(2024, 10, 22, 10))
+    assert all(isinstance(row[2], datetime.datetime) for row in rows)
+
+
+def test_campaign_metrics_are_fetched_in_fixed_batches(source):
+    batches = list(source.campaign_metrics_batches(batch_size=4))
+
+    assert [len(batch) for batch in batches] == [4, 4, 1]
+
+
+def test_campaign_metrics_filters_by_user_and_orders_by_date(source):
+    rows = list(source.campaign_metrics(user_id='u1', batch_size=2))
+
+    assert len(rows) == 6
+    assert {row[0] for row in rows} == {'c1', 'c2'}
+    assert [row[2] for row in rows] == sorted(row[2] for row in rows)
+    assert rows[0][1] == 'google_ads'
+    assert isinstance(rows[0][2], datetime.datetime)
+
+
+def test_campaign_metrics_date_range(source):
+    rows = list(source.campaign_metrics(start=datetime.date(2024, 10, 23), end=datetime.date(2024, 10, 24)))
+
+    assert {row[2].date() for row in rows} == {datetime.date(2024, 10, 23)}
+
+
+def test_table_batches_by_user(source):
+    campaigns = list(source.campaigns(user_id='u2'))
+
+    assert [c[0] for c in campaigns] == ['c3']
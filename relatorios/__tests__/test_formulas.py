@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+import io
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from relatorios import planilha_apogeu
+from relatorios.formulas import CachedFormulas, Evaluator, UnsupportedFormula
+
+
+def test_formulas_are_saved_with_cached_values():
+    wb = Workbook()
+    ws = wb.active
+    ws.append([1, 2])
+    ws['C1'] = '=A1+B1'
+    ws['D1'] = '=IF(C1>2,"alto & <baixo>","")'
+    ws['E1'] = '=C1>2'
+    ws['F1'] = '=1/0'
+    ws['G1'] = '=VLOOKUP(A1,A1:B1,2)'
+    formulas = CachedFormulas(wb)
+    formulas.cache(ws['G1'], 2)
+    buffer = io.BytesIO()
+    formulas.save(buffer)
+
+    assert load_workbook(buffer)['Sheet']['C1'].value == '=A1+B1'
+    cached = load_workbook(buffer, data_only=True)['Sheet']
+    assert [cell.value for cell in cached[1]] == [1, 2, 3, 'alto & <baixo>', True, '#DIV/0!', 2]
+
+
+def test_evaluator_subset():
+    wb = Workbook()
+    data = wb.active
+    data.title = 'Dados'
+    for value in (3, 'Concluído', 'concluído', None, 'a*b', 4.5, True):
+        data.append([value])
+    other = wb.create_sheet("Resumo d'aba")
+    other['A1'] = '=SUM(Dados!A1:A7)*2'
+    evaluator = Evaluator(wb)
+
+    cases = {
+        '=1+2*3-4/2': 5,
+        '=-2^2': 4,
+        '=50%&"!"': '0.5!',
+        '=SUM(Dados!A:A, 1, "2")': 10.5,
+        '=AVERAGE(Dados!$A$1:$A$7)': 3.75,
+        '=COUNTIF(Dados!A1:A7,"Concluído")': 2,
+        '=COUNTIF(Dados!A1:A7,"conc*")': 2,
+        '=COUNTIF(Dados!A1:A7,"a~*b")': 1,
+        '=COUNTIF(Dados!A1:A7,">=3")': 2,
+        '=COUNTIF(Dados!A1:A7,"<>")': 6,
+        '=ROWS(Dados!A1:A7)': 7,
+        '=IF(Dados!A1>2,"sim","não")': 'sim',
+        '=Dados!A4': 0,
+        "='Resumo d''aba'!A1/3": 5,
+    }
+    for formula, expected in cases.items():
+        assert evaluator.evaluate(formula, data) == expected, formula
+    with pytest.raises(UnsupportedFormula):
+        evaluator.evaluate('=VLOOKUP(1,A1:B2,2)', data)
+
+
+def test_apogeu_summary_counts_are_live_formulas():
+    checklist = [
+        ('1', 'Tarefa A', 'Concluído', '01/11/2024', 'Ana', ''),
+        ('2', 'Tarefa B', 'Em Progresso', '', 'Bia', ''),
+        ('3', 'Tarefa C', 'Pendente', '', 'Caio', ''),
+        ('4', 'Tarefa D', 'Pendente', '', 'Duda', ''),
+    ]
+    content = planilha_apogeu.build_workbook(checklist=checklist)
+    formulas = load_workbook(io.BytesIO(content))
+    values = load_workbook(io.BytesIO(content), data_only=True)
+
+    # FASE 2 começa duas linhas após o checklist (linhas 6 a 9)
+    assert formulas.active['B14'].value == '=COUNTIF($C$6:$C$9,"Concluído")'
+    assert [row[1:3] for row in values.active.iter_rows(min_row=14, max_row=17, values_only=True)] == [
+        (1, 0.25), (1, 0.25), (2, 0.5), (1, 0.25),
+    ]
+    charts = values['Gráficos e Análises']
+    assert [charts[f'B{row}'].value for row in (4, 5, 6)] == [1, 1, 2]
+    assert formulas['Gráficos e Análises']['B6'].value == "=ROWS('Checklist Desenvolvimento'!$C$6:$C$9)-B4-B5"
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+import json
+
+from docx import Document
+from openpyxl import Workbook
+
+from relatorios import instrumentacao
+from relatorios.instrumentacao import DISABLED, Profiler, count
+
+
+def test_sections_record_time_memory_and_items():
+    profiler = Profiler()
+    wb = Workbook()
+
+    with profiler.section('Aba', wb):
+        for row in range(10):
+            wb.active.append([row, row * 2])
+        with profiler.section('Explícita'):
+            count(5)
+            buffer = [0] * 100_000
+            del buffer
+    profiler.finish()
+
+    inner, outer = profiler.records
+    assert (inner['section'], inner['depth'], inner['items']) == ('Explícita', 1, 5)
+    assert inner['peak_kb'] >= 700
+    assert (outer['section'], outer['depth'], outer['items']) == ('Aba', 0, 25)
+    assert outer['peak_kb'] >= inner['peak_kb']
+    assert outer['wall_s'] >= inner['wall_s'] >= 0
+    assert instrumentacao._active is None
+
+
+def test_mark_splits_flat_scripts(tmp_path):
+    profiler = Profiler(trace_memory=False)
+    doc = Document()
+
+    profiler.mark('CAPA', doc)
+    doc.add_heading('Título', level=0)
+    profiler.mark('CORPO', doc)
+    for i in range(3):
+        doc.add_paragraph(f'Parágrafo {i}')
+    profiler.report(tmp_path / 'perfil.json')
+
+    sections = json.loads((tmp_path / 'perfil.json').read_text(encoding='utf-8'))['sections']
+    assert [(s['section'], s['items']) for s in sections] == [('CAPA', 1), ('CORPO', 3)]
+
+
+def test_disabled_is_a_no_op():
+    with DISABLED.section('Nada'):
+        count(10)
+    DISABLED.mark('Nada')
+    DISABLED.finish()
+
+    assert DISABLED.records == []
+
+
+def test_notes_go_to_summary_and_json(tmp_path):
+    profiler = Profiler(trace_memory=False)
+    profiler.note('Textos por coluna', [{'column': 'B', 'strategy': 'shared'}])
+    profiler.report(str(tmp_path / 'perfil.json'))
+
+    assert 'column=B strategy=shared' in profiler.summary()
+    notes = json.loads((tmp_path / 'perfil.json').read_text(encoding='utf-8'))['notes']
+    assert notes == {'Textos por coluna': [{'column': 'B', 'strategy': 'shared'}]}
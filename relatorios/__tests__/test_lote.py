@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+
+import pytest
+
+from relatorios.lote import format_summary, run_batch, tenant_path, write_summary
+
+FILENAME = 'controle_{tenant}.txt'
+
+
+def build_tenant(tenant, path):
+    if tenant == 'queda':
+        os._exit(1)
+    if tenant == 'erro':
+        raise ValueError('dados inválidos')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(tenant)
+
+
+def test_crashing_tenant_fails_alone(tmp_path):
+    tenants = ['t1', 't2', 'queda', 't3', 'erro', 't4', 't5', 't6']
+    summary = run_batch(build_tenant, tenants, str(tmp_path), FILENAME, workers=2)
+
+    assert (summary.succeeded, summary.failed) == (6, 2)
+    errors = {r.tenant: r.error for r in summary.results if r.error}
+    assert set(errors) == {'queda', 'erro'}
+    assert 'BrokenProcessPool' in errors['queda'] and 'dados inválidos' in errors['erro']
+    for tenant in ('t1', 't3', 't6'):
+        assert (tmp_path / f'controle_{tenant}.txt').read_text(encoding='utf-8') == tenant
+
+
+def test_summary_counts(tmp_path):
+    summary = run_batch(build_tenant, ['a', 'b', 'erro', 'a'], str(tmp_path), FILENAME, workers=2)
+
+    assert (len(summary.results), summary.succeeded, summary.failed) == (3, 2, 1)
+    text = format_summary(summary)
+    assert '✅ 2 gerados   ❌ 1 com erro' in text and '❌ erro: ValueError: dados inválidos' in text
+    write_summary(summary, str(tmp_path / 'lote.json'))
+    data = json.loads((tmp_path / 'lote.json').read_text(encoding='utf-8'))
+    assert (data['succeeded'], data['failed'], len(data['tenants'])) == (2, 1, 3)
+
+
+def test_sanitized_tenants_do_not_share_a_file(tmp_path):
+    paths = {tenant_path('saida', FILENAME, tenant) for tenant in ('a/b', 'a_b', 'a:b')}
+    assert len(paths) == 3
+    assert tenant_path('saida', FILENAME, 'a_b') == os.path.join('saida', 'controle_a_b.txt')
+
+    with pytest.raises(ValueError, match='mesmo arquivo'):
+        run_batch(build_tenant, [1, '1'], str(tmp_path), FILENAME)
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from relatorios.metricas import derive_metrics, derive_rows
+
+
+def test_matches_calculate_advanced_metrics():
+    metrics = derive_metrics([125430], [3847], [287], [4230.50], [14320.00])
+
+    assert metrics['ctr'].tolist() == [3.07]
+    assert metrics['cpc'].tolist() == [1.1]
+    assert metrics['cpa'].tolist() == [14.74]
+    assert metrics['roas'].tolist() == [3.38]
+    assert metrics['roi'].tolist() == [238.49]
+    assert metrics['conversion_rate'].tolist() == [7.46]
+    assert metrics['cpm'].tolist() == [33.73]
+    # CTR 3.07 (+20), CPC 1.10 (+10), conversão 7.46 (+20)
+    assert metrics['quality_score'].tolist() == [100]
+
+
+def test_division_by_zero_yields_zero():
+    metrics = derive_metrics([0, 100], [0, 0], [0, 0], [0, 50], [10, 0])
+
+    for name in ('ctr', 'cpc', 'cpa', 'roas', 'roi', 'cpm'):
+        assert np.isfinite(metrics[name]).all()
+    assert metrics['roas'].tolist() == [0.0, 0.0]
+    assert metrics['roi'].tolist() == [0.0, -100.0]
+    assert metrics['cpm'].tolist() == [0.0, 500.0]
+
+
+def test_derive_rows_appends_metrics_across_chunks():
+    rows = [('d%d' % i, 1000, 10, 1, 5.0, 20.0) for i in range(5)]
+
+    result = list(derive_rows(rows, raw_columns=(1, 2, 3, 4, 5), derived=('roi', 'ctr'), chunk_size=2))
+
+    assert len(result) == 5
+    assert result[0] == ('d0', 1000, 10, 1, 5.0, 20.0, 300.0, 1.0)
+    assert [row[0] for row in result] == ['d0', 'd1', 'd2', 'd3', 'd4']
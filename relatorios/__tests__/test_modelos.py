@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+import io
+
+from openpyxl import load_workbook
+from openpyxl.styles import Alignment, Font
+
+from relatorios.estilos import BORDERED_WRAP, HEADER, register_styles
+from relatorios.modelos import WorkbookTemplate
+
+
+def draw(wb):
+    ws = wb.active
+    ws.title = 'Notas'
+    ws['A1'] = 'NOTAS'
+    ws['A1'].font = Font(bold=True, size=16)
+    ws['A1'].alignment = Alignment(horizontal='center')
+    ws.merge_cells('A1:D1')
+    ws.row_dimensions[1].height = 30
+    ws.column_dimensions['B'].width = 80
+    for row in range(3, 6):
+        ws.cell(row=row, column=1).style = BORDERED_WRAP
+    wb.create_sheet('Dados')
+
+
+def _save(wb):
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def test_clone_keeps_static_content_and_styles():
+    template = WorkbookTemplate(draw, register_styles)
+    wb = template.clone()
+    wb['Dados'].append(['Data', 'Valor'])
+    wb['Dados']['A1'].style = HEADER
+
+    saved = load_workbook(io.BytesIO(_save(wb)))
+    notes = saved['Notas']
+    assert saved.sheetnames == ['Notas', 'Dados']
+    assert notes['A1'].value == 'NOTAS' and notes['A1'].font.b and notes['A1'].alignment.horizontal == 'center'
+    assert [str(r) for r in notes.merged_cells.ranges] == ['A1:D1']
+    assert notes.row_dimensions[1].height == 30 and notes.column_dimensions['B'].width == 80
+    assert notes['A4'].style == BORDERED_WRAP and notes['A4'].border.left.style == 'thin'
+    assert saved['Dados']['A1'].style == HEADER
+
+
+def test_named_styles_belong_to_the_clone():
+    template = WorkbookTemplate(draw, register_styles)
+    wb = template.clone()
+
+    assert list(wb.named_styles) == list(template.source.named_styles)
+    assert all(style._wb is wb for style in wb._named_styles)
+
+
+def test_clones_are_independent():
+    template = WorkbookTemplate(draw, register_styles)
+    first = template.clone()
+    first['Notas']['A3'] = 'Só nesta cópia'
+    first['Notas']['A3'].font = Font(italic=True)
+
+    second = template.clone()
+    assert second['Notas']['A3'].value is None
+    assert template.source['Notas']['A3'].value is None
+    assert len(template.source._fonts) == len(second._fonts) < len(first._fonts)
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+import datetime
+import io
+import random
+import zipfile
+import zlib
+
+from openpyxl import Workbook, load_workbook
+
+from relatorios import planilha_gaia3
+from relatorios.estilos import BORDERED, HEADER, register_styles
+from relatorios import paralelo
+from relatorios.paralelo import INLINE, SHARED, ParallelWorkbook, ZipWriter, crc32_combine
+
+
+def numbered_cells(start, stop):
+    for n in range(start, stop):
+        yield [(n, BORDERED), (f'linha {n} <&>', None), (n / 4, BORDERED)]
+
+
+def test_crc32_combine():
+    for _ in range(20):
+        first, second = random.randbytes(random.randint(0, 3000)), random.randbytes(random.randint(0, 3000))
+        assert crc32_combine(zlib.crc32(first), zlib.crc32(second), len(second)) == zlib.crc32(first + second)
+
+
+class Pipe(io.RawIOBase):
+    """Destino sem seek nem tell (como um socket)"""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.data += data
+        return len(data)
+
+
+def test_zip_writer_without_seek(monkeypatch):
+    # Limite baixo: as entradas maiores usam os campos Zip64, como acima de 4 GiB
+    monkeypatch.setattr(paralelo, '_ZIP64_LIMIT', 300)
+    first, second = b'<a/>' * 100, 'ação'.encode() * 10
+    target = Pipe()
+    with ZipWriter(target) as package:
+        package.writestr('xl/grande.xml', first, zipfile.ZIP_STORED, None)
+        package.writestr('docs/ação.txt', second, level=9)
+        deflated = zlib.compressobj(1, zlib.DEFLATED, -zlib.MAX_WBITS)
+        package.write('partes.xml', [deflated.compress(first), deflated.flush()], len(first), zlib.crc32(first))
+
+    archive = zipfile.ZipFile(io.BytesIO(bytes(target.data)))
+    assert archive.testzip() is None
+    assert archive.namelist() == ['xl/grande.xml', 'docs/ação.txt', 'partes.xml']
+    assert [archive.read(name) for name in archive.namelist()] == [first, second, first]
+    assert [info.compress_type for info in archive.infolist()] == [zipfile.ZIP_STORED] + [zipfile.ZIP_DEFLATED] * 2
+
+
+def test_parts_are_assembled_in_order():
+    wb = Workbook()
+    register_styles(wb)
+    ws = wb.active
+    ws.title = 'Dados'
+    ws.column_dimensions['B'].width = 30
+    notes = wb.create_sheet('Notas')
+    notes['A1'] = 'Gravada pela casca'
+    notes['A1'].style = HEADER
+
+    package = ParallelWorkbook(wb, workers=2)
+    for start in range(0, 250, 100):
+        package.append(ws, numbered_cells, start, min(start + 100, 250), rows=min(100, 250 - start))
+    buffer = io.BytesIO()
+    package.save(buffer)
+
+    assert zipfile.ZipFile(io.BytesIO(buffer.getvalue())).testzip() is None
+    saved = load_workbook(buffer)
+    data = saved['Dados']
+    assert data.dimensions == 'A1:C250'
+    assert [c.value for c in data[1]] == [0, 'linha 0 <&>', 0]
+    assert [c.value for c in data[250]] == [249, 'linha 249 <&>', 62.25]
+    assert data['A120'].style == BORDERED and data['B120'].style == 'Normal'
+    assert data.column_dimensions['B'].width == 30
+    assert saved['Notas']['A1'].value == 'Gravada pela casca' and saved['Notas']['A1'].style == HEADER
+
+
+def test_spreadsheet_parallel_matches_sequential():
+    metrics = [
+        (datetime.date(2024, 11, 1) + datetime.timedelta(days=n), 2, 1000 + n, 50, 5, 100.0 + n, 300.0)
+        for n in range(40)
+    ]
+    sequential = load_workbook(io.BytesIO(planilha_gaia3.build_workbook(metrics=metrics)))
+    parallel = load_workbook(io.BytesIO(planilha_gaia3.build_workbook(metrics=metrics, parallel=2)))
+
+    assert parallel.sheetnames == sequential.sheetnames
+    for ws in sequential.worksheets:
+        cells = [(c.coordinate, c.value, c.style) for row in ws.iter_rows() for c in row]
+        assert cells == [(c.coordinate, c.value, c.style) for row in parallel[ws.title].iter_rows() for c in row]
+        assert len(parallel[ws.title]._charts) == len(ws._charts)
+
+
+def test_stored_profile_writes_plain_entries():
+    content = planilha_gaia3.build_workbook(parallel=1, compression='store')
+
+    package = zipfile.ZipFile(io.BytesIO(content))
+    assert package.testzip() is None
+    assert {entry.compress_type for entry in package.infolist()} == {zipfile.ZIP_STORED}
+    assert load_workbook(io.BytesIO(content))['Progresso']['A2'].value == 'Instalação'
+
+
+def status_cells(start, stop):
+    for n in range(start, stop):
+        yield [(f'tarefa {n}', None), (('Concluído', 'Em Progresso', ' <pendente> ')[n % 3], BORDERED)]
+
+
+def test_low_cardinality_columns_use_shared_strings():
+    wb = Workbook()
+    register_styles(wb)
+    package = ParallelWorkbook(wb, workers=1)
+    package.append(wb.active, status_cells, 0, 60, rows=60)
+    buffer = io.BytesIO()
+    package.save(buffer)
+
+    strings = zipfile.ZipFile(io.BytesIO(buffer.getvalue())).read('xl/sharedStrings.xml').decode()
+    assert 'uniqueCount="3"' in strings and 'count="60"' in strings and 'tarefa' not in strings
+    assert [(s['column'], s['strategy'], s['shared_cells'], s['inline_cells']) for s in package.string_stats] == [
+        ('A', INLINE, 0, 60), ('B', SHARED, 60, 0),
+    ]
+    ws = load_workbook(buffer).active
+    assert [[c.value for c in row] for row in ws.iter_rows(max_row=3)] == [
+        ['tarefa 0', 'Concluído'], ['tarefa 1', 'Em Progresso'], ['tarefa 2', ' <pendente> '],
+    ]
+    assert ws['B3'].style == BORDERED
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+import datetime
+import io
+
+import pytest
+from openpyxl import load_workbook
+
+from relatorios import planilha_gaia3
+from relatorios.decodificacao import MalformedValue
+from relatorios.estilos import BORDERED_DATE
+from relatorios.fontes import DataSource, create_sqlite_schema
+
+
+@pytest.fixture
+def database(tmp_path):
+    url = f'sqlite:///{tmp_path / "apogeu.db"}'
+    with DataSource.from_url(url) as source:
+        create_sqlite_schema(source.connection)
+        source.connection.executemany(
+            'INSERT INTO campaigns (id, userId, name, platform) VALUES (?, ?, ?, ?)',
+            [('c1', 'u1', 'Black Friday', 'google_ads'), ('c2', 'u1', 'Natal', 'meta_ads')],
+        )
+        source.connection.executemany(
+            'INSERT INTO campaignMetrics (id, campaignId, date, impressions, clicks, spend) VALUES (?, ?, ?, ?, ?, ?)',
+            [
+                ('m1', 'c1', '2024-10-22 10:00:00', '1000', '10', '12.50'),
+                ('m2', 'c2', '2024-10-22 11:00:00', '2000', '20', '7.50'),
+                ('m3', 'c1', '2024-10-30 10:00:00', '3000', 'x', '5.00'),
+            ],
+        )
+        # date é anulável no esquema do drizzle
+        source.connection.execute(
+            "INSERT INTO campaignMetrics (id, campaignId, date, impressions) VALUES ('m0', 'c2', NULL, '500')",
+        )
+        source.connection.commit()
+    return url
+
+
+@pytest.mark.parametrize('mode', [{}, {'streaming': True}, {'parallel': 1}])
+def test_metrics_without_date_are_left_out(database, mode):
+    malformed = []
+    content = planilha_gaia3.build_workbook(database=database, malformed_values=malformed, **mode)
+
+    assert malformed == [MalformedValue('m0', 'date', None), MalformedValue('m3', 'clicks', 'x')]
+    ws = load_workbook(io.BytesIO(content))['Métricas']
+    rows = [[c.value for c in row][:4] for row in ws.iter_rows(min_row=2)]
+    assert rows == [
+        [datetime.datetime(2024, 10, 22), 2, 3000, 30],
+        [datetime.datetime(2024, 10, 30), 1, 3000, 0],
+    ]
+
+
+def test_caller_rows_without_date_are_left_out():
+    metrics = [(None, *planilha_gaia3.metrics_data[0][1:]), *planilha_gaia3.metrics_data[1:3]]
+    malformed = []
+    content = planilha_gaia3.build_workbook(metrics=metrics, malformed_values=malformed)
+    ws = load_workbook(io.BytesIO(content))['Métricas']
+
+    assert malformed == [MalformedValue(0, 'date', None)]
+    assert [row[0].value.date() for row in ws.iter_rows(min_row=2)] == [row[0] for row in metrics[1:]]
+
+
+def test_streaming_matches_normal_mode(database):
+    normal = load_workbook(io.BytesIO(planilha_gaia3.build_workbook(database=database)))
+    streaming = load_workbook(io.BytesIO(planilha_gaia3.build_workbook(database=database, streaming=True)))
+
+    assert streaming.sheetnames == normal.sheetnames
+    for ws in normal.worksheets:
+        cells = [(c.coordinate, c.value, c.style, c.number_format) for row in ws.iter_rows() for c in row]
+        assert cells == [
+            (c.coordinate, c.value, c.style, c.number_format) for row in streaming[ws.title].iter_rows() for c in row
+        ]
+        assert len(streaming[ws.title]._charts) == len(ws._charts)
+    assert streaming['Métricas'].max_row == 3 and streaming['Métricas']['A2'].style == BORDERED_DATE
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+import io
+import socket
+import subprocess
+import sys
+import threading
+import zipfile
+
+import pytest
+from docx import Document
+from openpyxl import Workbook, load_workbook
+
+from relatorios import planilha_apogeu
+from relatorios.saida import save
+
+
+def workbook():
+    wb = Workbook()
+    wb.active.append(['Data', 'Valor'])
+    wb.active.append(['22/10/2024', 42])
+    return wb
+
+
+class Pipe(io.RawIOBase):
+    """Destino só de escrita e sem seek, como um pipe"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+
+def test_save_to_bytes_and_unseekable_stream():
+    content = save(workbook())
+    pipe = Pipe()
+    assert save(workbook(), pipe) is None
+
+    for data in (content, b''.join(pipe.chunks)):
+        assert load_workbook(io.BytesIO(data)).active['B2'].value == 42
+
+
+def test_save_to_socket():
+    sender, receiver = socket.socketpair()
+    received = []
+    reader = threading.Thread(target=lambda: received.append(receiver.makefile('rb').read()))
+    reader.start()
+    with sender:
+        save(workbook(), sender)
+    reader.join(10)
+    receiver.close()
+
+    assert load_workbook(io.BytesIO(received[0])).active['A2'].value == '22/10/2024'
+
+
+def test_compression_profiles():
+    doc = Document()
+    doc.add_paragraph('Texto repetido. ' * 500)
+    sizes = {}
+    for compression in ('store', 'fast', 'smallest'):
+        content = save(workbook(), compression=compression)
+        entries = zipfile.ZipFile(io.BytesIO(content)).infolist()
+        expected = zipfile.ZIP_STORED if compression == 'store' else zipfile.ZIP_DEFLATED
+        assert {entry.compress_type for entry in entries} == {expected}
+        assert load_workbook(io.BytesIO(content)).active['B2'].value == 42
+        sizes[compression] = len(save(doc, compression=compression))
+
+    assert sizes['store'] > sizes['fast'] >= sizes['smallest']
+    # As partes do .docx são as do doc.save, com o método do perfil
+    stored = zipfile.ZipFile(io.BytesIO(save(doc, compression='store')))
+    original = zipfile.ZipFile(io.BytesIO(save(doc)))
+    assert [(e.filename, e.compress_type) for e in stored.infolist()] == [
+        (e.filename, zipfile.ZIP_STORED) for e in original.infolist()
+    ]
+    assert all(stored.read(e.filename) == original.read(e.filename) for e in original.infolist())
+    with pytest.raises(ValueError, match='Perfil de compressão desconhecido'):
+        save(workbook(), compression='ultra')
+
+
+def test_cli_writes_to_stdout():
+    result = subprocess.run(
+        [sys.executable, '-m', 'relatorios', 'guia-gaia3', '--output', '-'], capture_output=True,
+    )
+
+    assert result.returncode == 0
+    assert zipfile.is_zipfile(io.BytesIO(result.stdout))
+    assert 'criado com sucesso: saída padrão' in result.stderr.decode()
+
+
+def test_cli_names_the_output_file(tmp_path, capsys):
+    output = tmp_path / 'planilha.xlsx'
+    planilha_apogeu.main(['--output', str(output)])
+
+    assert f'Arquivo: {output}' in capsys.readouterr().out and output.exists()
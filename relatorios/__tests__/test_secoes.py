@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+from openpyxl import Workbook
+
+from relatorios.estilos import COMPLETED, HEADER, SUBHEADER, register_styles
+from relatorios.secoes import SheetLayout
+
+
+def test_sections_follow_each_other():
+    wb = Workbook()
+    register_styles(wb)
+    layout = SheetLayout(wb.active, width=4)
+    layout.banner('Título')
+    layout.skip()
+
+    # Corpo de tamanho desconhecido (gerador)
+    first = layout.section('Seção 1', ['#', 'Tarefa'], ((str(i), f'Tarefa {i}') for i in range(50)))
+    second = layout.section(
+        'Seção 2', ['Status'], [('Concluído',), ('Pendente',)],
+        cell_style=lambda col, value: COMPLETED if value == 'Concluído' else HEADER,
+    )
+
+    assert tuple(first) == (3, 4, 5, 54)
+    assert tuple(second) == (57, 58, 59, 60)
+    ws = wb.active
+    assert ws['A57'].style == SUBHEADER and 'A57:D57' in ws.merged_cells
+    assert ws['A58'].style == HEADER
+    assert ws['A59'].style == COMPLETED
+    assert layout.row == 63
+
+
+def test_body_from_section_rows():
+    wb = Workbook()
+    register_styles(wb)
+    layout = SheetLayout(wb.active)
+    layout.banner('Título')
+
+    section = layout.section(
+        'Totais', ['Valor', 'Dobro'], lambda s: ((n, f'=A{s.first_row + i}*2') for i, n in enumerate((1, 2))),
+    )
+
+    assert tuple(section) == (2, 3, 4, 5)
+    assert wb.active['B5'].value == '=A5*2'
+
+
+def test_empty_body():
+    wb = Workbook()
+    register_styles(wb)
+    layout = SheetLayout(wb.active, gap=0)
+
+    section = layout.section('Vazia', ['A'], iter(()))
+
+    assert section.first_row > section.last_row
+    assert layout.row == 3
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+import io
+import threading
+
+import pytest
+from docx import Document
+from openpyxl import load_workbook
+
+from relatorios.armazem import ArtifactStore
+from relatorios.servico import request, serve
+
+
+@pytest.fixture(scope='module')
+def service(tmp_path_factory):
+    folder = tmp_path_factory.mktemp('servico')
+    socket_path = str(folder / 'relatorios.sock')
+    store = ArtifactStore(str(folder / 'armazem'))
+    started = threading.Event()
+    servers = []
+
+    def ready(server):
+        servers.append(server)
+        started.set()
+
+    thread = threading.Thread(
+        target=serve, args=(socket_path, 1, 1), kwargs={'ready': ready, 'store': store}, daemon=True,
+    )
+    thread.start()
+    assert started.wait(60)
+    yield socket_path
+    servers[0].shutdown()
+    thread.join(10)
+    store.close()
+
+
+def test_builds_artifacts_over_the_socket(service):
+    header, content = request(service, {
+        'artifact': 'planilha-apogeu',
+        'options': {'tasks': [['1', 'Tarefa do pedido', 'Concluído', '01/11/2024', 'Ana', '']]},
+    })
+    assert header['ok'] and header['bytes'] == len(content)
+    assert load_workbook(io.BytesIO(content)).active['B6'].value == 'Tarefa do pedido'
+
+    header, content = request(service, {
+        'artifact': 'guia-gaia3', 'options': {'problemas': [{'titulo': 'Erro via socket', 'passos': ['Passo']}]},
+    })
+    assert header['content_type'].endswith('wordprocessingml.document')
+    assert 'Erro via socket' in [p.text for p in Document(io.BytesIO(content)).paragraphs]
+
+
+def test_errors_and_stats(service):
+    header, content = request(service, {'artifact': 'relatorio-inexistente'})
+    assert not header['ok'] and 'Artefato desconhecido' in header['error'] and content == b''
+
+    header, _ = request(service, {'artifact': 'guia-apogeu', 'options': {'formato': 'pdf'}})
+    assert not header['ok'] and 'Opções inválidas' in header['error']
+
+    header, _ = request(service, {'command': 'stats'})
+    assert header['status'] == 'ok' and header['jobs'] == 1 and header['running'] == 0
+    assert header['artifacts']['planilha-apogeu']['requests'] >= 1
+
+
+def test_repeated_request_is_served_from_store(service):
+    message = {'artifact': 'guia-apogeu', 'options': {'problemas': [{'titulo': 'Erro repetido', 'passos': ['Passo']}]}}
+    first, content = request(service, message)
+    second, cached = request(service, message)
+
+    assert not first['cached'] and second['cached'] and cached == content
+    header, _ = request(service, {'command': 'stats'})
+    assert header['artifacts']['guia-apogeu']['cached'] == 1 and header['store']['entries'] >= 1
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""Pré-agregação por dia, semana ISO e mês
+
+Os lotes de ``campaignMetrics`` passam uma única vez pelo ``Rollup``, que
+acumula os totais de cada campanha/plataforma nos três períodos ao mesmo
+tempo. As visões semanais e mensais leem esses totais, sem varrer de novo
+os dados brutos.
+
+Os totais ficam em int64 (contagens e centavos, como em decodificacao) e
+a memória cresce com o número de grupos x períodos, não com o de linhas.
+"""
+
+import datetime
+from collections import namedtuple
+
+import numpy as np
+
+from relatorios.decodificacao import MalformedValue, decode_columns
+from relatorios.fontes import CAMPAIGN_METRIC_COLUMNS, DEFAULT_BATCH_SIZE
+
+GRAINS = ('day', 'week', 'month')
+
+# Medidas somadas de campaignMetrics (spend e revenue em centavos)
+METRIC_MEASURES = ('impressions', 'clicks', 'conversions', 'spend', 'revenue')
+
+RollupRow = namedtuple('RollupRow', 'start key rows totals')
+PeriodTotal = namedtuple('PeriodTotal', 'start groups rows totals')
+
+
+def bucket_starts(days, grain):
+    """Primeiro dia do período (dia, segunda-feira da semana ISO ou dia 1 do mês)"""
+    days = np.asarray(days, dtype='datetime64[D]')
+    if grain == 'day':
+        return days
+    if grain == 'week':
+        # 01/01/1970 foi uma quinta-feira: (dias + 3) % 7 é 0 nas segundas
+        ordinal = days.astype(np.int64)
+        return (ordinal - (ordinal + 3) % 7).astype('datetime64[D]')
+    if grain == 'month':
+        return days.astype('datetime64[M]').astype('datetime64[D]')
+    raise ValueError(f'Período desconhecido: {grain}')
+
+
+def period_label(start, grain):
+    """Rótulo do período: '22/10/2024', '2024-S43' ou '10/2024'"""
+    if grain == 'day':
+        return start.strftime('%d/%m/%Y')
+    if grain == 'week':
+        year, week, _ = start.isocalendar()
+        return f'{year}-S{week:02d}'
+    if grain == 'month':
+        return start.strftime('%m/%Y')
+    raise ValueError(f'Período desconhecido: {grain}')
+
+
+class Rollup:
+    """Totais por grupo (ex.: campanha/plataforma) e período, em uma passada"""
+
+    def __init__(self, measures=METRIC_MEASURES, grains=GRAINS):
+        self.measures = tuple(measures)
+        self.grains = tuple(grains)
+        self._codes = {}
+        self._keys = []
+        # grain -> {(código do grupo, início do período): [linhas, *totais]}
+        self._buckets = {grain: {} for grain in self.grains}
+
+    def __bool__(self):
+        return any(self._buckets.values())
+
+    def add(self, keys, days, values):
+        """Acumula um lote
+
+        ``keys`` tem o grupo de cada linha, ``days`` a data (qualquer coisa
+        que o NumPy converta para datetime64[D]) e ``values`` uma matriz
+        ``linhas x medidas`` (ou um dict ``medida -> coluna``). Linhas sem
+        data (None ou NaT) não entram em nenhum período.
+        """
+        if isinstance(values, dict):
+            values = np.column_stack([values[name] for name in self.measures])
+        values = np.asarray(values, dtype=np.int64).reshape(len(keys), len(self.measures))
+        days = np.asarray(days, dtype='datetime64[D]').reshape(len(keys))
+        dated = ~np.isnat(days)
+        if not dated.all():
+            keys = [key for key, has_date in zip(keys, dated.tolist()) if has_date]
+            days, values = days[dated], values[dated]
+        if not len(keys):
+            return
+
+        codes = np.fromiter((self._code(key) for key in keys), dtype=np.int64, count=len(keys))
+        for grain in self.grains:
+            starts = bucket_starts(days, grain)
+            # Chave composta (grupo, período) em um único int64 para o np.unique
+            composite = codes << 32 | (starts.astype(np.int64) & 0xFFFFFFFF)
+            unique, inverse = np.unique(composite, return_inverse=True)
+            totals = np.zeros((len(unique), len(self.measures) + 1), dtype=np.int64)
+            totals[:, 0] = np.bincount(inverse, minlength=len(unique))
+            np.add.at(totals[:, 1:], inverse, values)
+
+            buckets = self._buckets[grain]
+            first = np.unique(inverse, return_index=True)[1]
+            for code, start, total in zip(codes[first].tolist(), starts[first].tolist(), totals):
+                bucket = buckets.get((code, start))
+                if bucket is None:
+                    buckets[(code, start)] = total
+                else:
+                    bucket += total
+
+    def add_metric_batch(self, batch, arrays, columns=CAMPAIGN_METRIC_COLUMNS):
+        """Acumula um lote de campaignMetrics já decodificado (ver decode_columns)"""
+        campaign, platform, date = (columns.index(name) for name in ('campaignId', 'platform', 'date'))
+        keys = [(row[campaign], row[platform]) for row in batch]
+        days = np.array([row[date] for row in batch], dtype='datetime64[D]')
+        self.add(keys, days, arrays)
+
+    def rows(self, grain):
+        """``RollupRow`` por grupo e período, em ordem de período e grupo"""
+        buckets = self._buckets[grain]
+        ordered = sorted(buckets, key=lambda item: (item[1], self._keys[item[0]]))
+        for code, start in ordered:
+            total = buckets[(code, start)]
+            yield RollupRow(start, self._keys[code], int(total[0]), total[1:])
+
+    def totals(self, grain):
+        """``PeriodTotal`` por período, somando todos os grupos"""
+        periods = {}
+        for (_, start), total in self._buckets[grain].items():
+            period = periods.get(start)
+            if period is None:
+                periods[start] = [1, total.copy()]
+            else:
+                period[0] += 1
+                period[1] += total
+        for start in sorted(periods):
+            groups, total = periods[start]
+            yield PeriodTotal(start, groups, int(total[0]), total[1:])
+
+    def _code(self, key):
+        code = self._codes.get(key)
+        if code is None:
+            code = self._codes[key] = len(self._keys)
+            self._keys.append(key)
+        return code
+
+
+def rollup_campaign_metrics(source, user_id=None, start=None, end=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Agrega campaignMetrics de um DataSource em uma passada
+
+    Devolve ``(rollup, malformed)``, com os valores malformados de
+    decode_columns (considerados 0) e as linhas sem data (ignoradas).
+    """
+    date, key = CAMPAIGN_METRIC_COLUMNS.index('date'), CAMPAIGN_METRIC_COLUMNS.index('id')
+    rollup = Rollup()
+    malformed = []
+    for batch in source.campaign_metrics_batches(user_id, start, end, batch_size):
+        arrays, errors = decode_columns(batch, CAMPAIGN_METRIC_COLUMNS)
+        malformed.extend(MalformedValue(row[key], 'date', None) for row in batch if row[date] is None)
+        malformed.extend(errors)
+        rollup.add_metric_batch(batch, arrays)
+    return rollup, malformed
+
+
+def week_series(days, first=None, min_weeks=0):
+    """Contagem por semana ISO de uma lista de datas, sem semanas faltando
+
+    Datas vazias (None) são ignoradas. A série começa na semana de ``first``
+    (ou na da primeira data) e tem pelo menos ``min_weeks`` semanas. Devolve
+    ``[(segunda-feira, contagem), ...]``.
+    """
+    days = [day for day in days if day]
+    rollup = Rollup(measures=(), grains=('week',))
+    rollup.add([None] * len(days), days, np.zeros((len(days), 0), dtype=np.int64))
+    counts = {period.start: period.rows for period in rollup.totals('week')}
+
+    if first is not None:
+        start = bucket_starts([first], 'week')[0].tolist()
+    elif counts:
+        start = min(counts)
+    else:
+        return []
+    last = max(counts) if counts else start
+    weeks = max(min_weeks, (last - start).days // 7 + 1)
+    return [
+        (start + datetime.timedelta(weeks=i), counts.get(start + datetime.timedelta(weeks=i), 0))
+        for i in range(weeks)
+    ]
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Redução de pontos das séries de gráficos (LTTB e min/máx por balde)
+
+Um ano de métricas diárias por campanha deixa o Excel lento para abrir e
+redesenhar gráficos. Quando uma série passa do orçamento de pontos, a versão
+reduzida é gravada em uma aba oculta e o gráfico passa a referenciá-la; os
+dados completos continuam intactos na aba visível.
+"""
+
+import numpy as np
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.chart import Reference
+
+DEFAULT_POINT_BUDGET = 500
+
+
+def lttb_indices(x, y, threshold):
+    """Índices escolhidos pelo Largest-Triangle-Three-Buckets
+
+    Mantém o primeiro e o último ponto e, em cada balde intermediário, o
+    ponto que forma o maior triângulo com o ponto anterior escolhido e a
+    média do balde seguinte. Preserva picos e vales da série.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (threshold - 2)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        indices[i + 1] = a
+    return indices
+
+
+def minmax_indices(y, threshold):
+    """Índices do mínimo e do máximo de cada balde (mais barato que LTTB)"""
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if threshold >= n or threshold < 2:
+        return np.arange(n)
+
+    buckets = np.array_split(np.arange(n), threshold // 2)
+    chosen = []
+    for bucket in buckets:
+        values = y[bucket]
+        chosen.append(bucket[values.argmin()])
+        chosen.append(bucket[values.argmax()])
+    return np.unique(chosen)
+
+
+def downsample_indices(x, y, budget=DEFAULT_POINT_BUDGET, method='lttb'):
+    """Índices a manter para que a série caiba em ``budget`` pontos"""
+    if method == 'minmax':
+        return minmax_indices(y, budget)
+    if method == 'lttb':
+        return lttb_indices(x, y, budget)
+    raise ValueError(f'Método de redução desconhecido: {method}')
+
+
+def chart_source(wb, title, headers, labels, values, budget=DEFAULT_POINT_BUDGET, method='lttb', label_style=None):
+    """Grava a série reduzida em uma aba oculta, se passar do orçamento
+
+    ``labels`` são as categorias (numéricas para LTTB, ex.: série de datas do
+    Excel) e ``values`` os valores da série. Devolve ``(data, categories)``
+    como ``Reference`` para o gráfico, ou ``None`` quando a série já cabe no
+    orçamento e o gráfico pode apontar para os dados originais. Funciona
+    também em workbooks write-only.
+    """
+    labels = np.asarray(labels)
+    values = np.asarray(values, dtype=np.float64)
+    if budget is None or len(values) <= budget:
+        return None
+
+    x = labels if np.issubdtype(labels.dtype, np.number) else np.arange(len(labels))
+    indices = downsample_indices(x, values, budget, method)
+
+    ws = wb.create_sheet(title[:31])
+    ws.sheet_state = 'hidden'
+    ws.append(list(headers))
+    for label, value in zip(labels[indices].tolist(), values[indices].tolist()):
+        if label_style is not None:
+            cell = WriteOnlyCell(ws, value=label)
+            cell.style = label_style
+            label = cell
+        ws.append([label, value])
+
+    count = len(indices)
+    data = Reference(ws, min_col=2, min_row=1, max_row=count + 1)
+    categories = Reference(ws, min_col=1, min_row=2, max_row=count + 1)
+    return data, categories
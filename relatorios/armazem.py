@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""Armazém de artefatos gerados, endereçado pelo conteúdo, com descarte LRU
+
+Cada planilha ou guia gerado é guardado uma vez, em ``objetos/<sha256>``. Um
+índice SQLite liga a chave (artefato, cliente, impressão digital das
+entradas) ao conteúdo. Um pedido repetido com as mesmas entradas é atendido
+por uma busca na chave primária e a leitura do arquivo, sem gerar de novo:
+
+    with ArtifactStore('/var/cache/relatorios') as store:
+        content = store.get('planilha-gaia3', 'u1', fingerprint)
+        if content is None:
+            content = planilha_gaia3.build_workbook(database=url, user_id='u1')
+            store.put('planilha-gaia3', 'u1', fingerprint, content)
+
+A impressão digital (``input_fingerprint``) cobre as opções da geração, os
+arquivos de entrada (caminho, tamanho e data de modificação), o banco
+SQLite e o código dos geradores. Um banco MySQL não tem impressão barata;
+ele só entra com uma versão dos dados informada pelo chamador.
+
+O hash de um .xlsx/.docx é calculado sobre as partes do pacote como foram
+gravadas (método de compressão e bytes comprimidos), sem docProps/core.xml
+(datas de criação e modificação) e sem as datas das entradas do ZIP. Duas
+gerações das mesmas entradas, ou de clientes com os mesmos dados, ocupam o
+espaço de um conteúdo só; o mesmo relatório com outro perfil de compressão
+(relatorios.saida) é outro conteúdo.
+
+O total dos conteúdos é limitado a ``max_bytes``, valor gravado no próprio
+armazém. Acima do limite, as chaves usadas há mais tempo saem do índice, e
+cada conteúdo que fica sem chave é apagado. Vários processos (modo em lote,
+serviço) podem usar o mesmo armazém: as alterações são transações do
+SQLite.
+"""
+
+import contextlib
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import struct
+import tempfile
+import threading
+import time
+import zipfile
+
+from relatorios.saida import save
+
+DEFAULT_MAX_BYTES = 512 * 2 ** 20
+
+# Partes do pacote que mudam a cada gravação, ignoradas no hash do conteúdo
+VOLATILE_PARTS = frozenset({'docProps/core.xml'})
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_SCHEMA = (
+    '''CREATE TABLE IF NOT EXISTS artifacts (
+        artifact TEXT NOT NULL,
+        tenant TEXT NOT NULL,
+        fingerprint TEXT NOT NULL,
+        digest TEXT NOT NULL,
+        used INTEGER NOT NULL,
+        PRIMARY KEY (artifact, tenant, fingerprint)
+    )''',
+    'CREATE INDEX IF NOT EXISTS artifacts_used ON artifacts (used)',
+    'CREATE INDEX IF NOT EXISTS artifacts_digest ON artifacts (digest)',
+    'CREATE TABLE IF NOT EXISTS objects (digest TEXT PRIMARY KEY, bytes INTEGER NOT NULL)',
+    'CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value INTEGER NOT NULL)',
+)
+
+_KEY = 'artifact = ? AND tenant = ? AND fingerprint = ?'
+
+# sha256 do código dos geradores, calculado na primeira impressão digital do processo
+_code_version = None
+
+
+# ============ IMPRESSÕES DIGITAIS ============
+
+def code_version():
+    """sha256 dos módulos de relatorios: código novo, artefatos novos"""
+    global _code_version
+    if _code_version is None:
+        digest = hashlib.sha256()
+        for name in sorted(os.listdir(PACKAGE_DIR)):
+            if name.endswith('.py'):
+                digest.update(name.encode() + b'\0')
+                with open(os.path.join(PACKAGE_DIR, name), 'rb') as f:
+                    digest.update(f.read())
+        _code_version = digest.hexdigest()
+    return _code_version
+
+
+def input_fingerprint(options, files=(), database=None, version=None):
+    """sha256 das entradas de uma geração, ou None se não houver como identificá-las
+
+    ``options`` são as opções da geração (serializáveis em JSON), ``files``
+    os arquivos lidos (vazios são ignorados) e ``database`` a URL do banco.
+    ``version`` identifica os dados de um banco MySQL (ex.: data da última
+    sincronização); sem ela, a impressão de um banco MySQL é None. Um
+    arquivo inexistente também dá None: a geração é que reporta o erro.
+    """
+    files = [path for path in files if path and isinstance(path, (str, os.PathLike))]
+    if database:
+        database = str(database)
+        if database.startswith('sqlite:///'):
+            files.append(database[len('sqlite:///'):])
+        elif version is None:
+            return None
+    stamps = []
+    for path in files:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        stamps.append([os.path.abspath(path), stat.st_size, stat.st_mtime_ns])
+    inputs = {'code': code_version(), 'options': options, 'files': stamps, 'version': version}
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def content_digest(content):
+    """sha256 do conteúdo; em pacotes ZIP (.xlsx, .docx), das partes fora de VOLATILE_PARTS
+
+    Cada parte entra com o método de compressão e os bytes como estão no
+    arquivo (sem descomprimir): o mesmo pacote gravado com outro nível ou
+    método tem outro hash.
+    """
+    digest = hashlib.sha256()
+    buffer = io.BytesIO(content)
+    if not zipfile.is_zipfile(buffer):
+        digest.update(content)
+        return digest.hexdigest()
+    with zipfile.ZipFile(buffer) as package:
+        for info in package.infolist():
+            if info.filename not in VOLATILE_PARTS:
+                # Cabeçalho local: 30 bytes, com os tamanhos do nome e do campo extra no fim
+                offset = info.header_offset
+                name_length, extra_length = struct.unpack('<HH', content[offset + 26:offset + 30])
+                start = offset + zipfile.sizeFileHeader + name_length + extra_length
+                digest.update(f'{info.filename}\0{info.compress_type}\0{info.compress_size}\0'.encode())
+                digest.update(content[start:start + info.compress_size])
+    return digest.hexdigest()
+
+
+# ============ ARMAZÉM ============
+
+class ArtifactStore:
+    """Conteúdos em ``root``/objetos, índice em ``root``/indice.sqlite
+
+    ``max_bytes`` muda o limite gravado no armazém (padrão de um armazém
+    novo: ``DEFAULT_MAX_BYTES``). Pode ser usado por várias threads.
+    """
+
+    def __init__(self, root, max_bytes=None):
+        self.root = root
+        self.objects = os.path.join(root, 'objetos')
+        os.makedirs(self.objects, exist_ok=True)
+        self._lock = threading.Lock()
+        # Transações explícitas (BEGIN IMMEDIATE); timeout para esperar outros processos
+        self.connection = sqlite3.connect(
+            os.path.join(root, 'indice.sqlite'), timeout=30, isolation_level=None, check_same_thread=False,
+        )
+        with self._transaction() as db:
+            for statement in _SCHEMA:
+                db.execute(statement)
+            if max_bytes is not None:
+                db.execute("INSERT OR REPLACE INTO settings VALUES ('max_bytes', ?)", (max_bytes,))
+            row = db.execute("SELECT value FROM settings WHERE name = 'max_bytes'").fetchone()
+            self.max_bytes = row[0] if row else DEFAULT_MAX_BYTES
+            self._evict(db)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        with self._lock:
+            self.connection.execute('BEGIN IMMEDIATE')
+            try:
+                yield self.connection
+            except BaseException:
+                self.connection.execute('ROLLBACK')
+                raise
+            self.connection.execute('COMMIT')
+
+    def _path(self, digest):
+        return os.path.join(self.objects, digest[:2], digest)
+
+    def get(self, artifact, tenant, fingerprint):
+        """Conteúdo guardado para a chave (ou None); a chave passa a ser a usada mais recentemente"""
+        key = (artifact, tenant or '', fingerprint)
+        with self._transaction() as db:
+            row = db.execute(f'SELECT digest FROM artifacts WHERE {_KEY}', key).fetchone()
+            if row is None:
+                return None
+            try:
+                with open(self._path(row[0]), 'rb') as f:
+                    content = f.read()
+            except FileNotFoundError:
+                # Apagado por fora do armazém: o conteúdo e as chaves dele saem do índice
+                db.execute('DELETE FROM artifacts WHERE digest = ?', row)
+                db.execute('DELETE FROM objects WHERE digest = ?', row)
+                return None
+            db.execute(f'UPDATE artifacts SET used = ? WHERE {_KEY}', (time.time_ns(), *key))
+        return content
+
+    def put(self, artifact, tenant, fingerprint, content):
+        """Guarda ``content`` sob a chave e devolve o hash do conteúdo
+
+        Um conteúdo já guardado (mesmo hash) não é gravado de novo. Um
+        conteúdo maior que ``max_bytes`` não é guardado (devolve None).
+        """
+        if len(content) > self.max_bytes:
+            return None
+        digest = content_digest(content)
+        path = self._path(digest)
+        with self._transaction() as db:
+            # Dentro da transação: nenhum outro processo apaga o arquivo entre a checagem e o índice
+            if db.execute('SELECT 1 FROM objects WHERE digest = ?', (digest,)).fetchone() is None:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with tempfile.NamedTemporaryFile(dir=self.objects, delete=False) as f:
+                    f.write(content)
+                os.replace(f.name, path)
+                db.execute('INSERT INTO objects VALUES (?, ?)', (digest, len(content)))
+            db.execute(
+                'INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?, ?)',
+                (artifact, tenant or '', fingerprint, digest, time.time_ns()),
+            )
+            self._evict(db)
+        return digest
+
+    def _evict(self, db):
+        """Descarta as chaves usadas há mais tempo até o total caber em ``max_bytes``"""
+        total = db.execute('SELECT COALESCE(SUM(bytes), 0) FROM objects').fetchone()[0]
+        while total > self.max_bytes:
+            row = db.execute(
+                'SELECT artifact, tenant, fingerprint, digest FROM artifacts ORDER BY used LIMIT 1',
+            ).fetchone()
+            if row is None:
+                break
+            *key, digest = row
+            db.execute(f'DELETE FROM artifacts WHERE {_KEY}', key)
+            if db.execute('SELECT 1 FROM artifacts WHERE digest = ? LIMIT 1', (digest,)).fetchone() is None:
+                total -= db.execute('SELECT bytes FROM objects WHERE digest = ?', (digest,)).fetchone()[0]
+                db.execute('DELETE FROM objects WHERE digest = ?', (digest,))
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(self._path(digest))
+
+    def stats(self):
+        """Chaves, conteúdos distintos e bytes ocupados"""
+        with self._transaction() as db:
+            entries = db.execute('SELECT COUNT(*) FROM artifacts').fetchone()[0]
+            objects, size = db.execute('SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM objects').fetchone()
+        return {'entries': entries, 'objects': objects, 'bytes': size, 'max_bytes': self.max_bytes}
+
+
+def stored_build(store_dir, artifact, tenant, fingerprint, build, output):
+    """Grava o artefato em ``output`` a partir do armazém ``store_dir`` ou de ``build(output)``
+
+    Sem armazém (ou sem impressão digital) chama ``build(output)``. Com
+    armazém, o conteúdo da chave é gravado direto em ``output``; se não
+    houver, ``build(None)`` gera os bytes, que são guardados. Devolve True
+    se o artefato veio do armazém.
+    """
+    if not store_dir or fingerprint is None:
+        build(output)
+        return False
+    with ArtifactStore(store_dir) as store:
+        content = store.get(artifact, tenant, fingerprint)
+        hit = content is not None
+        if not hit:
+            content = build(None)
+            store.put(artifact, tenant, fingerprint, content)
+    save(content, output)
+    return hit
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""Datas como células nativas do Excel
+
+As datas são gravadas como o número de série do Excel (dias desde
+30/12/1899) com um number_format de data, e não como texto '22/10/2024'.
+Assim o Excel ordena, filtra e usa eixo de tempo nos gráficos.
+
+A conversão é memorizada por dia: milhões de linhas de métricas
+compartilham poucas centenas de datas distintas.
+"""
+
+import datetime
+from functools import lru_cache
+
+EXCEL_EPOCH = datetime.date(1899, 12, 30)
+DATE_FORMAT = 'DD/MM/YYYY'
+
+
+@lru_cache(maxsize=8192)
+def excel_serial(day):
+    """Número de série do Excel para uma data (datetime.date)"""
+    return (day - EXCEL_EPOCH).days
+
+
+@lru_cache(maxsize=1024)
+def parse_br_date(text):
+    """Converte '22/10/2024' em datetime.date"""
+    return datetime.datetime.strptime(text, '%d/%m/%Y').date()
+
+
+def to_excel_date(value):
+    """Converte date, datetime ou texto dd/mm/aaaa em número de série (None se vazio)"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        value = parse_br_date(value)
+    elif isinstance(value, datetime.datetime):
+        value = value.date()
+    return excel_serial(value)
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""Decodificação em bloco das colunas varchar de métricas
+
+``campaignMetrics`` guarda impressions, clicks, conversions, spend, revenue,
+ctr e roas como varchar(20). Aqui uma coluna inteira é convertida de uma vez,
+com operações de string do NumPy, para int64: contagens como inteiros e
+valores monetários em centavos (ponto fixo).
+
+São aceitos o formato gravado pelo backend (``'4230.5'``), o formato
+brasileiro (``'R$ 1.234,56'``), strings vazias e nulos (valem 0). Valores
+malformados (inclusive separadores misturados fora do padrão brasileiro,
+como ``'1,234.56'``) não interrompem a exportação: viram 0 e são devolvidos
+em uma lista separada.
+"""
+
+import re
+from collections import namedtuple
+
+import numpy as np
+
+# Casas decimais de cada coluna de campaignMetrics (0 = contagem inteira)
+COLUMN_DECIMALS = {
+    'impressions': 0,
+    'clicks': 0,
+    'conversions': 0,
+    'spend': 2,  # centavos
+    'revenue': 2,  # centavos
+    'ctr': 4,
+    'roas': 4,
+}
+
+# Mais dígitos que isso não cabem com segurança em int64
+MAX_DIGITS = 18
+
+# Parte inteira com pontos de milhar: '1.234.567'
+THOUSANDS = re.compile(r'[0-9]{1,3}(\.[0-9]{3})+')
+
+DecodedColumn = namedtuple('DecodedColumn', 'values errors')
+MalformedValue = namedtuple('MalformedValue', 'row column raw')
+
+
+def _as_text(values):
+    """Converte a coluna em um array de strings, com nulos como ''"""
+    arr = np.asarray(values, dtype=object)
+    if arr.ndim != 1:
+        arr = arr.reshape(-1)
+    arr = np.where(arr == None, '', arr)  # noqa: E711 (comparação elemento a elemento)
+    return arr.astype(str)
+
+
+def _ascii_digits(text):
+    """Elemento a elemento: só dígitos 0-9 (ou vazio)
+
+    ``np.char.isdigit`` aceita qualquer dígito Unicode ('²', '٣'), que o
+    ``astype(np.int64)`` não converte.
+    """
+    return np.char.str_len(np.char.strip(text, '0123456789')) == 0
+
+
+def decode_fixed(values, decimals=0):
+    """Decodifica uma coluna de texto para int64 com ``decimals`` casas fixas
+
+    Devolve ``DecodedColumn(values, errors)``, onde ``errors`` lista os
+    índices malformados (cujo valor fica 0). Dígitos além de ``decimals``
+    são arredondados (meio para cima).
+    """
+    raw = _as_text(values)
+
+    text = np.char.strip(raw)
+    has_currency = np.char.find(text, 'R$') >= 0
+    text = np.char.replace(text, 'R$', '')
+    text = np.char.replace(text, '\xa0', '')
+    text = np.char.replace(text, ' ', '')
+
+    negative = np.char.startswith(text, '-')
+    valid = np.char.count(text, '-') == negative
+    text = np.char.replace(text, '-', '', count=1)
+
+    # Formato brasileiro: vírgula decimal e ponto como separador de milhar
+    dots = np.char.count(text, '.')
+    brazilian = (np.char.find(text, ',') >= 0) | has_currency | (dots > 1)
+    if decimals == 0:
+        # '125.430' em uma contagem só pode ser separador de milhar
+        after_dot = np.char.partition(text, '.')[:, 2]
+        brazilian |= (dots == 1) & (np.char.str_len(after_dot) == 3)
+    # Com vírgula decimal, os pontos só valem como milhar antes dela: '1,234.56'
+    # (formato americano) ou '12.34,5' não são números brasileiros
+    has_comma = np.char.find(text, ',') >= 0
+    last_comma = np.char.rpartition(text, ',')
+    integer_part = np.where(has_comma, last_comma[:, 0], text)
+    decimal_part = np.where(has_comma, last_comma[:, 2], '')
+    grouped = brazilian & (np.char.find(integer_part, '.') >= 0)
+    thousands = np.ones(len(text), dtype=bool)
+    thousands[grouped] = [THOUSANDS.fullmatch(value) is not None for value in integer_part[grouped].tolist()]
+    valid &= ~brazilian | ((np.char.find(decimal_part, '.') < 0) & thousands)
+    text = np.where(brazilian, np.char.replace(np.char.replace(text, '.', ''), ',', '.'), text)
+
+    valid &= np.char.count(text, '.') <= 1
+    parts = np.char.partition(text, '.')
+    integer, fraction = parts[:, 0], parts[:, 2]
+    digits = np.char.str_len(integer)
+    valid &= _ascii_digits(integer) & _ascii_digits(fraction)
+    valid &= digits <= MAX_DIGITS - decimals
+    # Um '.' ou '-' sozinho não é número; vazio (após limpeza) vale 0
+    empty = (digits == 0) & (np.char.str_len(fraction) == 0)
+    valid &= ~empty | ((np.char.str_len(text) == 0) & ~negative)
+
+    integer = np.where(valid & (digits > 0), integer, '0').astype(np.int64)
+    # Completa a fração com zeros e corta em decimals + 1 dígitos para arredondar
+    fraction = np.where(valid, fraction, '')
+    fraction = np.char.ljust(fraction, decimals + 1, '0').astype(f'U{decimals + 1}').astype(np.int64)
+    fraction = (fraction + 5) // 10
+
+    result = integer * 10 ** decimals + fraction
+    result = np.where(negative, -result, result)
+    result[~valid] = 0
+
+    errors = np.flatnonzero(~valid).tolist()
+    return DecodedColumn(result, errors)
+
+
+def decode_counts(values):
+    """Contagens (impressions, clicks, conversions) como int64"""
+    return decode_fixed(values, 0)
+
+
+def decode_money(values):
+    """Valores em reais (spend, revenue) como int64 em centavos"""
+    return decode_fixed(values, 2)
+
+
+def decode_columns(rows, columns, decode=COLUMN_DECIMALS, key_column='id'):
+    """Decodifica as colunas de métricas de um lote de tuplas
+
+    ``columns`` nomeia as posições de cada tupla (ex.: CAMPAIGN_METRIC_COLUMNS).
+    Devolve ``(arrays, errors)``: um dict ``coluna -> np.ndarray int64`` para
+    cada coluna presente em ``decode`` e a lista de ``MalformedValue``, que
+    identifica a linha pelo valor de ``key_column`` (ou pelo índice no lote).
+    """
+    if not rows:
+        return {name: np.zeros(0, dtype=np.int64) for name in columns if name in decode}, []
+
+    transposed = list(zip(*rows))
+    keys = transposed[columns.index(key_column)] if key_column in columns else None
+
+    arrays = {}
+    errors = []
+    for idx, name in enumerate(columns):
+        if name not in decode:
+            continue
+        decoded = decode_fixed(transposed[idx], decode[name])
+        arrays[name] = decoded.values
+        for row in decoded.errors:
+            errors.append(MalformedValue(keys[row] if keys is not None else row, name, transposed[idx][row]))
+    return arrays, errors
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+"""Conteúdo extra dos guias em Word"""
+
+import json
+
+
+def parse_problems(entries):
+    """Problemas extras de troubleshooting já decodificados do JSON
+
+    Formato: ``[{"titulo": "Erro: ...", "passos": ["...", ...]}, ...]``.
+    Devolve ``[(titulo, passos), ...]``, como a lista ``problems`` dos guias.
+    """
+    return [(entry['titulo'], list(entry.get('passos', []))) for entry in entries]
+
+
+def load_problems(path):
+    """Problemas extras de troubleshooting de um arquivo JSON (ver ``parse_problems``)"""
+    with open(path, encoding='utf-8') as f:
+        return parse_problems(json.load(f))
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""Registro de estilos nomeados compartilhado pelas planilhas
+
+Cada estilo é criado uma única vez por workbook (``register_styles``) e as
+células passam a referenciá-lo pelo nome (``cell.style = 'header'``). Assim o
+custo de estilo é proporcional ao número de estilos distintos, e não ao número
+de células, e o styles.xml não cresce com o tamanho da planilha.
+
+As cores de status não são estilos de célula: ``status_rules`` grava regras
+de formatação condicional sobre a coluna inteira, e o Excel recolore a
+célula quando o status é editado.
+"""
+
+from openpyxl.formatting.rule import CellIsRule, FormulaRule
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+
+from relatorios.datas import DATE_FORMAT
+
+HEADER = 'header'
+SUBHEADER = 'subheader'
+COMPLETED = 'completed'
+IN_PROGRESS = 'in-progress'
+PENDING = 'pending'
+ERROR = 'error'
+BORDERED = 'bordered'
+BORDERED_LEFT = 'bordered-left'
+BORDERED_CENTER = 'bordered-center'
+BORDERED_WRAP = 'bordered-wrap'
+BORDERED_MONEY = 'bordered-money'
+BORDERED_DATE = 'bordered-date'
+BORDERED_PERCENT = 'bordered-percent'
+
+# Paletas de cores de cada produto
+APOGEU_PALETTE = {
+    HEADER: '0066CC',  # Azul
+    SUBHEADER: '6633CC',  # Roxo
+    COMPLETED: '90EE90',  # Verde
+    IN_PROGRESS: 'FFD700',  # Amarelo
+    PENDING: 'FFD700',  # Amarelo
+    ERROR: 'FF6B6B',  # Vermelho
+}
+
+GAIA3_PALETTE = {
+    HEADER: '3B82F6',  # Azul
+    SUBHEADER: '8B5CF6',  # Roxo
+    COMPLETED: '10B981',  # Verde
+    IN_PROGRESS: '3B82F6',  # Azul
+    PENDING: 'F59E0B',  # Laranja
+    ERROR: 'EF4444',  # Vermelho
+}
+
+# Status de tarefa -> estilo cuja cor o destaca (ver status_rules)
+STATUS_STYLES = {'Concluído': COMPLETED, 'Em Progresso': IN_PROGRESS}
+
+thin_border = Border(
+    left=Side(style='thin'),
+    right=Side(style='thin'),
+    top=Side(style='thin'),
+    bottom=Side(style='thin')
+)
+
+left_alignment = Alignment(horizontal='left', vertical='center')
+center_alignment = Alignment(horizontal='center', vertical='center')
+wrap_alignment = Alignment(horizontal='left', wrap_text=True)
+
+
+def solid_fill(color):
+    """Cria um preenchimento sólido"""
+    return PatternFill(start_color=color, end_color=color, fill_type='solid')
+
+
+def build_styles(palette):
+    """Monta os estilos nomeados para uma paleta"""
+    return [
+        NamedStyle(
+            name=HEADER,
+            font=Font(bold=True, color='FFFFFF', size=12),
+            fill=solid_fill(palette[HEADER]),
+            alignment=center_alignment,
+            border=thin_border,
+        ),
+        NamedStyle(
+            name=SUBHEADER,
+            font=Font(bold=True, color='FFFFFF', size=11),
+            fill=solid_fill(palette[SUBHEADER]),
+            alignment=Alignment(horizontal='center'),
+        ),
+        NamedStyle(name=COMPLETED, fill=solid_fill(palette[COMPLETED]), alignment=left_alignment, border=thin_border),
+        NamedStyle(name=IN_PROGRESS, fill=solid_fill(palette[IN_PROGRESS]), alignment=left_alignment, border=thin_border),
+        NamedStyle(name=PENDING, fill=solid_fill(palette[PENDING]), alignment=left_alignment, border=thin_border),
+        NamedStyle(name=ERROR, fill=solid_fill(palette[ERROR]), alignment=left_alignment, border=thin_border),
+        NamedStyle(name=BORDERED, border=thin_border),
+        NamedStyle(name=BORDERED_LEFT, alignment=left_alignment, border=thin_border),
+        NamedStyle(name=BORDERED_CENTER, alignment=Alignment(horizontal='center'), border=thin_border),
+        NamedStyle(name=BORDERED_WRAP, alignment=wrap_alignment, border=thin_border),
+        NamedStyle(name=BORDERED_MONEY, border=thin_border, number_format='#,##0.00'),
+        NamedStyle(name=BORDERED_DATE, border=thin_border, number_format=DATE_FORMAT),
+        NamedStyle(
+            name=BORDERED_PERCENT, alignment=Alignment(horizontal='center'), border=thin_border, number_format='0%',
+        ),
+    ]
+
+
+def register_styles(wb, palette=APOGEU_PALETTE):
+    """Registra os estilos nomeados no workbook (idempotente)"""
+    existing = set(wb.named_styles)
+    for style in build_styles(palette):
+        if style.name not in existing:
+            wb.add_named_style(style)
+    return wb
+
+
+def status_rules(ws, cell_range, palette, statuses=STATUS_STYLES, default=None):
+    """Colore uma faixa de status com regras de formatação condicional da aba
+
+    Uma regra por status (``{'Concluído': COMPLETED, ...}``), com o
+    preenchimento do estilo correspondente na paleta; ``default`` colore os
+    demais valores. As células da faixa ficam com um único estilo base.
+    """
+    for status, style in statuses.items():
+        formula = '"{}"'.format(status.replace('"', '""'))
+        rule = CellIsRule(operator='equal', formula=[formula], fill=solid_fill(palette[style]), stopIfTrue=True)
+        ws.conditional_formatting.add(cell_range, rule)
+    if default is not None:
+        ws.conditional_formatting.add(cell_range, FormulaRule(formula=['TRUE'], fill=solid_fill(palette[default])))
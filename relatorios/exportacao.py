@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""Tabela colunar de métricas e exportação em CSV e Parquet
+
+As métricas de um relatório ficam em uma única ``ColumnTable`` (um array
+NumPy por coluna), montada em uma passada a partir do fluxo de linhas. A
+planilha, o CSV e o Parquet são escritos a partir dela, em blocos, sem
+nova extração do banco: cada formato a mais custa apenas a serialização.
+
+O Parquet requer o pacote opcional pyarrow.
+"""
+
+import csv
+import datetime
+from itertools import islice
+
+import numpy as np
+
+from relatorios.metricas import DEFAULT_CHUNK_SIZE
+
+
+class ColumnTable:
+    """Tabela em memória com um array NumPy por coluna"""
+
+    def __init__(self, columns, arrays):
+        self.columns = tuple(columns)
+        self.arrays = dict(zip(self.columns, arrays))
+        lengths = {len(array) for array in arrays}
+        if len(lengths) > 1:
+            raise ValueError('Colunas com tamanhos diferentes')
+        self.length = lengths.pop() if lengths else 0
+
+    @classmethod
+    def from_rows(cls, columns, rows, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Monta a tabela a partir de um fluxo de tuplas, bloco a bloco
+
+        Datas (datetime.date) viram datetime64[D], com None como NaT; as
+        demais colunas têm o tipo inferido pelo NumPy. O tipo de cada coluna
+        vem dos valores não nulos do bloco. Só um bloco de tuplas fica em
+        memória.
+        """
+        rows = iter(rows)
+        parts = [[] for _ in columns]
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            for part, values in zip(parts, zip(*chunk)):
+                part.append(_column_array(values))
+        if not parts[0]:
+            return cls(columns, [np.zeros(0) for _ in columns])
+        return cls(columns, [np.concatenate(part) for part in parts])
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, column):
+        return self.arrays[column]
+
+    def chunks(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Fatias da tabela como dicts ``coluna -> array`` (visões, sem cópia)"""
+        for start in range(0, self.length, chunk_size):
+            yield {name: array[start:start + chunk_size] for name, array in self.arrays.items()}
+
+    def rows(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Linhas como tuplas de valores Python (datas como datetime.date)"""
+        for chunk in self.chunks(chunk_size):
+            yield from zip(*(chunk[name].tolist() for name in self.columns))
+
+
+def _column_array(values):
+    sample = next((value for value in values if value is not None), None)
+    if isinstance(sample, datetime.date):
+        return np.array(values, dtype='datetime64[D]')
+    return np.asarray(values)
+
+
+def write_csv(table, target, chunk_size=DEFAULT_CHUNK_SIZE, header=None):
+    """Grava a tabela em CSV (UTF-8, vírgula, ponto decimal, datas ISO)
+
+    ``target`` é um caminho ou um arquivo de texto aberto. ``header``
+    substitui os nomes das colunas na primeira linha.
+    """
+    if isinstance(target, (str, bytes)) or hasattr(target, '__fspath__'):
+        with open(target, 'w', encoding='utf-8', newline='') as f:
+            return write_csv(table, f, chunk_size, header)
+
+    writer = csv.writer(target)
+    writer.writerow(header or table.columns)
+    for chunk in table.chunks(chunk_size):
+        # Cada coluna vira texto de uma vez (datas em ISO pelo próprio NumPy)
+        writer.writerows(zip(*(_csv_values(chunk[name]) for name in table.columns)))
+
+
+def _csv_values(array):
+    if np.issubdtype(array.dtype, np.datetime64):
+        return np.datetime_as_string(array, unit='D').tolist()
+    return array.tolist()
+
+
+def write_parquet(table, target, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Grava a tabela em Parquet, um row group por bloco (requer pyarrow)"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError('A exportação em Parquet requer o pacote pyarrow (pip install pyarrow)') from exc
+
+    writer = None
+    try:
+        for chunk in table.chunks(chunk_size):
+            batch = pa.record_batch([pa.array(chunk[name]) for name in table.columns], names=list(table.columns))
+            if writer is None:
+                writer = pq.ParquetWriter(target, batch.schema)
+            writer.write_batch(batch)
+        if writer is None:
+            empty = pa.table({name: pa.array(table[name]) for name in table.columns})
+            pq.write_table(empty, target)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+# Formatos aceitos por export_table
+WRITERS = {'csv': write_csv, 'parquet': write_parquet}
+
+
+def export_table(table, targets, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Grava a mesma tabela em vários formatos (``{'csv': caminho, ...}``)"""
+    for fmt, target in targets.items():
+        if fmt not in WRITERS:
+            raise ValueError(f'Formato de exportação desconhecido: {fmt}')
+        if target is not None:
+            WRITERS[fmt](table, target, chunk_size=chunk_size)
+
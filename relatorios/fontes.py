@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""Leitura em blocos das tabelas da aplicação (drizzle/schema.ts)
+
+As consultas usam cursores do lado do servidor (SSCursor no MySQL) e
+``fetchmany`` com lotes de tamanho fixo, entregando as linhas como geradores.
+Nenhuma tabela é carregada inteira em memória.
+
+O mesmo código roda sobre um arquivo SQLite com o esquema das migrações do
+drizzle (``create_sqlite_schema``), o que permite gerar relatórios e testar
+sem um MySQL disponível. No SQLite as colunas timestamp chegam como texto e
+são convertidas em datetime na leitura dos lotes, sem conversor global do
+sqlite3 (que valeria para todas as conexões do processo).
+"""
+
+import csv
+import datetime
+import json
+import os
+import re
+import sqlite3
+from urllib.parse import unquote, urlparse
+
+DEFAULT_BATCH_SIZE = 10_000
+
+DRIZZLE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'drizzle')
+
+# Colunas lidas de cada tabela, na ordem das tuplas entregues
+TABLE_COLUMNS = {
+    'users': ('id', 'name', 'email', 'loginMethod', 'role', 'createdAt', 'lastSignedIn'),
+    'campaigns': (
+        'id', 'userId', 'name', 'platform', 'status', 'budget', 'startDate', 'endDate', 'createdAt', 'updatedAt',
+    ),
+    'campaignMetrics': (
+        'id', 'campaignId', 'date', 'impressions', 'clicks', 'conversions', 'spend', 'revenue', 'ctr', 'roas',
+    ),
+    'crmLeads': ('id', 'userId', 'name', 'email', 'phone', 'source', 'status', 'createdAt', 'updatedAt'),
+    'apiCredentials': ('id', 'userId', 'platform', 'isActive', 'lastValidated', 'createdAt', 'updatedAt'),
+    'userSubscriptions': ('id', 'userId', 'planId', 'status', 'startDate', 'endDate', 'paymentMethod', 'createdAt'),
+    'whatsappInteractions': (
+        'id', 'userId', 'leadId', 'phoneNumber', 'messageType', 'senderType', 'status', 'createdAt',
+    ),
+}
+
+# Linhas de campaignMetrics unidas à campanha (ver DataSource.campaign_metrics)
+CAMPAIGN_METRIC_COLUMNS = (
+    'campaignId', 'platform', 'date', 'impressions', 'clicks', 'conversions', 'spend', 'revenue', 'id',
+)
+
+
+# Colunas timestamp do esquema do drizzle (texto no SQLite)
+TIMESTAMP_COLUMNS = frozenset({
+    'date', 'createdAt', 'updatedAt', 'startDate', 'endDate', 'lastSignedIn', 'lastValidated',
+})
+
+
+def _parse_timestamps(row, positions):
+    """Converte em datetime o texto das colunas timestamp (``positions``) de uma linha do SQLite"""
+    row = list(row)
+    for position in positions:
+        if isinstance(row[position], str):
+            row[position] = datetime.datetime.fromisoformat(row[position])
+    return tuple(row)
+
+
+def _mysql_to_sqlite(statement):
+    """Adapta um CREATE TABLE do drizzle (MySQL) para o SQLite"""
+    statement = re.sub(r'enum\([^)]*\)', 'varchar(32)', statement)
+    return statement.replace('DEFAULT (now())', 'DEFAULT CURRENT_TIMESTAMP')
+
+
+def create_sqlite_schema(connection, migrations_dir=DRIZZLE_DIR):
+    """Cria no SQLite as tabelas das migrações do drizzle, na ordem do journal"""
+    with open(os.path.join(migrations_dir, 'meta', '_journal.json'), encoding='utf-8') as f:
+        journal = json.load(f)
+
+    for entry in sorted(journal['entries'], key=lambda e: e['idx']):
+        with open(os.path.join(migrations_dir, entry['tag'] + '.sql'), encoding='utf-8') as f:
+            statements = f.read().split('--> statement-breakpoint')
+        for statement in statements:
+            if statement.strip():
+                connection.execute(_mysql_to_sqlite(statement))
+    connection.commit()
+
+
+def csv_rows(path, width, skip_header=True):
+    """Linhas de um CSV (UTF-8) como tuplas de ``width`` textos, uma a uma
+
+    Linhas curtas são completadas com '' e colunas a mais são descartadas.
+    """
+    with open(path, encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        if skip_header:
+            next(reader, None)
+        for row in reader:
+            if row:
+                yield tuple((row + [''] * width)[:width])
+
+
+class DataSource:
+    """Conexão somente leitura com o banco da aplicação (MySQL ou SQLite)"""
+
+    def __init__(self, connection, dialect):
+        self.connection = connection
+        self.dialect = dialect
+        self.placeholder = '%s' if dialect == 'mysql' else '?'
+
+    @classmethod
+    def from_url(cls, url):
+        """Abre a conexão a partir de DATABASE_URL (mysql://...) ou sqlite:///arquivo.db"""
+        if url.startswith('sqlite:///'):
+            connection = sqlite3.connect(url[len('sqlite:///'):])
+            return cls(connection, 'sqlite')
+
+        parsed = urlparse(url)
+        if parsed.scheme != 'mysql':
+            raise ValueError(f'URL de banco não suportada: {parsed.scheme}://')
+
+        try:
+            import pymysql
+            import pymysql.cursors
+        except ImportError as exc:
+            raise ImportError('A leitura do MySQL requer o pacote pymysql (pip install pymysql)') from exc
+
+        connection = pymysql.connect(
+            host=parsed.hostname or 'localhost',
+            port=parsed.port or 3306,
+            user=unquote(parsed.username or ''),
+            password=unquote(parsed.password or ''),
+            database=parsed.path.lstrip('/'),
+            charset='utf8mb4',
+            cursorclass=pymysql.cursors.SSCursor,
+        )
+        return cls(connection, 'mysql')
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def batches(self, query, params=(), batch_size=DEFAULT_BATCH_SIZE):
+        """Executa a consulta e entrega listas de até ``batch_size`` tuplas"""
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(query, params)
+            timestamps = self._timestamp_positions(cursor)
+            while True:
+                batch = cursor.fetchmany(batch_size)
+                if not batch:
+                    return
+                if timestamps:
+                    batch = [_parse_timestamps(row, timestamps) for row in batch]
+                yield batch
+        finally:
+            cursor.close()
+
+    def rows(self, query, params=(), batch_size=DEFAULT_BATCH_SIZE):
+        """Executa a consulta e entrega as tuplas uma a uma"""
+        for batch in self.batches(query, params, batch_size):
+            yield from batch
+
+    def table_batches(self, table, user_id=None, batch_size=DEFAULT_BATCH_SIZE):
+        """Lê uma tabela de TABLE_COLUMNS em lotes, opcionalmente filtrada por userId"""
+        columns = TABLE_COLUMNS[table]
+        query = 'SELECT {} FROM {}'.format(', '.join(self._quote(c) for c in columns), self._quote(table))
+        params = ()
+        if user_id is not None:
+            query += f' WHERE {self._quote("userId")} = {self.placeholder}'
+            params = (user_id,)
+        query += f' ORDER BY {self._quote("id")}'
+        return self.batches(query, params, batch_size)
+
+    def campaigns(self, user_id=None, batch_size=DEFAULT_BATCH_SIZE):
+        """Campanhas (colunas de TABLE_COLUMNS['campaigns'])"""
+        for batch in self.table_batches('campaigns', user_id, batch_size):
+            yield from batch
+
+    def campaign_metrics_batches(self, user_id=None, start=None, end=None, batch_size=DEFAULT_BATCH_SIZE):
+        """Lotes de campaignMetrics em ordem de data (colunas de CAMPAIGN_METRIC_COLUMNS)
+
+        ``start`` e ``end`` delimitam o período (início inclusivo, fim
+        exclusivo). As métricas continuam como texto, como estão no banco.
+        """
+        q = self._quote
+        query = (
+            f'SELECT m.{q("campaignId")}, c.{q("platform")}, m.{q("date")}, m.{q("impressions")}, '
+            f'm.{q("clicks")}, m.{q("conversions")}, m.{q("spend")}, m.{q("revenue")}, m.{q("id")} '
+            f'FROM {q("campaignMetrics")} m JOIN {q("campaigns")} c ON c.{q("id")} = m.{q("campaignId")}'
+        )
+        conditions = []
+        params = []
+        if user_id is not None:
+            conditions.append(f'c.{q("userId")} = {self.placeholder}')
+            params.append(user_id)
+        if start is not None:
+            conditions.append(f'm.{q("date")} >= {self.placeholder}')
+            params.append(self._timestamp_param(start))
+        if end is not None:
+            conditions.append(f'm.{q("date")} < {self.placeholder}')
+            params.append(self._timestamp_param(end))
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += f' ORDER BY m.{q("date")}, m.{q("campaignId")}'
+        return self.batches(query, tuple(params), batch_size)
+
+    def campaign_metrics(self, user_id=None, start=None, end=None, batch_size=DEFAULT_BATCH_SIZE):
+        """Linhas de campaignMetrics uma a uma (ver campaign_metrics_batches)"""
+        for batch in self.campaign_metrics_batches(user_id, start, end, batch_size):
+            yield from batch
+
+    def _timestamp_positions(self, cursor):
+        """Posições das colunas timestamp no resultado (só no SQLite; o MySQL já entrega datetime)"""
+        if self.dialect != 'sqlite':
+            return []
+        return [i for i, column in enumerate(cursor.description) if column[0] in TIMESTAMP_COLUMNS]
+
+    def _quote(self, identifier):
+        return f'`{identifier}`'
+
+    def _timestamp_param(self, value):
+        if self.dialect == 'sqlite' and isinstance(value, (datetime.date, datetime.datetime)):
+            if not isinstance(value, datetime.datetime):
+                value = datetime.datetime.combine(value, datetime.time())
+            return value.isoformat(sep=' ')
+        return value
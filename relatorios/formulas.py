@@ -0,0 +1,503 @@
+# -*- coding: utf-8 -*-
+"""Fórmulas com valor em cache
+
+O openpyxl grava as fórmulas sem resultado (``<f>`` com ``<v>`` vazio): até
+alguém abrir e salvar o arquivo no Excel, leitores sem motor de cálculo
+(pandas, o servidor Node, ``load_workbook(data_only=True)``) veem None. Aqui
+cada fórmula é gravada junto com o valor calculado na geração; o Excel
+recalcula ao abrir (fullCalcOnLoad) e mantém a célula viva.
+
+``CachedFormulas`` envolve o workbook: ``save`` calcula as fórmulas das
+abas (``Evaluator``), grava o .xlsx (compatível com relatorios.saida.save)
+e acrescenta os valores ao XML das abas. O avaliador cobre o subconjunto que
+os geradores emitem: aritmética (+ - * / ^ %, &, comparações), referências
+a células e faixas, inclusive de outras abas, e SUM, AVERAGE, COUNTIF,
+ROWS, COLUMNS e IF. Fórmulas fora dele ficam sem cache, como no openpyxl,
+ou recebem o valor por ``CachedFormulas.cache``.
+"""
+
+import io
+import operator
+import re
+import zipfile
+from xml.sax.saxutils import escape
+
+from openpyxl.compat import safe_string
+from openpyxl.formula import Tokenizer
+from openpyxl.formula.tokenizer import Token
+from openpyxl.utils.cell import range_boundaries
+from openpyxl.writer.excel import ExcelWriter
+
+from relatorios.saida import zip_archive
+
+# <c> de fórmula como o openpyxl grava: atributos, <f>...</f> e <v> vazio
+_FORMULA_CELL = re.compile(rb'<c r="([A-Z]+[0-9]+)"([^>]*)><f>(.*?)</f>(?:<v></v>|<v/>)?</c>')
+
+
+class UnsupportedFormula(ValueError):
+    """Fórmula fora do subconjunto do avaliador (função, referência ou sintaxe)"""
+
+
+class ExcelError(str):
+    """Valor de erro do Excel ('#DIV/0!', '#VALUE!'...), propagado pelas operações"""
+
+
+DIV0 = ExcelError('#DIV/0!')
+VALUE = ExcelError('#VALUE!')
+
+
+class Range:
+    """Valores de uma faixa de células (lista de linhas)"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def values(self):
+        for row in self.rows:
+            yield from row
+
+
+def number(value):
+    """Valor como número, com as coerções da aritmética do Excel"""
+    if isinstance(value, Range):
+        cells = list(value.values())
+        if len(cells) != 1:
+            return VALUE
+        value = cells[0]
+    if isinstance(value, ExcelError):
+        return value
+    if value is None:
+        return 0
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return float(value) if value.strip() else VALUE
+        except ValueError:
+            return VALUE
+    return value
+
+
+def text(value):
+    """Valor como texto, para o operador &"""
+    if isinstance(value, Range):
+        cells = list(value.values())
+        value = cells[0] if len(cells) == 1 else VALUE
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return value if isinstance(value, str) else str(value)
+
+
+def scalar(value):
+    """Valor de uma célula (faixas de uma célula só) para comparações e IF"""
+    if isinstance(value, Range):
+        cells = list(value.values())
+        return cells[0] if len(cells) == 1 else VALUE
+    return value
+
+
+def _rank(value):
+    # Ordem do Excel entre tipos: números < texto < lógicos
+    if isinstance(value, bool):
+        return 2, value
+    if isinstance(value, str):
+        return 1, value.lower()
+    return 0, value
+
+
+def compare(op, left, right):
+    left, right = scalar(left), scalar(right)
+    for value in (left, right):
+        if isinstance(value, ExcelError):
+            return value
+    # Célula vazia vale 0, '' ou FALSE conforme o outro lado
+    if left is None:
+        left = '' if isinstance(right, str) else False if isinstance(right, bool) else 0
+    if right is None:
+        right = '' if isinstance(left, str) else False if isinstance(left, bool) else 0
+    return op(_rank(left), _rank(right))
+
+
+def arithmetic(op):
+    def apply(left, right):
+        left, right = number(left), number(right)
+        for value in (left, right):
+            if isinstance(value, ExcelError):
+                return value
+        try:
+            return op(left, right)
+        except ZeroDivisionError:
+            return DIV0
+    return apply
+
+
+def concatenate(left, right):
+    left, right = text(left), text(right)
+    for value in (left, right):
+        if isinstance(value, ExcelError):
+            return value
+    return left + right
+
+
+INFIX = {
+    '+': (30, arithmetic(operator.add)),
+    '-': (30, arithmetic(operator.sub)),
+    '*': (40, arithmetic(operator.mul)),
+    '/': (40, arithmetic(operator.truediv)),
+    '^': (50, arithmetic(operator.pow)),
+    '&': (20, concatenate),
+    '=': (10, lambda a, b: compare(operator.eq, a, b)),
+    '<>': (10, lambda a, b: compare(operator.ne, a, b)),
+    '<': (10, lambda a, b: compare(operator.lt, a, b)),
+    '>': (10, lambda a, b: compare(operator.gt, a, b)),
+    '<=': (10, lambda a, b: compare(operator.le, a, b)),
+    '>=': (10, lambda a, b: compare(operator.ge, a, b)),
+}
+# Negação antes de ^ (no Excel, -2^2 = 4); o % pós-fixo se aplica ao operando
+PREFIX_POWER = 60
+
+
+def _numbers(args):
+    """Números dos argumentos: em faixas só os números; fora delas com coerção"""
+    for arg in args:
+        if isinstance(arg, Range):
+            for value in arg.values():
+                if isinstance(value, ExcelError):
+                    yield value
+                elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                    yield value
+        else:
+            yield number(arg)
+
+
+def fn_sum(*args):
+    total = 0
+    for value in _numbers(args):
+        if isinstance(value, ExcelError):
+            return value
+        total += value
+    return total
+
+
+def fn_average(*args):
+    values = list(_numbers(args))
+    for value in values:
+        if isinstance(value, ExcelError):
+            return value
+    return sum(values) / len(values) if values else DIV0
+
+
+_CRITERION = re.compile(r'^(<=|>=|<>|<|>|=)?(.*)$', re.S)
+
+
+def _wildcard(pattern):
+    """Regex de um padrão de COUNTIF: * e ? curingas, ~ escapa o caractere seguinte"""
+    parts = re.split(r'(~[*?~]|[*?])', pattern)
+    regex = ''.join(
+        '.*' if part == '*' else '.' if part == '?' else re.escape(part[1:] if part[:1] == '~' else part)
+        for part in parts
+    )
+    return re.compile(regex, re.IGNORECASE | re.DOTALL)
+
+
+def criterion(value):
+    """Predicado de um critério de COUNTIF (``'Concluído'``, ``'>=10'``, ``'<>x'``, ``'a*'``)"""
+    if not isinstance(value, str):
+        value = scalar(value)
+        return lambda cell: cell is not None and compare(operator.eq, cell, value) is True
+    op, target = _CRITERION.match(value).groups()
+    try:
+        target_number = float(target)
+    except ValueError:
+        target_number = None
+    ops = {'<=': operator.le, '>=': operator.ge, '<': operator.lt, '>': operator.gt, '<>': operator.ne}
+
+    if target_number is not None:
+        def numeric(cell):
+            if isinstance(cell, (int, float)) and not isinstance(cell, bool):
+                return ops.get(op, operator.eq)(cell, target_number)
+            return op == '<>'
+        return numeric
+
+    if op in ('<', '>', '<=', '>='):
+        return lambda cell: isinstance(cell, str) and ops[op](cell.lower(), target.lower())
+    if target == '':
+        # '' e '=' casam células vazias; '<>' casa as preenchidas
+        return (lambda cell: cell not in (None, '')) if op == '<>' else (lambda cell: cell in (None, ''))
+    pattern = _wildcard(target)
+
+    def matches(cell):
+        found = isinstance(cell, str) and pattern.fullmatch(cell) is not None
+        return not found if op == '<>' else found
+    return matches
+
+
+def fn_countif(cells, condition):
+    if not isinstance(cells, Range):
+        return VALUE
+    test = criterion(condition)
+    return sum(1 for value in cells.values() if test(value))
+
+
+def fn_rows(cells):
+    return len(cells.rows) if isinstance(cells, Range) else 1
+
+
+def fn_columns(cells):
+    return len(cells.rows[0]) if isinstance(cells, Range) and cells.rows else 1
+
+
+FUNCTIONS = {
+    'SUM': fn_sum,
+    'AVERAGE': fn_average,
+    'COUNTIF': fn_countif,
+    'ROWS': fn_rows,
+    'COLUMNS': fn_columns,
+}
+
+
+class _Parser:
+    """Árvore de uma fórmula a partir dos tokens do openpyxl (precedência do Excel)"""
+
+    def __init__(self, formula):
+        self.tokens = [t for t in Tokenizer(formula).items if t.type != Token.WSPACE]
+        self.position = 0
+
+    def parse(self):
+        node = self.expression(0)
+        if self.peek() is not None:
+            raise UnsupportedFormula(f'Token inesperado: {self.peek().value}')
+        return node
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def next(self):
+        token = self.peek()
+        if token is None:
+            raise UnsupportedFormula('Fórmula incompleta')
+        self.position += 1
+        return token
+
+    def expression(self, power):
+        left = self.operand()
+        while True:
+            token = self.peek()
+            if token is None:
+                return left
+            if token.type == Token.OP_POST and token.value == '%':
+                self.next()
+                left = ('op', INFIX['/'][1], left, ('value', 100))
+            elif token.type == Token.OP_IN and token.value in INFIX and INFIX[token.value][0] > power:
+                self.next()
+                bind, apply = INFIX[token.value]
+                # ^ também associa à esquerda no Excel (2^3^2 = 64)
+                left = ('op', apply, left, self.expression(bind))
+            else:
+                return left
+
+    def operand(self):
+        token = self.next()
+        if token.type == Token.OP_PRE:
+            node = self.expression(PREFIX_POWER)
+            return node if token.value == '+' else ('op', INFIX['-'][1], ('value', 0), node)
+        if token.type == Token.PAREN and token.subtype == Token.OPEN:
+            node = self.expression(0)
+            self.close()
+            return node
+        if token.type == Token.FUNC and token.subtype == Token.OPEN:
+            return self.call(token.value[:-1].upper())
+        if token.type == Token.OPERAND:
+            if token.subtype == Token.NUMBER:
+                value = float(token.value)
+                return ('value', int(value) if value.is_integer() and 'e' not in token.value.lower() else value)
+            if token.subtype == Token.TEXT:
+                return ('value', token.value[1:-1].replace('""', '"'))
+            if token.subtype == Token.LOGICAL:
+                return ('value', token.value.upper() == 'TRUE')
+            if token.subtype == Token.ERROR:
+                return ('value', ExcelError(token.value))
+            if token.subtype == Token.RANGE:
+                return ('ref', token.value)
+        raise UnsupportedFormula(f'Token não suportado: {token.value}')
+
+    def call(self, name):
+        if name != 'IF' and name not in FUNCTIONS:
+            raise UnsupportedFormula(f'Função não suportada: {name}')
+        args = []
+        if self.peek() is not None and self.peek().type == Token.FUNC and self.peek().subtype == Token.CLOSE:
+            self.next()
+            return ('call', name, args)
+        while True:
+            args.append(self.expression(0))
+            token = self.next()
+            if token.type == Token.SEP and token.subtype == Token.ARG:
+                continue
+            if token.type == Token.FUNC and token.subtype == Token.CLOSE:
+                return ('call', name, args)
+            raise UnsupportedFormula(f'Token inesperado: {token.value}')
+
+    def close(self):
+        token = self.next()
+        if not (token.type == Token.PAREN and token.subtype == Token.CLOSE):
+            raise UnsupportedFormula(f'Token inesperado: {token.value}')
+
+
+def parse(formula):
+    """Árvore de uma fórmula (``'=SUM(A1:A3)*2'``); UnsupportedFormula fora do subconjunto"""
+    return _Parser(formula).parse()
+
+
+class Evaluator:
+    """Calcula as fórmulas de um workbook do openpyxl a partir das células gravadas"""
+
+    def __init__(self, wb):
+        self.wb = wb
+        self._values = {}
+        self._pending = set()
+
+    def cell_value(self, ws, row, column):
+        """Valor de uma célula: constante ou resultado da fórmula (calculado uma vez)"""
+        cell = ws._cells.get((row, column))
+        if cell is None:
+            return None
+        if cell.data_type != 'f':
+            return cell.value
+        key = (ws.title, row, column)
+        if key not in self._values:
+            if key in self._pending:
+                raise UnsupportedFormula(f'Referência circular em {ws.title}!{cell.coordinate}')
+            self._pending.add(key)
+            try:
+                self._values[key] = self.evaluate(cell.value, ws)
+            finally:
+                self._pending.discard(key)
+        return self._values[key]
+
+    def evaluate(self, formula, ws):
+        """Resultado de ``formula`` como se estivesse em uma célula de ``ws``"""
+        if not isinstance(formula, str):
+            raise UnsupportedFormula(f'Fórmula não suportada: {formula!r}')
+        result = scalar(self._eval(parse(formula), ws))
+        # Referência a uma célula vazia resulta em 0
+        return 0 if result is None else result
+
+    def reference(self, text, ws):
+        if '!' in text:
+            sheet, text = text.rsplit('!', 1)
+            sheet = sheet[1:-1].replace("''", "'") if sheet.startswith("'") else sheet
+            if sheet not in self.wb.sheetnames:
+                raise UnsupportedFormula(f'Aba inexistente: {sheet}')
+            ws = self.wb[sheet]
+        try:
+            min_col, min_row, max_col, max_row = range_boundaries(text.replace('$', ''))
+        except ValueError:
+            raise UnsupportedFormula(f'Referência não suportada: {text}') from None
+        # Colunas ou linhas inteiras (C:C, 3:3) vão até a última célula gravada
+        min_row, min_col = min_row or 1, min_col or 1
+        max_row, max_col = max_row or max(ws.max_row, min_row), max_col or max(ws.max_column, min_col)
+        return Range([
+            [self.cell_value(ws, row, column) for column in range(min_col, max_col + 1)]
+            for row in range(min_row, max_row + 1)
+        ])
+
+    def _eval(self, node, ws):
+        kind = node[0]
+        if kind == 'value':
+            return node[1]
+        if kind == 'ref':
+            return self.reference(node[1], ws)
+        if kind == 'op':
+            return node[1](self._eval(node[2], ws), self._eval(node[3], ws))
+        name, args = node[1], node[2]
+        if name == 'IF':
+            if not 1 <= len(args) <= 3:
+                raise UnsupportedFormula('IF espera de 1 a 3 argumentos')
+            condition = scalar(self._eval(args[0], ws))
+            if isinstance(condition, ExcelError):
+                return condition
+            condition = number(condition)
+            if isinstance(condition, ExcelError):
+                return condition
+            if condition:
+                return self._eval(args[1], ws) if len(args) > 1 else True
+            return self._eval(args[2], ws) if len(args) > 2 else False
+        return FUNCTIONS[name](*(self._eval(arg, ws) for arg in args))
+
+    def formula_values(self, ws):
+        """``{coordenada: valor}`` das fórmulas da aba dentro do subconjunto suportado"""
+        values = {}
+        for (row, column), cell in ws._cells.items():
+            if cell.data_type != 'f':
+                continue
+            try:
+                values[cell.coordinate] = self.cell_value(ws, row, column)
+            except UnsupportedFormula:
+                continue
+        return values
+
+
+def cached_value_xml(value):
+    """Atributo de tipo e conteúdo de ``<v>`` do resultado de uma fórmula"""
+    if isinstance(value, ExcelError):
+        return ' t="e"', escape(value)
+    if isinstance(value, bool):
+        return ' t="b"', '1' if value else '0'
+    if isinstance(value, str):
+        return ' t="str"', escape(value)
+    return '', safe_string(value)
+
+
+def fill_cached_values(xml, values):
+    """Acrescenta ao XML de uma aba os valores das fórmulas (``{'B4': 3, ...}``)"""
+    def replace(match):
+        ref = match.group(1).decode()
+        if ref not in values:
+            return match.group(0)
+        kind, text = cached_value_xml(values[ref])
+        return b'<c r="%s"%s%s><f>%s</f><v>%s</v></c>' % (
+            match.group(1), match.group(2), kind.encode(), match.group(3), text.encode('utf-8'),
+        )
+
+    return _FORMULA_CELL.sub(replace, xml)
+
+
+class CachedFormulas:
+    """Workbook do openpyxl cujas fórmulas são gravadas com o valor em cache"""
+
+    def __init__(self, wb):
+        self.wb = wb
+        # título da aba -> {coordenada: valor} informados com cache()
+        self.values = {}
+
+    def cache(self, cell, value):
+        """Fixa o resultado de uma fórmula (fora do subconjunto do avaliador, por exemplo)"""
+        self.values.setdefault(cell.parent.title, {})[cell.coordinate] = value
+
+    def save(self, target, compression=None):
+        """Grava o .xlsx em ``target`` (caminho ou arquivo binário aberto)
+
+        ``compression`` é um perfil de relatorios.saida.
+        """
+        evaluator = Evaluator(self.wb)
+        sheets = {}
+        for ws in self.wb.worksheets:
+            values = {**evaluator.formula_values(ws), **self.values.get(ws.title, {})}
+            if values:
+                sheets[ws] = values
+
+        # O openpyxl grava sem compressão; o pacote final é comprimido uma vez só
+        shell = io.BytesIO()
+        ExcelWriter(self.wb, zipfile.ZipFile(shell, 'w', zipfile.ZIP_STORED)).save()
+        sheets = {ws.path.lstrip('/'): values for ws, values in sheets.items()}
+
+        with zipfile.ZipFile(shell) as source, zip_archive(target, compression) as package:
+            for info in source.infolist():
+                data = source.read(info)
+                if info.filename in sheets:
+                    data = fill_cached_values(data, sheets[info.filename])
+                package.writestr(info.filename, data)
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""Medição por seção das execuções dos geradores (desligada por padrão)
+
+Cada seção registra tempo total, tempo de CPU, pico de memória alocada
+(tracemalloc, acima do início da seção) e quantos itens emitiu: células de
+planilha ou parágrafos de documento. Há duas formas de delimitar seções:
+
+    with profiler.section('Métricas', wb):      # código em funções
+        ...
+
+    profiler.mark('CAPA', doc)                  # scripts planos: fecha a
+    ...                                         # seção anterior e abre esta
+    profiler.finish()
+
+Os itens são contados pela diferença no alvo (workbook, worksheet ou
+documento do python-docx) ou explicitamente com ``count(n)``, útil no modo
+write-only, em que as células não ficam na aba.
+
+Desligado, ``section`` devolve um contexto vazio compartilhado e ``mark`` e
+``count`` retornam de imediato: o custo é uma chamada de função.
+
+Decisões tomadas durante a execução (por exemplo a estratégia de texto de
+cada coluna no salvamento paralelo) entram como notas, com ``note(nome,
+valor)``, no resumo e no JSON.
+"""
+
+import contextlib
+import json
+import sys
+import time
+import tracemalloc
+
+_NULL_SECTION = contextlib.nullcontext()
+
+# Profiler ligado no momento (recebe as contagens de count())
+_active = None
+
+
+def count(items=1):
+    """Soma ``items`` à seção aberta do profiler ligado, se houver"""
+    if _active is not None:
+        _active._count(items)
+
+
+def emitted(target):
+    """Itens já emitidos no alvo: células (openpyxl) ou parágrafos (python-docx)"""
+    if target is None:
+        return 0
+    if hasattr(target, 'worksheets'):
+        return sum(emitted(ws) for ws in target.worksheets)
+    if hasattr(target, '_cells'):
+        # Abas write-only não guardam as células; use count()
+        return len(target._cells)
+    if hasattr(target, 'element') and hasattr(target, 'paragraphs'):
+        return len(target.element.body.xpath('.//w:p'))
+    return 0
+
+
+class _Frame:
+    __slots__ = ('name', 'target', 'wall', 'cpu', 'memory', 'peak', 'items', 'start_items')
+
+    def __init__(self, name, target):
+        self.name = name
+        self.target = target
+        self.items = 0
+        self.start_items = emitted(target)
+        self.memory = 0
+        self.peak = 0
+        self.cpu = time.process_time()
+        self.wall = time.perf_counter()
+
+
+class Profiler:
+    """Coleta as medições das seções de uma execução"""
+
+    def __init__(self, enabled=True, trace_memory=True):
+        self.enabled = enabled
+        self.trace_memory = trace_memory and enabled
+        self.records = []
+        self.notes = {}
+        self._stack = []
+        self._started_tracing = False
+
+    def section(self, name, target=None):
+        """Contexto que mede o bloco como uma seção"""
+        if not self.enabled:
+            return _NULL_SECTION
+        return self._section(name, target)
+
+    @contextlib.contextmanager
+    def _section(self, name, target):
+        self._open(name, target)
+        try:
+            yield
+        finally:
+            self._close()
+
+    def mark(self, name, target=None):
+        """Fecha a seção aberta por ``mark`` (se houver) e abre ``name``"""
+        if not self.enabled:
+            return
+        if self._stack:
+            self._close()
+        self._open(name, target)
+
+    def finish(self):
+        """Fecha as seções abertas e desliga a medição de memória"""
+        global _active
+        if not self.enabled:
+            return
+        while self._stack:
+            self._close()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        if _active is self:
+            _active = None
+
+    def _open(self, name, target):
+        global _active
+        _active = self
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                # O pico da seção externa precisa sobreviver ao reset abaixo
+                parent = self._stack[-1]
+                parent.peak = max(parent.peak, peak)
+            tracemalloc.reset_peak()
+        frame = _Frame(name, target)
+        if self.trace_memory:
+            frame.memory = frame.peak = tracemalloc.get_traced_memory()[0]
+        self._stack.append(frame)
+
+    def _close(self):
+        frame = self._stack.pop()
+        wall = time.perf_counter() - frame.wall
+        cpu = time.process_time() - frame.cpu
+        peak = 0
+        if self.trace_memory:
+            frame.peak = max(frame.peak, tracemalloc.get_traced_memory()[1])
+            peak = frame.peak - frame.memory
+            if self._stack:
+                parent = self._stack[-1]
+                parent.peak = max(parent.peak, frame.peak)
+        items = frame.items + emitted(frame.target) - frame.start_items
+        if self._stack:
+            self._stack[-1].items += frame.items
+        self.records.append({
+            'section': frame.name,
+            'depth': len(self._stack),
+            'wall_s': round(wall, 6),
+            'cpu_s': round(cpu, 6),
+            'peak_kb': round(peak / 1024, 1),
+            'items': items,
+        })
+
+    def note(self, name, value):
+        """Registra ``value`` (escalar, lista ou dicionário, serializável em JSON) como a nota ``name``"""
+        if self.enabled:
+            self.notes[name] = value
+
+    def _count(self, items):
+        if self._stack:
+            self._stack[-1].items += items
+
+    def summary(self):
+        """Resumo legível, uma linha por seção (na ordem em que terminaram)"""
+        lines = ['⏱️  Tempo por seção', f'   {"seção":<40} {"total":>9} {"CPU":>9} {"pico mem.":>11} {"itens":>9}']
+        for record in self.records:
+            name = '  ' * record['depth'] + record['section']
+            lines.append(
+                f'   {name[:40]:<40} {record["wall_s"]:>8.3f}s {record["cpu_s"]:>8.3f}s '
+                f'{record["peak_kb"]:>8.0f} KB {record["items"]:>9,}'
+            )
+        for name, value in self.notes.items():
+            lines.append(f'📝 {name}')
+            for item in value if isinstance(value, list) else [value]:
+                if isinstance(item, dict):
+                    item = ' '.join(f'{key}={val}' for key, val in item.items())
+                lines.append(f'   {item}')
+        return '\n'.join(lines)
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'sections': self.records, 'notes': self.notes}, f, ensure_ascii=False, indent=2)
+
+    def report(self, destination):
+        """Imprime o resumo (``destination`` '-') ou grava o JSON no caminho dado"""
+        if not self.enabled:
+            return
+        self.finish()
+        if destination == '-':
+            print(self.summary(), file=sys.stderr)
+        else:
+            self.write_json(destination)
+
+
+# Profiler desligado, padrão dos parâmetros ``profiler``
+DISABLED = Profiler(enabled=False)
+
+
+def from_option(destination):
+    """Profiler para a opção --profile: desligado se ``destination`` for None"""
+    return Profiler(enabled=destination is not None)
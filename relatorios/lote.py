@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""Geração em lote: um arquivo por cliente, distribuída em um pool de processos
+
+Cada cliente (users.id) é gerado e salvo por um processo do pool, de forma
+independente. Uma falha em um cliente é registrada no resumo e não
+interrompe os demais.
+
+Um processo que morre (falta de memória, ``os._exit``) quebra o pool
+inteiro: todos os clientes ainda sem resultado recebem BrokenProcessPool.
+Esses clientes rodam de novo, cada um em um processo só dele (com no
+máximo ``workers`` ao mesmo tempo); assim só o cliente que derruba o
+processo fica com erro.
+"""
+
+import hashlib
+import json
+import os
+import re
+import statistics
+import time
+import traceback
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+TenantResult = namedtuple('TenantResult', 'tenant path seconds error')
+BatchSummary = namedtuple('BatchSummary', 'results workers seconds succeeded failed')
+
+
+def tenant_path(output_dir, filename, tenant):
+    """Caminho do arquivo de um cliente (ID higienizado para nome de arquivo)
+
+    Um ID alterado pela higienização ganha um trecho do sha1 do ID original
+    (``a/b`` -> ``a_b-1f3a9c2e``), para não coincidir com outro cliente
+    (``a_b``).
+    """
+    tenant = str(tenant)
+    safe = re.sub(r'[^A-Za-z0-9_.-]', '_', tenant)
+    if safe != tenant:
+        safe += '-' + hashlib.sha1(tenant.encode()).hexdigest()[:8]
+    return os.path.join(output_dir, filename.format(tenant=safe))
+
+
+def _run_tenant(build, tenant, path):
+    """Executa ``build(tenant, path)`` no processo do pool, isolando erros"""
+    started = time.perf_counter()
+    try:
+        build(tenant, path)
+    except Exception:
+        return TenantResult(tenant, path, time.perf_counter() - started, traceback.format_exc(limit=5))
+    return TenantResult(tenant, path, time.perf_counter() - started, None)
+
+
+def _run_isolated(build, tenant, path):
+    """Executa o cliente em um processo só dele: se o processo morrer, só este cliente falha"""
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        try:
+            return pool.submit(_run_tenant, build, tenant, path).result()
+        except BrokenProcessPool as exc:
+            return TenantResult(tenant, path, time.perf_counter() - started, repr(exc))
+
+
+def run_batch(build, tenants, output_dir, filename, workers=None):
+    """Gera um arquivo por cliente em paralelo
+
+    ``build(tenant, path)`` precisa ser serializável (função de módulo ou
+    functools.partial dela). ``filename`` recebe ``{tenant}``. O pool tem
+    ``workers`` processos (padrão: número de CPUs). IDs repetidos são
+    gerados uma vez; dois IDs com o mesmo arquivo são um ValueError.
+    """
+    paths = {tenant: tenant_path(output_dir, filename, tenant) for tenant in tenants}
+    owners = {}
+    for tenant, path in paths.items():
+        if owners.setdefault(path, tenant) != tenant:
+            raise ValueError(f'Os clientes {owners[path]!r} e {tenant!r} gravariam o mesmo arquivo: {path}')
+    workers = max(1, min(workers or os.cpu_count() or 1, len(paths)))
+    os.makedirs(output_dir, exist_ok=True)
+
+    started = time.perf_counter()
+    results = []
+    unfinished = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_run_tenant, build, tenant, path): tenant for tenant, path in paths.items()}
+        for future in as_completed(futures):
+            try:
+                results.append(future.result())
+            except BrokenProcessPool:
+                unfinished.append(futures[future])
+
+    if unfinished:
+        # O pool quebrou: não há como saber qual cliente derrubou o processo
+        with ThreadPoolExecutor(max_workers=workers) as threads:
+            results.extend(threads.map(lambda tenant: _run_isolated(build, tenant, paths[tenant]), unfinished))
+
+    failed = sum(1 for r in results if r.error)
+    return BatchSummary(results, workers, time.perf_counter() - started, len(results) - failed, failed)
+
+
+def summary_stats(summary):
+    """Estatísticas de tempo por cliente (segundos)"""
+    times = sorted(r.seconds for r in summary.results if not r.error)
+    if not times:
+        return {}
+    return {
+        'mean': statistics.fmean(times),
+        'p50': times[len(times) // 2],
+        'p95': times[min(len(times) - 1, int(len(times) * 0.95))],
+        'max': times[-1],
+    }
+
+
+def format_summary(summary, slowest=5):
+    """Resumo legível do lote"""
+    lines = [
+        f'📦 Lote concluído em {summary.seconds:.1f}s com {summary.workers} processos',
+        f'   ✅ {summary.succeeded} gerados   ❌ {summary.failed} com erro',
+    ]
+    stats = summary_stats(summary)
+    if stats:
+        lines.append(
+            '   ⏱️  por cliente: média {mean:.2f}s | p50 {p50:.2f}s | p95 {p95:.2f}s | máx {max:.2f}s'.format(**stats)
+        )
+        ok = sorted((r for r in summary.results if not r.error), key=lambda r: r.seconds, reverse=True)
+        lines.append('   Mais lentos: ' + ', '.join(f'{r.tenant} ({r.seconds:.2f}s)' for r in ok[:slowest]))
+    for result in summary.results:
+        if result.error:
+            lines.append(f'   ❌ {result.tenant}: {result.error.strip().splitlines()[-1]}')
+    return '\n'.join(lines)
+
+
+def write_summary(summary, path):
+    """Grava o resumo do lote em JSON"""
+    data = {
+        'workers': summary.workers,
+        'seconds': summary.seconds,
+        'succeeded': summary.succeeded,
+        'failed': summary.failed,
+        'stats': summary_stats(summary),
+        'tenants': [r._asdict() for r in summary.results],
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
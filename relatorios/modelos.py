@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""Modelos de planilha: esqueleto estático montado uma vez e clonado por execução
+
+Títulos mesclados, larguras de coluna, tabelas fixas e grades com bordas não
+dependem dos dados, mas custam a cada execução. O modelo monta esse
+esqueleto uma vez por processo; cada execução recebe uma cópia e preenche só
+as regiões de dados.
+
+A cópia não mexe nas tabelas de estilos do openpyxl: os estilos nomeados
+são registrados de novo em cada cópia (``styles``) e a primeira célula de
+cada estilo do modelo recebe, pelos atributos públicos, o nome do estilo e
+a fonte, preenchimento, borda, alinhamento, proteção e formato (copiados
+do modelo uma vez e compartilhados, pois são imutáveis). As outras células
+do mesmo estilo copiam o ``_style`` dessa célula, já na cópia. Nada da
+cópia aponta para o workbook do modelo.
+
+Gráficos não fazem parte do modelo: eles referenciam as abas e são criados
+a cada execução.
+"""
+
+from copy import copy
+
+from openpyxl import Workbook
+from openpyxl.cell.cell import MergedCell
+
+# Atributos de formatação copiados célula a célula (fora o estilo nomeado)
+CELL_FORMATS = ('font', 'fill', 'border', 'alignment', 'protection', 'number_format')
+
+
+def copy_worksheet(source, target, formats=None):
+    """Copia células, mesclagens, larguras, alturas e visibilidade de ``source`` para ``target``
+
+    Configurações de página e propriedades da aba não são copiadas. Os
+    estilos nomeados usados em ``source`` precisam estar registrados no
+    workbook de ``target``. ``formats`` guarda, entre chamadas com o mesmo
+    workbook de origem, a formatação já copiada de cada estilo.
+    """
+    if formats is None:
+        formats = {}
+    # Primeira célula de cada estilo do modelo na cópia: as demais copiam o estilo dela
+    styled = {}
+    for row in source.iter_rows():
+        for source_cell in row:
+            if isinstance(source_cell, MergedCell) or (source_cell.value is None and not source_cell.has_style):
+                continue
+            cell = target.cell(row=source_cell.row, column=source_cell.column, value=source_cell.value)
+            if not source_cell.has_style:
+                continue
+            style_id = source_cell.style_id
+            first = styled.get(style_id)
+            if first is not None:
+                cell._style = copy(first._style)
+                continue
+            if style_id not in formats:
+                # Objetos de estilo são imutáveis: a mesma cópia serve a todas as cópias do modelo
+                formats[style_id] = (source_cell.style, [copy(getattr(source_cell, attr)) for attr in CELL_FORMATS])
+            name, values = formats[style_id]
+            cell.style = name
+            for attr, value in zip(CELL_FORMATS, values):
+                setattr(cell, attr, value)
+            styled[style_id] = cell
+
+    for key, dimension in source.column_dimensions.items():
+        if dimension.customWidth:
+            target.column_dimensions[key].width = dimension.width
+        target.column_dimensions[key].hidden = dimension.hidden
+    for key, dimension in source.row_dimensions.items():
+        if dimension.customHeight:
+            target.row_dimensions[key].height = dimension.height
+        target.row_dimensions[key].hidden = dimension.hidden
+
+    for merged in source.merged_cells.ranges:
+        target.merge_cells(merged.coord)
+
+    target.sheet_state = source.sheet_state
+
+
+class WorkbookTemplate:
+    """Esqueleto de planilha montado por ``draw(wb)`` na primeira cópia e reutilizado
+
+    ``styles(wb)`` registra no workbook os estilos nomeados do modelo (ex.:
+    relatorios.estilos.register_styles); é chamado no modelo e em cada cópia.
+    """
+
+    def __init__(self, draw, styles=None):
+        self.draw = draw
+        self.styles = styles
+        self._source = None
+        # Formatação de cada estilo do modelo, copiada na primeira cópia (ver copy_worksheet)
+        self._formats = {}
+
+    def _workbook(self):
+        wb = Workbook()
+        if self.styles is not None:
+            self.styles(wb)
+        return wb
+
+    @property
+    def source(self):
+        """Workbook do modelo (montado uma vez por processo; não alterar)"""
+        if self._source is None:
+            wb = self._workbook()
+            self.draw(wb)
+            self._source = wb
+        return self._source
+
+    def clone(self):
+        """Novo Workbook com as abas, estilos e conteúdo estático do modelo"""
+        source = self.source
+        wb = self._workbook()
+        wb.remove(wb.active)
+        for worksheet in source.worksheets:
+            copy_worksheet(worksheet, wb.create_sheet(worksheet.title), self._formats)
+        wb.active = source.index(source.active)
+        return wb
@@ -0,0 +1,526 @@
+# -*- coding: utf-8 -*-
+"""Gravação paralela de planilhas: cada aba (ou bloco de linhas) em um processo
+
+No ``wb.save`` do openpyxl todas as abas são serializadas e comprimidas em
+sequência, em um único núcleo. Aqui as linhas das abas de dados são
+agendadas em blocos (``ParallelWorkbook.append``) e, na gravação, cada
+bloco vira XML de ``<sheetData>`` já comprimido (deflate) em um processo do
+pool. O restante do pacote — workbook.xml, styles.xml, gráficos, desenhos,
+rels e abas escritas direto no workbook — vem de uma "casca" salva pelo
+próprio openpyxl, com as mesmas abas, larguras e gráficos, mas sem essas
+linhas.
+
+Na montagem, cada aba da casca é dividida em cabeçalho e rodapé em volta do
+``<sheetData>``, e os blocos comprimidos são concatenados entre eles: cada
+bloco termina em um ``Z_FULL_FLUSH`` (fronteira de byte, sem referências ao
+bloco anterior), como no pigz, e o CRC-32 da entrada é combinado a partir
+dos CRCs dos blocos. Com o perfil 'store' (relatorios.saida) os blocos são
+gravados sem compressão e concatenados do mesmo jeito. O pacote é escrito
+por ``ZipWriter`` (cabeçalhos e diretório central montados com struct), sem
+depender do estado interno do zipfile.
+
+Texto: cada coluna é gravada com strings inline (como no openpyxl) ou com a
+tabela compartilhada (sharedStrings.xml), escolhida por uma amostra das
+primeiras linhas de cada aba, lida no processo principal antes do pool.
+Colunas de poucos valores repetidos (status, responsável, plataforma) vão
+para a tabela, montada com os textos da amostra e enviada a todos os
+processos; colunas de alta cardinalidade (nomes de campanha) ficam inline,
+sem crescer uma tabela em memória. Um texto que não estava na amostra sai
+inline, mesmo em coluna compartilhada. A escolha de cada coluna fica em
+``ParallelWorkbook.string_stats``.
+
+As funções de linhas (``render``) precisam ser serializáveis (funções de
+módulo) e produzir listas de ``(valor, estilo)``: estilo é o nome de um
+estilo registrado no workbook (relatorios.estilos) ou None; datas chegam
+como número de série do Excel (relatorios.datas).
+"""
+
+import io
+import math
+import os
+import re
+import struct
+import tempfile
+import time
+import zipfile
+import zlib
+from collections import namedtuple
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+from xml.sax.saxutils import escape
+
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.compat.numbers import NUMERIC_TYPES
+from openpyxl.utils import get_column_letter
+from openpyxl.utils.exceptions import IllegalCharacterError
+from openpyxl.writer.excel import ExcelWriter
+
+from relatorios.instrumentacao import count
+from relatorios.saida import compression_profile
+
+# Linhas por bloco agendado (cada bloco é uma tarefa do pool)
+PART_ROWS = 50_000
+
+# Linhas acumuladas em texto antes de cada compressão no processo do pool
+_FLUSH_ROWS = 1_000
+
+# Linhas do início de cada aba usadas para escolher a estratégia de texto das colunas
+STRING_SAMPLE_ROWS = 10_000
+# Coluna compartilhada: cada texto se repete em média SHARED_MIN_REPEAT vezes na
+# amostra, com no máximo SHARED_MAX_DISTINCT textos distintos
+SHARED_MIN_REPEAT = 2
+SHARED_MAX_DISTINCT = 5_000
+
+SHARED = 'shared'
+INLINE = 'inline'
+
+SHARED_STRINGS_PATH = 'xl/sharedStrings.xml'
+SHARED_STRINGS_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml'
+SHARED_STRINGS_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings'
+
+Part = namedtuple('Part', 'render args first_row rows')
+RenderedPart = namedtuple('RenderedPart', 'path rows width cells size crc shared inline')
+
+_SHEET_DATA = re.compile(rb'<sheetData\s*/>|<sheetData>\s*</sheetData>')
+_DIMENSION = re.compile(rb'<dimension ref="[^"]*"\s*/>')
+
+
+def _gf2_times(matrix, vector):
+    total = 0
+    for row in matrix:
+        if not vector:
+            break
+        if vector & 1:
+            total ^= row
+        vector >>= 1
+    return total
+
+
+def _gf2_square(matrix):
+    return [_gf2_times(matrix, row) for row in matrix]
+
+
+def crc32_combine(crc1, crc2, length2):
+    """CRC-32 de ``A + B`` a partir de crc32(A), crc32(B) e len(B) (crc32_combine da zlib)"""
+    if length2 <= 0:
+        return crc1
+    # Operador de um bit zero, depois de dois e de quatro
+    odd = [0xEDB88320] + [1 << n for n in range(31)]
+    even = _gf2_square(odd)
+    odd = _gf2_square(even)
+    while True:
+        even = _gf2_square(odd)
+        if length2 & 1:
+            crc1 = _gf2_times(even, crc1)
+        length2 >>= 1
+        if not length2:
+            break
+        odd = _gf2_square(even)
+        if length2 & 1:
+            crc1 = _gf2_times(odd, crc1)
+        length2 >>= 1
+        if not length2:
+            break
+    return crc1 ^ crc2
+
+
+def _text_xml(value):
+    """``<t>`` de um texto (inline ou da tabela compartilhada)"""
+    if ILLEGAL_CHARACTERS_RE.search(value):
+        raise IllegalCharacterError(f'{value} cannot be used in worksheets.')
+    stripped = value.strip()
+    space = ' xml:space="preserve"' if stripped and stripped != value else ''
+    return f'<t{space}>{escape(value)}</t>'
+
+
+def cell_xml(ref, value, style_id=0):
+    """``<c>`` de uma célula, no mesmo formato do openpyxl (texto inline)"""
+    style = f' s="{style_id}"' if style_id else ''
+    if value is None:
+        return f'<c r="{ref}"{style} t="n"/>'
+    if isinstance(value, str):
+        if not value:
+            return f'<c r="{ref}"{style} t="inlineStr"/>'
+        return f'<c r="{ref}"{style} t="inlineStr"><is>{_text_xml(value)}</is></c>'
+    if isinstance(value, bool):
+        return f'<c r="{ref}"{style} t="b"><v>{value:d}</v></c>'
+    if isinstance(value, NUMERIC_TYPES):
+        # Como o safe_string do openpyxl: NaN e infinito ficam vazios
+        text = '' if math.isnan(value) or math.isinf(value) else '%.16g' % value
+        return f'<c r="{ref}"{style} t="n"><v>{text}</v></c>'
+    raise TypeError(f'Valor não suportado na gravação paralela: {value!r}')
+
+
+def _render_part(render, args, first_row, styles, path, level, strings=None, shared_columns=()):
+    """Processo do pool: grava ``render(*args)`` como linhas XML comprimidas em ``path``
+
+    ``level`` é o nível do zlib; None grava sem compressão.
+
+    Textos das colunas ``shared_columns`` (índices a partir de 0) presentes
+    em ``strings`` (texto -> índice na tabela compartilhada) são gravados
+    como referência à tabela; os demais, inline.
+    """
+    compressor = _compressor(level)
+    letters = []
+    row_number = first_row
+    width = cells = size = crc = 0
+    pending = []
+    # Células de texto por coluna: pela tabela compartilhada e inline
+    shared, inline = {}, {}
+
+    def flush(f, data):
+        nonlocal size, crc
+        data = data.encode('utf-8')
+        size += len(data)
+        crc = zlib.crc32(data, crc)
+        f.write(compressor.compress(data))
+
+    with open(path, 'wb') as f:
+        for row in render(*args):
+            if len(row) > width:
+                letters.extend(get_column_letter(col) for col in range(width + 1, len(row) + 1))
+                width = len(row)
+            suffix = str(row_number)
+            pending.append(f'<row r="{suffix}">')
+            for column, (letter, (value, style)) in enumerate(zip(letters, row)):
+                style_id = styles[style] if style else 0
+                if value.__class__ is str and value:
+                    index = strings.get(value) if column in shared_columns else None
+                    if index is not None:
+                        s = f' s="{style_id}"' if style_id else ''
+                        pending.append(f'<c r="{letter}{suffix}"{s} t="s"><v>{index}</v></c>')
+                        shared[column] = shared.get(column, 0) + 1
+                        continue
+                    inline[column] = inline.get(column, 0) + 1
+                pending.append(cell_xml(letter + suffix, value, style_id))
+            pending.append('</row>')
+            cells += len(row)
+            row_number += 1
+            if row_number % _FLUSH_ROWS == 0:
+                flush(f, ''.join(pending))
+                pending.clear()
+        flush(f, ''.join(pending))
+        # Fronteira de byte sem referências ao bloco anterior: os blocos são concatenáveis
+        f.write(compressor.flush(zlib.Z_FULL_FLUSH))
+    return RenderedPart(path, row_number - first_row, width, cells, size, crc, shared, inline)
+
+
+class _Stored:
+    """Compressor nulo, com a interface do zlib (perfil 'store')"""
+
+    def compress(self, data):
+        return data
+
+    def flush(self, mode=zlib.Z_FINISH):
+        return b''
+
+
+def _compressor(level):
+    if level is None:
+        return _Stored()
+    return zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+
+
+def _deflate(data, level, mode=zlib.Z_FULL_FLUSH):
+    compressor = _compressor(level)
+    return compressor.compress(data) + compressor.flush(mode)
+
+
+# Registros do ZIP (APPNOTE 4.3): cabeçalho local, diretório central e fim do diretório
+_LOCAL_HEADER = struct.Struct('<IHHHHHIIIHH')
+_CENTRAL_HEADER = struct.Struct('<IHHHHHHIIIHHHHHII')
+_END_OF_DIRECTORY = struct.Struct('<IHHHHIIH')
+_ZIP64_END_OF_DIRECTORY = struct.Struct('<IQHHIIQQQQ')
+_ZIP64_LOCATOR = struct.Struct('<IIQI')
+# Valores a partir do limite vão para os campos Zip64; o campo de 32 bits fica com a marca
+_ZIP64_LIMIT = 0xFFFFFFFF
+_ZIP64_MARK = 0xFFFFFFFF
+
+ZipEntry = namedtuple('ZipEntry', 'name flags method dos_time dos_date crc compress_size size offset')
+
+
+class ZipWriter:
+    """ZIP gravado em sequência, com entradas já comprimidas (CRC e tamanhos conhecidos)
+
+    ``target`` é um caminho ou um arquivo binário aberto, inclusive sem seek
+    (pipe, socket): os cabeçalhos locais saem completos e o deslocamento de
+    cada entrada é contado aqui. Tamanhos e deslocamentos acima de 4 GiB
+    usam os campos Zip64.
+    """
+
+    def __init__(self, target):
+        self._owned = isinstance(target, (str, os.PathLike))
+        self._file = open(target, 'wb') if self._owned else target
+        self._offset = 0
+        self._entries = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        if exc_type is None:
+            self.close()
+        elif self._owned:
+            self._file.close()
+
+    def _write(self, data):
+        self._file.write(data)
+        self._offset += len(data)
+
+    def write(self, name, segments, size, crc, method=zipfile.ZIP_DEFLATED):
+        """Grava uma entrada
+
+        ``segments`` são bytes ou caminhos de arquivos com deflate bruto (ou o
+        conteúdo em si, com ``method`` ZIP_STORED), na ordem; ``size`` e
+        ``crc`` são do conteúdo descomprimido.
+        """
+        compress_size = sum(len(s) if isinstance(s, bytes) else os.path.getsize(s) for s in segments)
+        year, month, day, hour, minute, second = time.localtime()[:6]
+        encoded = name.encode('utf-8')
+        entry = ZipEntry(
+            encoded, 0 if name.isascii() else 0x800, method, hour << 11 | minute << 5 | second // 2,
+            (year - 1980) << 9 | month << 5 | day, crc, compress_size, size, self._offset,
+        )
+        self._entries.append(entry)
+
+        extra = b''
+        sizes = (compress_size, size)
+        if max(sizes) >= _ZIP64_LIMIT:
+            extra = struct.pack('<HHQQ', 1, 16, size, compress_size)
+            sizes = (_ZIP64_MARK, _ZIP64_MARK)
+        self._write(_LOCAL_HEADER.pack(
+            0x04034B50, 45 if extra else 20, entry.flags, method, entry.dos_time, entry.dos_date, crc, *sizes,
+            len(encoded), len(extra),
+        ) + encoded + extra)
+        for segment in segments:
+            if isinstance(segment, bytes):
+                self._write(segment)
+            else:
+                with open(segment, 'rb') as f:
+                    while chunk := f.read(1 << 20):
+                        self._write(chunk)
+
+    def writestr(self, name, data, method=zipfile.ZIP_DEFLATED, level=zlib.Z_DEFAULT_COMPRESSION):
+        """Comprime ``data`` (nível ``level``; None com ZIP_STORED) e grava a entrada"""
+        self.write(name, [_deflate(data, level, zlib.Z_FINISH)], len(data), zlib.crc32(data), method)
+
+    def close(self):
+        """Grava o diretório central e o fim do diretório"""
+        start = self._offset
+        for entry in self._entries:
+            # Campos Zip64 só para os valores que não cabem em 32 bits, nesta ordem
+            large = [value for value in (entry.size, entry.compress_size, entry.offset) if value >= _ZIP64_LIMIT]
+            extra = struct.pack(f'<HH{len(large)}Q', 1, 8 * len(large), *large) if large else b''
+            size, compress_size, offset = (
+                _ZIP64_MARK if value >= _ZIP64_LIMIT else value
+                for value in (entry.size, entry.compress_size, entry.offset)
+            )
+            self._write(_CENTRAL_HEADER.pack(
+                0x02014B50, 3 << 8 | 20, 45 if large else 20, entry.flags, entry.method, entry.dos_time,
+                entry.dos_date, entry.crc, compress_size, size, len(entry.name), len(extra), 0, 0, 0,
+                0o600 << 16, offset,
+            ) + entry.name + extra)
+
+        count, directory_size = len(self._entries), self._offset - start
+        if count > 0xFFFF or start >= _ZIP64_LIMIT or directory_size >= _ZIP64_LIMIT:
+            end = self._offset
+            self._write(_ZIP64_END_OF_DIRECTORY.pack(
+                0x06064B50, _ZIP64_END_OF_DIRECTORY.size - 12, 45, 45, 0, 0, count, count, directory_size, start,
+            ))
+            self._write(_ZIP64_LOCATOR.pack(0x07064B50, 0, end, 1))
+        self._write(_END_OF_DIRECTORY.pack(
+            0x06054B50, 0, 0, min(count, 0xFFFF), min(count, 0xFFFF),
+            _ZIP64_MARK if directory_size >= _ZIP64_LIMIT else directory_size,
+            _ZIP64_MARK if start >= _ZIP64_LIMIT else start, 0,
+        ))
+        if self._owned:
+            self._file.close()
+        else:
+            self._file.flush()
+
+
+class ParallelWorkbook:
+    """Workbook do openpyxl cujas linhas agendadas são gravadas por um pool de processos
+
+    ``wb`` é a casca (modo normal, estilos já registrados): abas, larguras,
+    gráficos e células escritas diretamente nela são gravadas pelo
+    openpyxl. As abas que recebem blocos de ``append`` não podem ter
+    células na casca. ``workers`` é o tamanho do pool (padrão: número de
+    CPUs). Compatível com relatorios.saida.save.
+    """
+
+    def __init__(self, wb, workers=None, level=zlib.Z_DEFAULT_COMPRESSION):
+        self.wb = wb
+        self.workers = workers
+        self.level = level
+        self._parts = {}
+        # Estratégia de texto por aba e coluna, preenchida por save()
+        self.string_stats = []
+
+    def append(self, ws, render, *args, rows):
+        """Agenda ``rows`` linhas de ``render(*args)`` no fim da aba ``ws``
+
+        As linhas são produzidas e serializadas só na gravação, em um
+        processo do pool; ``rows`` fixa a numeração das linhas dos blocos
+        seguintes e é conferido na gravação.
+        """
+        parts = self._parts.setdefault(ws, [])
+        first_row = parts[-1].first_row + parts[-1].rows if parts else 1
+        parts.append(Part(render, args, first_row, rows))
+
+    def _style_ids(self):
+        """Índice em cellXfs de cada estilo nomeado (fixado antes de gravar a casca)"""
+        ws = self.wb.worksheets[0]
+        ids = {}
+        for name in self.wb.named_styles:
+            cell = WriteOnlyCell(ws)
+            cell.style = name
+            ids[name] = cell.style_id
+        return ids
+
+    def _choose_strings(self):
+        """Estratégia de texto de cada coluna, pelas primeiras STRING_SAMPLE_ROWS linhas de cada aba
+
+        Devolve a tabela compartilhada (texto -> índice), as colunas
+        compartilhadas de cada aba e, por aba e coluna, os textos distintos
+        e as células de texto da amostra.
+        """
+        strings, columns, samples = {}, {}, {}
+        for ws, parts in self._parts.items():
+            distinct, cells = {}, {}
+            remaining = STRING_SAMPLE_ROWS
+            for part in parts:
+                if remaining <= 0:
+                    break
+                for row in islice(part.render(*part.args), min(remaining, part.rows)):
+                    for column, (value, _) in enumerate(row):
+                        if value.__class__ is str and value:
+                            cells[column] = cells.get(column, 0) + 1
+                            seen = distinct.setdefault(column, {})
+                            if len(seen) <= SHARED_MAX_DISTINCT:
+                                seen[value] = None
+                remaining -= part.rows
+
+            shared = set()
+            for column, seen in distinct.items():
+                if len(seen) <= SHARED_MAX_DISTINCT and cells[column] >= SHARED_MIN_REPEAT * len(seen):
+                    shared.add(column)
+                    for value in seen:
+                        if value not in strings and not ILLEGAL_CHARACTERS_RE.search(value):
+                            strings[value] = len(strings)
+            columns[ws] = frozenset(shared)
+            samples[ws] = {column: (len(seen), cells[column]) for column, seen in distinct.items()}
+        return strings, columns, samples
+
+    def save(self, target, compression=None):
+        """Grava o .xlsx em ``target`` (caminho ou arquivo binário aberto, inclusive sem seek)
+
+        ``compression`` é um perfil de relatorios.saida; sem perfil, os
+        blocos usam ``level``.
+        """
+        method, level = compression_profile(compression)
+        if compression is None:
+            level = self.level
+        for ws in self._parts:
+            if ws._cells:
+                raise ValueError(f'A aba {ws.title!r} tem células na casca e linhas agendadas')
+        styles = self._style_ids()
+        strings, shared_columns, samples = self._choose_strings()
+        jobs = sum(len(parts) for parts in self._parts.values())
+        workers = max(1, min(self.workers or os.cpu_count() or 1, jobs))
+        self.string_stats = []
+
+        with tempfile.TemporaryDirectory(prefix='xlsx-') as folder, ProcessPoolExecutor(workers) as pool:
+            futures = {
+                ws: [
+                    (part, pool.submit(
+                        _render_part, part.render, part.args, part.first_row, styles,
+                        os.path.join(folder, f'{index}-{number}.xml.deflate'), level,
+                        strings, shared_columns[ws],
+                    ))
+                    for number, part in enumerate(parts)
+                ]
+                for index, (ws, parts) in enumerate(self._parts.items())
+            }
+            # A casca é gravada (sem compressão) enquanto o pool renderiza as linhas
+            shell = io.BytesIO()
+            ExcelWriter(self.wb, zipfile.ZipFile(shell, 'w', zipfile.ZIP_STORED)).save()
+            sheets = {ws.path.lstrip('/'): ws for ws in self._parts}
+
+            with zipfile.ZipFile(shell) as source, ZipWriter(target) as package:
+                for info in source.infolist():
+                    data = source.read(info)
+                    ws = sheets.get(info.filename)
+                    if ws is not None:
+                        results = self._write_sheet(package, info.filename, data, futures[ws], method, level)
+                        self._record_strings(ws, shared_columns[ws], samples[ws], results)
+                        continue
+                    if strings and info.filename == '[Content_Types].xml':
+                        data = data.replace(b'</Types>', (
+                            f'<Override PartName="/{SHARED_STRINGS_PATH}" ContentType="{SHARED_STRINGS_TYPE}"/></Types>'
+                        ).encode())
+                    elif strings and info.filename == 'xl/_rels/workbook.xml.rels':
+                        data = data.replace(b'</Relationships>', (
+                            f'<Relationship Id="rIdSharedStrings" Type="{SHARED_STRINGS_REL}" '
+                            f'Target="sharedStrings.xml"/></Relationships>'
+                        ).encode())
+                    package.writestr(info.filename, data, method, level)
+                if strings:
+                    xml = self._shared_strings_xml(strings).encode()
+                    package.writestr(SHARED_STRINGS_PATH, xml, method, level)
+
+    def _shared_strings_xml(self, strings):
+        references = sum(stat['shared_cells'] for stat in self.string_stats)
+        items = ''.join(f'<si>{_text_xml(text)}</si>' for text in strings)
+        return (
+            '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            f'count="{references}" uniqueCount="{len(strings)}">{items}</sst>'
+        )
+
+    def _record_strings(self, ws, shared_columns, sample, results):
+        """Estratégia e contagem das células de texto de cada coluna da aba"""
+        shared, inline = {}, {}
+        for result in results:
+            for column, cells in result.shared.items():
+                shared[column] = shared.get(column, 0) + cells
+            for column, cells in result.inline.items():
+                inline[column] = inline.get(column, 0) + cells
+        for column in sorted(set(sample) | set(shared) | set(inline)):
+            distinct, cells = sample.get(column, (0, 0))
+            self.string_stats.append({
+                'sheet': ws.title,
+                'column': get_column_letter(column + 1),
+                'strategy': SHARED if column in shared_columns else INLINE,
+                'sample_distinct': distinct,
+                'sample_cells': cells,
+                'shared_cells': shared.get(column, 0),
+                'inline_cells': inline.get(column, 0),
+            })
+
+    def _write_sheet(self, package, name, xml, futures, method, level):
+        rendered = []
+        for part, future in futures:
+            result = future.result()
+            if result.rows != part.rows:
+                raise ValueError(f'{name}: bloco com {result.rows} linhas, esperado {part.rows}')
+            rendered.append(result)
+        count(sum(result.cells for result in rendered))
+
+        rows = sum(result.rows for result in rendered)
+        width = max((result.width for result in rendered), default=0)
+        if rows and width:
+            xml = _DIMENSION.sub(f'<dimension ref="A1:{get_column_letter(width)}{rows}"/>'.encode(), xml, count=1)
+        match = _SHEET_DATA.search(xml)
+        head, tail = xml[:match.start()] + b'<sheetData>', b'</sheetData>' + xml[match.end():]
+
+        segments = [_deflate(head, level)]
+        size, crc = len(head), zlib.crc32(head)
+        for result in rendered:
+            segments.append(result.path)
+            crc = crc32_combine(crc, result.crc, result.size)
+            size += result.size
+        segments.append(_deflate(tail, level, zlib.Z_FINISH))
+        crc = crc32_combine(crc, zlib.crc32(tail), len(tail))
+        package.write(name, segments, size + len(tail), crc, method)
+        return rendered
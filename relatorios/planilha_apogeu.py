@@ -0,0 +1,466 @@
+# -*- coding: utf-8 -*-
+"""Planilha de controle do APOGEU: checklist, gráficos e notas
+
+``build_workbook`` gera o arquivo a partir das tarefas do checklist e grava
+em um caminho, em um arquivo aberto ou devolve os bytes. ``main`` é a linha
+de comando (gerar_planilha_excel.py / python -m relatorios planilha-apogeu).
+"""
+
+import argparse
+from functools import partial
+
+from openpyxl.styles import Font, Alignment
+from openpyxl.chart import BarChart, LineChart, PieChart, Reference
+from openpyxl.utils import absolute_coordinate, quote_sheetname
+
+from relatorios.agregacao import week_series
+from relatorios.amostragem import DEFAULT_POINT_BUDGET, chart_source
+from relatorios.armazem import input_fingerprint, stored_build
+from relatorios.datas import parse_br_date
+from relatorios.estilos import (
+    APOGEU_PALETTE, BORDERED_CENTER, BORDERED_PERCENT, BORDERED_WRAP, COMPLETED, HEADER, PENDING,
+    register_styles, status_rules,
+)
+from relatorios.fontes import csv_rows
+from relatorios.formulas import CachedFormulas
+from relatorios.instrumentacao import DISABLED, from_option
+from relatorios.saida import COMPRESSION_PROFILES, messages, output_label, save
+from relatorios.modelos import WorkbookTemplate
+from relatorios.secoes import SheetLayout
+
+# Máximo de pontos por série de gráfico; séries maiores são reduzidas (LTTB)
+# em uma aba oculta
+CHART_POINTS = DEFAULT_POINT_BUDGET
+
+OUTPUT_PATH = '/home/ubuntu/apogeu/CONTROLE_DESENVOLVIMENTO_APOGEU.xlsx'
+
+# Primeira linha livre da aba do checklist, logo após o cabeçalho do modelo
+FIRST_SECTION_ROW = 4
+
+# Dados da instalação
+tasks = [
+    ('1', 'Verificar Windows 10 Pro', 'Pendente', '', '', ''),
+    ('2', 'Desativar Antivírus', 'Pendente', '', '', ''),
+    ('3', 'Instalar Node.js 18+', 'Pendente', '', '', ''),
+    ('4', 'Instalar Git', 'Pendente', '', '', ''),
+    ('5', 'Instalar MySQL 8.0', 'Pendente', '', '', ''),
+    ('6', 'Instalar pnpm', 'Pendente', '', '', ''),
+    ('7', 'Criar pasta C:\\Projetos', 'Pendente', '', '', ''),
+    ('8', 'Clonar repositório GitHub', 'Pendente', '', '', ''),
+    ('9', 'Instalar dependências (pnpm install)', 'Pendente', '', '', ''),
+    ('10', 'Criar banco de dados MySQL', 'Pendente', '', '', ''),
+    ('11', 'Configurar arquivo .env', 'Pendente', '', '', ''),
+    ('12', 'Executar migrações (pnpm db:push)', 'Pendente', '', '', ''),
+    ('13', 'Iniciar Backend (pnpm dev)', 'Pendente', '', '', ''),
+    ('14', 'Iniciar Frontend (pnpm dev)', 'Pendente', '', '', ''),
+    ('15', 'Acessar http://localhost:5173', 'Pendente', '', '', ''),
+    ('16', 'Fazer login na aplicação', 'Pendente', '', '', ''),
+    ('17', 'Executar testes (pnpm test)', 'Pendente', '', '', ''),
+    ('18', 'Verificar TypeScript (pnpm check)', 'Pendente', '', '', ''),
+    ('19', 'Fazer Build (pnpm build)', 'Pendente', '', '', ''),
+    ('20', 'Criar App Desktop', 'Pendente', '', '', ''),
+]
+
+# FASE 2: métrica e status; valor e percentual são fórmulas sobre a coluna
+# Status do checklist (ver progress_rows)
+progress_data = [
+    ('Tarefas Concluídas', 'Iniciando'),
+    ('Tarefas em Progresso', 'Aguardando'),
+    ('Tarefas Pendentes', 'Não Iniciado'),
+    ('Taxa de Conclusão', 'Acompanhamento'),
+]
+
+PROGRESS_STATUS_STYLES = {'Concluído': COMPLETED, 'Aguardando': PENDING}
+
+time_data = [
+    ('Instalação Node.js', '10 min', '', '', 'Pendente'),
+    ('Instalação Git', '5 min', '', '', 'Pendente'),
+    ('Instalação MySQL', '15 min', '', '', 'Pendente'),
+    ('Instalação pnpm', '3 min', '', '', 'Pendente'),
+    ('Download e Setup', '20 min', '', '', 'Pendente'),
+    ('Configuração Banco', '10 min', '', '', 'Pendente'),
+    ('Instalação Dependências', '15 min', '', '', 'Pendente'),
+    ('Execução Migrações', '5 min', '', '', 'Pendente'),
+    ('Testes e Verificação', '10 min', '', '', 'Pendente'),
+]
+
+error_data = [
+    ('', '', '', 'Não', '', 'Registre aqui qualquer erro encontrado'),
+    ('', '', '', 'Não', '', ''),
+    ('', '', '', 'Não', '', ''),
+    ('', '', '', 'Não', '', ''),
+    ('', '', '', 'Não', '', ''),
+]
+
+api_data = [
+    ('Google Ads', 'Não', '', '', 'Não', ''),
+    ('Meta Ads', 'Não', '', '', 'Não', ''),
+    ('TikTok Ads', 'Não', '', '', 'Não', ''),
+    ('OpenAI', 'Não', '', '', 'Não', ''),
+    ('ElevenLabs', 'Não', '', '', 'Não', ''),
+    ('Twilio (WhatsApp)', 'Não', '', '', 'Não', ''),
+    ('PagBrasil', 'Não', '', '', 'Não', ''),
+]
+
+# Dados para gráficos (as quantidades são fórmulas sobre o checklist, ver build_workbook)
+status_data = [
+    ['Status', 'Quantidade'],
+    ['Concluído'],
+    ['Em Progresso'],
+    ['Pendente'],
+]
+
+phase_data = [
+    ['Fase', 'Progresso %'],
+    ['Instalação', 0],
+    ['Configuração', 0],
+    ['Desenvolvimento', 0],
+    ['Testes', 0],
+    ['Deploy', 0],
+]
+
+
+def track_completed(rows, completed_dates):
+    """Repassa as tarefas, acrescentando a ``completed_dates`` as datas de conclusão preenchidas"""
+    for task in rows:
+        if task[3]:
+            completed_dates.append(parse_br_date(task[3]))
+        yield task
+
+
+def progress_rows(status_range, first_row):
+    """Linhas da FASE 2 a partir da linha ``first_row``: contagens e percentuais em fórmulas
+
+    As contagens são COUNTIF sobre ``status_range`` (a coluna Status do
+    checklist, ex.: ``$C$6:$C$25``); pendentes são as demais tarefas. Sem
+    ``status_range`` (checklist vazio) os valores são zero.
+    """
+    if status_range is None:
+        for metric, status in progress_data:
+            yield (metric, 0, 0, status)
+        return
+    done, doing, pending = (f'B{first_row + offset}' for offset in range(3))
+    total = f'ROWS({status_range})'
+    values = [
+        f'=COUNTIF({status_range},"Concluído")',
+        f'=COUNTIF({status_range},"Em Progresso")',
+        f'={total}-{done}-{doing}',
+        f'={done}',
+    ]
+    shares = [done, doing, pending, done]
+    for (metric, status), value, share in zip(progress_data, values, shares):
+        yield (metric, value, f'={share}/{total}', status)
+
+
+def draw_template(wb):
+    """Esqueleto estático da planilha (``TEMPLATE``)
+
+    Estilos nomeados, cabeçalho e larguras da aba do checklist, títulos e
+    tabelas fixas da aba de gráficos e a aba de notas inteira. Nada aqui
+    depende dos dados da execução.
+    """
+    ws = wb.active
+    ws.title = "Checklist Desenvolvimento"
+
+    # ============ CONFIGURAÇÕES GERAIS ============
+    # Estilos nomeados (header, subheader, completed, pending, error, bordered-*)
+    # registrados uma única vez; as células apenas referenciam o nome.
+    register_styles(wb, APOGEU_PALETTE)
+
+    # ============ CABEÇALHO ============
+    layout = SheetLayout(ws, width=6)
+    layout.banner(
+        "🚀 APOGEU - CHECKLIST DE DESENVOLVIMENTO",
+        font=Font(bold=True, size=16, color="0066CC"),
+        alignment=Alignment(horizontal='center', vertical='center'),
+        height=30,
+    )
+    layout.banner(
+        "Seu Pico de Sucesso em Marketing Digital",
+        font=Font(italic=True, size=11, color="6633CC"),
+        alignment=Alignment(horizontal='center'),
+        height=20,
+    )
+    layout.skip()
+
+    # ============ AJUSTAR LARGURA DAS COLUNAS ============
+    ws.column_dimensions['A'].width = 25
+    ws.column_dimensions['B'].width = 25
+    ws.column_dimensions['C'].width = 20
+    ws.column_dimensions['D'].width = 20
+    ws.column_dimensions['E'].width = 20
+    ws.column_dimensions['F'].width = 30
+
+    # ============ CRIAR SEGUNDA ABA - GRÁFICOS ============
+    ws_charts = wb.create_sheet("Gráficos e Análises")
+
+    # Título
+    ws_charts['A1'] = "📊 GRÁFICOS E ANÁLISES DE PROGRESSO"
+    ws_charts['A1'].font = Font(bold=True, size=16, color="0066CC")
+    ws_charts.merge_cells('A1:D1')
+    ws_charts['A1'].alignment = Alignment(horizontal='center')
+    ws_charts.row_dimensions[1].height = 30
+
+    # Dados para gráficos
+    ws_charts['A3'] = "Status do Projeto"
+    ws_charts['A3'].font = Font(bold=True, size=12, color="0066CC")
+
+    for row_idx, row_data in enumerate(status_data, 3):
+        for col_idx, value in enumerate(row_data, 1):
+            ws_charts.cell(row=row_idx, column=col_idx).value = value
+            if row_idx == 3:
+                ws_charts.cell(row=row_idx, column=col_idx).font = Font(bold=True)
+
+    # Dados para gráfico de barras
+    ws_charts['E3'] = "Progresso por Fase"
+    ws_charts['E3'].font = Font(bold=True, size=12, color="0066CC")
+
+    for row_idx, row_data in enumerate(phase_data, 3):
+        for col_idx, value in enumerate(row_data, 5):
+            ws_charts.cell(row=row_idx, column=col_idx).value = value
+            if row_idx == 3:
+                ws_charts.cell(row=row_idx, column=col_idx).font = Font(bold=True)
+
+    # Ajustar largura
+    ws_charts.column_dimensions['A'].width = 25
+    ws_charts.column_dimensions['B'].width = 25
+    ws_charts.column_dimensions['E'].width = 25
+    ws_charts.column_dimensions['F'].width = 25
+
+    # ============ CRIAR TERCEIRA ABA - NOTAS ============
+    ws_notes = wb.create_sheet("Notas e Observações")
+
+    ws_notes['A1'] = "📝 NOTAS E OBSERVAÇÕES"
+    ws_notes['A1'].font = Font(bold=True, size=16, color="0066CC")
+    ws_notes.merge_cells('A1:D1')
+    ws_notes['A1'].alignment = Alignment(horizontal='center')
+    ws_notes.row_dimensions[1].height = 30
+
+    ws_notes['A3'] = "Use esta aba para registrar observações, dúvidas e aprendizados durante a instalação."
+    ws_notes['A3'].font = Font(italic=True, size=11)
+    ws_notes.merge_cells('A3:D3')
+
+    ws_notes['A5'] = "Data"
+    ws_notes['B5'] = "Observação"
+    for col in ['A', 'B']:
+        ws_notes[f'{col}5'].style = HEADER
+
+    ws_notes.column_dimensions['A'].width = 20
+    ws_notes.column_dimensions['B'].width = 80
+
+    for row in range(6, 30):
+        for col in ['A', 'B']:
+            ws_notes[f'{col}{row}'].style = BORDERED_WRAP
+        ws_notes.row_dimensions[row].height = 30
+
+
+# Montado na primeira execução do processo e clonado nas seguintes
+TEMPLATE = WorkbookTemplate(draw_template, partial(register_styles, palette=APOGEU_PALETTE))
+
+
+def build_workbook(output=None, checklist=tasks, chart_points=CHART_POINTS, profiler=DISABLED, compression=None):
+    """Gera a planilha de controle do APOGEU
+
+    ``checklist`` são as linhas da FASE 1 (#, Tarefa, Status, Data Conclusão,
+    Responsável, Observações), em lista ou iterador (lidas uma a uma durante
+    a gravação da seção). ``output`` é um caminho, um arquivo binário aberto
+    ou None (devolve os bytes do .xlsx; ver relatorios.saida). ``compression``
+    é o perfil de compressão do arquivo (relatorios.saida).
+
+    A parte estática vem de uma cópia de ``TEMPLATE``; aqui são gravadas só
+    as seções de dados e os gráficos.
+    """
+    # ============ MODELO ============
+    profiler.mark('MODELO')
+    wb = TEMPLATE.clone()
+    ws = wb["Checklist Desenvolvimento"]
+    # As seções são posicionadas em sequência pelo SheetLayout: cada uma começa
+    # logo após a anterior, qualquer que seja o número de linhas do corpo.
+    layout = SheetLayout(ws, width=6, start_row=FIRST_SECTION_ROW)
+
+    # ============ SEÇÃO 1: CHECKLIST DE INSTALAÇÃO ============
+    profiler.mark('SEÇÃO 1: CHECKLIST DE INSTALAÇÃO', wb)
+    # Datas de conclusão coletadas na mesma passada, para o cronograma semanal
+    completed_dates = []
+    checklist_section = layout.section(
+        "FASE 1: INSTALAÇÃO E CONFIGURAÇÃO",
+        ['#', 'Tarefa', 'Status', 'Data Conclusão', 'Responsável', 'Observações'],
+        track_completed(checklist, completed_dates),
+    )
+    status_range = None
+    if checklist_section.last_row >= checklist_section.first_row:
+        status_range = absolute_coordinate(f'C{checklist_section.first_row}:C{checklist_section.last_row}')
+        # Colorir coluna de status (regras da aba: o Excel recolore ao editar)
+        status_rules(ws, status_range, APOGEU_PALETTE)
+
+    # ============ SEÇÃO 2: PROGRESSO GERAL ============
+    profiler.mark('SEÇÃO 2: PROGRESSO GERAL', wb)
+    # Contagens e percentuais em fórmulas: atualizam no Excel quando um status muda
+    progress_section = layout.section(
+        "FASE 2: PROGRESSO GERAL",
+        ['Métrica', 'Valor', 'Percentual', 'Status'],
+        # As fórmulas referenciam as linhas do próprio corpo
+        lambda section: progress_rows(status_range, section.first_row),
+        cell_style=lambda col, value: BORDERED_PERCENT if col == 3 else BORDERED_CENTER,
+    )
+    status_rules(
+        ws, f'D{progress_section.first_row}:D{progress_section.last_row}', APOGEU_PALETTE, PROGRESS_STATUS_STYLES,
+    )
+
+    # ============ SEÇÃO 3: RASTREAMENTO DE TEMPO ============
+    profiler.mark('SEÇÃO 3: RASTREAMENTO DE TEMPO', wb)
+    layout.section(
+        "FASE 3: RASTREAMENTO DE TEMPO",
+        ['Etapa', 'Tempo Estimado', 'Tempo Real', 'Diferença', 'Status'],
+        time_data,
+        style=BORDERED_CENTER,
+    )
+
+    # ============ SEÇÃO 4: ERROS E SOLUÇÕES ============
+    profiler.mark('SEÇÃO 4: ERROS E SOLUÇÕES', wb)
+    layout.section(
+        "FASE 4: ERROS E SOLUÇÕES",
+        ['Erro', 'Descrição', 'Solução', 'Resolvido?', 'Data', 'Notas'],
+        error_data,
+        style=BORDERED_WRAP,
+    )
+
+    # ============ SEÇÃO 5: CONFIGURAÇÕES DE API ============
+    profiler.mark('SEÇÃO 5: CONFIGURAÇÕES DE API', wb)
+    layout.section(
+        "FASE 5: CONFIGURAÇÕES DE API (OPCIONAL)",
+        ['API', 'Configurada?', 'Chave', 'Data Config.', 'Testada?', 'Observações'],
+        api_data,
+    )
+
+    # ============ GRÁFICOS ============
+    profiler.mark('GRÁFICOS', wb)
+    ws_charts = wb["Gráficos e Análises"]
+
+    # Quantidades do gráfico de pizza: as mesmas fórmulas da FASE 2, sobre o checklist
+    if status_range is None:
+        for row in range(4, 7):
+            ws_charts.cell(row=row, column=2).value = 0
+    else:
+        checklist_status = f'{quote_sheetname(ws.title)}!{status_range}'
+        ws_charts['B4'] = f'=COUNTIF({checklist_status},"Concluído")'
+        ws_charts['B5'] = f'=COUNTIF({checklist_status},"Em Progresso")'
+        ws_charts['B6'] = f'=ROWS({checklist_status})-B4-B5'
+
+    # Gráfico de Pizza
+    pie = PieChart()
+    pie.title = "Distribuição de Tarefas"
+    pie.style = 10
+    labels = Reference(ws_charts, min_col=1, min_row=4, max_row=6)
+    data = Reference(ws_charts, min_col=2, min_row=3, max_row=6)
+    pie.add_data(data, titles_from_data=True)
+    pie.set_categories(labels)
+    ws_charts.add_chart(pie, "A8")
+
+    # Gráfico de Barras
+    bar = BarChart()
+    bar.type = "col"
+    bar.title = "Progresso por Fase (%)"
+    bar.style = 10
+    bar.y_axis.title = 'Progresso (%)'
+    bar.x_axis.title = 'Fases'
+    data_bar = Reference(ws_charts, min_col=6, min_row=3, max_row=8)
+    cats = Reference(ws_charts, min_col=5, min_row=4, max_row=8)
+    bar.add_data(data_bar, titles_from_data=True)
+    bar.set_categories(cats)
+    ws_charts.add_chart(bar, "E8")
+
+    # Dados para gráfico de linha
+    ws_charts['A25'] = "Cronograma de Execução"
+    ws_charts['A25'].font = Font(bold=True, size=12, color="0066CC")
+
+    # Tarefas concluídas por semana ISO, a partir da 'Data Conclusão' do checklist
+    # (pelo menos 4 semanas, mesmo antes de qualquer conclusão)
+    timeline_data = [['Semana', 'Tarefas Concluídas']] + [
+        [f'Semana {week}', count]
+        for week, (_, count) in enumerate(week_series(completed_dates, min_weeks=4) or [(None, 0)] * 4, 1)
+    ]
+
+    for row_idx, row_data in enumerate(timeline_data, 25):
+        for col_idx, value in enumerate(row_data, 1):
+            ws_charts.cell(row=row_idx, column=col_idx).value = value
+            if row_idx == 25:
+                ws_charts.cell(row=row_idx, column=col_idx).font = Font(bold=True)
+
+    # Gráfico de Linha
+    line = LineChart()
+    line.title = "Progresso Semanal"
+    line.style = 10
+    line.y_axis.title = 'Tarefas Concluídas'
+    line.x_axis.title = 'Semanas'
+    timeline_source = chart_source(
+        wb, 'Gráfico Semanal (reduzido)', timeline_data[0],
+        [row[0] for row in timeline_data[1:]], [row[1] for row in timeline_data[1:]], budget=chart_points,
+    )
+    if timeline_source is not None:
+        data_line, cats_line = timeline_source
+    else:
+        last_row = 24 + len(timeline_data)
+        data_line = Reference(ws_charts, min_col=2, min_row=25, max_row=last_row)
+        cats_line = Reference(ws_charts, min_col=1, min_row=26, max_row=last_row)
+    line.add_data(data_line, titles_from_data=True)
+    line.set_categories(cats_line)
+    # Logo abaixo da tabela do cronograma, que cresce com o número de semanas
+    ws_charts.add_chart(line, f"A{25 + len(timeline_data)}")
+
+    # ============ SALVAR WORKBOOK ============
+    profiler.mark('SALVAR WORKBOOK', wb)
+    # Fórmulas gravadas com o valor calculado na geração (relatorios.formulas)
+    return save(CachedFormulas(wb), output, compression)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Gera a planilha de controle do APOGEU')
+    parser.add_argument('--output', default=OUTPUT_PATH, help="Arquivo .xlsx de saída ('-' grava na saída padrão)")
+    parser.add_argument(
+        '--tasks-file',
+        help='CSV com as tarefas do checklist (#, Tarefa, Status, Data Conclusão, Responsável, Observações)',
+    )
+    parser.add_argument(
+        '--profile',
+        nargs='?',
+        const='-',
+        metavar='ARQUIVO.json',
+        help='Mede tempo, CPU, memória e itens emitidos por seção; imprime o resumo ou grava em JSON',
+    )
+    parser.add_argument(
+        '--compression',
+        choices=COMPRESSION_PROFILES,
+        help='Compressão do arquivo: fast (mais rápido), balanced, smallest (menor) ou store (sem compressão)',
+    )
+    parser.add_argument(
+        '--store',
+        metavar='PASTA',
+        help='Armazém de artefatos (relatorios.armazem): entradas sem mudança são servidas dele sem gerar de novo',
+    )
+    args = parser.parse_args(argv)
+    profiler = from_option(args.profile)
+
+    checklist = tasks
+    if args.tasks_file:
+        # Lidas uma a uma durante a gravação da seção (qualquer tamanho)
+        checklist = csv_rows(args.tasks_file, 6)
+
+    build = partial(build_workbook, checklist=checklist, profiler=profiler, compression=args.compression)
+    fingerprint = None
+    if args.store:
+        fingerprint = input_fingerprint({'compression': args.compression}, files=[args.tasks_file])
+    stored = stored_build(args.store, 'planilha-apogeu', None, fingerprint, build, args.output)
+    profiler.report(args.profile)
+    out = messages(args.output)
+    if stored:
+        print('📦 Planilha servida do armazém (entradas sem mudança)', file=out)
+    print('✅ Planilha Excel criada com sucesso!', file=out)
+    print(f'📊 Arquivo: {output_label(args.output)}', file=out)
+    print('   - Aba 1: Checklist Desenvolvimento', file=out)
+    print('   - Aba 2: Gráficos e Análises', file=out)
+    print('   - Aba 3: Notas e Observações', file=out)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,592 @@
+# -*- coding: utf-8 -*-
+"""Planilha de controle do GAIA 3.0: checklist, progresso e métricas
+
+``build_workbook`` gera o arquivo a partir dos dados (exemplo, linhas de
+métricas ou o banco da aplicação) e grava em um caminho, em um arquivo
+aberto ou devolve os bytes. ``main`` é a linha de comando
+(gerar_planilha_gaia3.py / python -m relatorios planilha-gaia3).
+"""
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.chart import LineChart, BarChart, Reference
+from openpyxl.chart.axis import DateAxis
+from openpyxl.formatting.rule import FormulaRule
+from openpyxl.utils import get_column_letter
+from functools import partial
+from itertools import islice
+import argparse
+import datetime
+import os
+
+import numpy as np
+
+from relatorios.agregacao import Rollup, period_label
+from relatorios.armazem import input_fingerprint, stored_build
+from relatorios.amostragem import DEFAULT_POINT_BUDGET, chart_source
+from relatorios.datas import EXCEL_EPOCH, to_excel_date
+from relatorios.decodificacao import MalformedValue, decode_columns
+from relatorios.estilos import (
+    BORDERED, BORDERED_DATE, BORDERED_LEFT, BORDERED_MONEY, COMPLETED, GAIA3_PALETTE, HEADER, PENDING,
+    register_styles, solid_fill, status_rules,
+)
+from relatorios.exportacao import ColumnTable, export_table
+from relatorios.fontes import CAMPAIGN_METRIC_COLUMNS, DataSource
+from relatorios.instrumentacao import DISABLED, count, from_option
+from relatorios.lote import format_summary, run_batch, write_summary
+from relatorios.metricas import derive_rows
+from relatorios.paralelo import PART_ROWS, ParallelWorkbook
+from relatorios.saida import COMPRESSION_PROFILES, messages, output_label, save
+
+OUTPUT_PATH = '/home/ubuntu/apogeu/CONTROLE_DESENVOLVIMENTO_GAIA_3.0.xlsx'
+TENANT_FILENAME = 'CONTROLE_DESENVOLVIMENTO_GAIA_3.0_{tenant}.xlsx'
+
+# Dados
+tasks = [
+    (1, 'Instalar Node.js', 'Concluído', datetime.date(2024, 10, 22), datetime.date(2024, 10, 22), 'Você', 'Versão 18.0.0'),
+    (2, 'Instalar Git', 'Concluído', datetime.date(2024, 10, 22), datetime.date(2024, 10, 22), 'Você', 'Configurado'),
+    (3, 'Instalar MySQL', 'Concluído', datetime.date(2024, 10, 22), datetime.date(2024, 10, 22), 'Você', 'Porta 3306'),
+    (4, 'Clonar Repositório', 'Concluído', datetime.date(2024, 10, 22), datetime.date(2024, 10, 22), 'Você', 'gaia-3.0'),
+    (5, 'Instalar Dependências', 'Concluído', datetime.date(2024, 10, 22), datetime.date(2024, 10, 22), 'Você', 'pnpm install'),
+    (6, 'Criar Banco de Dados', 'Concluído', datetime.date(2024, 10, 22), datetime.date(2024, 10, 22), 'Você', 'apogeu_db'),
+    (7, 'Configurar .env', 'Concluído', datetime.date(2024, 10, 22), datetime.date(2024, 10, 22), 'Você', 'Todas as variáveis'),
+    (8, 'Executar Migrações', 'Concluído', datetime.date(2024, 10, 22), datetime.date(2024, 10, 22), 'Você', 'pnpm db:push'),
+    (9, 'Iniciar Backend', 'Concluído', datetime.date(2024, 10, 22), datetime.date(2024, 10, 22), 'Você', 'pnpm dev'),
+    (10, 'Iniciar Frontend', 'Concluído', datetime.date(2024, 10, 22), datetime.date(2024, 10, 22), 'Você', 'Porta 5173'),
+    (11, 'Testar Login', 'Em Progresso', datetime.date(2024, 10, 23), '', 'Você', 'OAuth funcionando'),
+    (12, 'Testar Campanhas', 'Pendente', '', '', 'Você', ''),
+    (13, 'Testar Credenciais', 'Pendente', '', '', 'Você', ''),
+    (14, 'Testar Analytics', 'Pendente', '', '', 'Você', ''),
+    (15, 'Testar Media Boost', 'Pendente', '', '', 'Você', ''),
+    (16, 'Testar Developer Login', 'Pendente', '', '', 'Você', ''),
+    (17, 'Testar Painel Admin', 'Pendente', '', '', 'Você', ''),
+    (18, 'Testar Guia Interativo', 'Pendente', '', '', 'Você', ''),
+    (19, 'Executar Testes', 'Pendente', '', '', 'Você', 'pnpm test'),
+    (20, 'Deploy no GitHub', 'Pendente', '', '', 'Você', 'gaia-3.0'),
+]
+
+phases = [
+    ('Instalação', 100, 'Concluído'),
+    ('Configuração', 100, 'Concluído'),
+    ('Backend', 100, 'Concluído'),
+    ('Frontend', 100, 'Concluído'),
+    ('APIs de Marketing', 100, 'Concluído'),
+    ('WhatsApp Bot', 100, 'Concluído'),
+    ('Geração de Conteúdo', 100, 'Concluído'),
+    ('Dashboards', 100, 'Concluído'),
+    ('Sistema de Assinaturas', 100, 'Concluído'),
+    ('Análise de Concorrência', 100, 'Concluído'),
+    ('Testes de Segurança', 100, 'Concluído'),
+    ('Desktop App', 100, 'Concluído'),
+    ('Documentação', 100, 'Concluído'),
+    ('Developer Login', 100, 'Concluído'),
+    ('Painel Admin', 100, 'Concluído'),
+    ('Controle Avançado', 100, 'Concluído'),
+    ('Media Boost', 100, 'Concluído'),
+    ('Guia Interativo', 100, 'Concluído'),
+]
+
+# Dados de métricas (brutos: as métricas derivadas são calculadas abaixo)
+metrics_data = [
+    (datetime.date(2024, 10, 22), 3, 125430, 3847, 287, 4230.50, 14320.00),
+    (datetime.date(2024, 10, 23), 3, 145230, 4234, 312, 4890.75, 15680.00),
+    (datetime.date(2024, 10, 24), 4, 165890, 4876, 345, 5234.25, 17450.00),
+    (datetime.date(2024, 10, 25), 4, 178234, 5123, 378, 5678.50, 18920.00),
+    (datetime.date(2024, 10, 26), 4, 189567, 5456, 412, 6123.75, 20340.00),
+    (datetime.date(2024, 10, 27), 5, 201234, 5789, 445, 6567.25, 21890.00),
+    (datetime.date(2024, 10, 28), 5, 215678, 6123, 478, 7012.50, 23450.00),
+]
+
+metrics_headers = [
+    'Data', 'Campanhas Ativas', 'Impressões', 'Cliques', 'Conversões', 'Gasto (R$)', 'Receita (R$)',
+    'ROI %', 'CTR %', 'CPC (R$)', 'CPA (R$)', 'CPM (R$)', 'ROAS',
+]
+
+# Nomes das colunas de metrics_headers no CSV e no Parquet
+METRIC_COLUMNS = (
+    'date', 'active_campaigns', 'impressions', 'clicks', 'conversions', 'spend', 'revenue',
+    'roi', 'ctr', 'cpc', 'cpa', 'cpm', 'roas',
+)
+
+period_headers = [
+    'Período', 'Início', 'Campanha', 'Plataforma', 'Registros', 'Impressões', 'Cliques', 'Conversões',
+    'Gasto (R$)', 'Receita (R$)', 'ROI %', 'CTR %', 'ROAS',
+]
+
+
+def styled_cell(ws, value, style=BORDERED):
+    """Cria uma célula estilizada, compatível com o modo normal e o streaming"""
+    cell = WriteOnlyCell(ws, value=value)
+    cell.style = style
+    # Abas write-only não guardam as células: a contagem da seção vem daqui
+    count()
+    return cell
+
+
+def add_rows(ws, render, *args, rows, package=None):
+    """Acrescenta à aba as linhas de ``render(*args)`` (listas de ``(valor, estilo)``)
+
+    Com ``package`` (relatorios.paralelo.ParallelWorkbook) as ``rows``
+    linhas só são produzidas na gravação, em um processo do pool.
+    """
+    if package is not None:
+        package.append(ws, render, *args, rows=rows)
+        return
+    for row in render(*args):
+        ws.append([styled_cell(ws, value, style) for value, style in row])
+
+
+def header_cells(headers):
+    """Linha de cabeçalho com o estilo padrão"""
+    yield [(h, HEADER) for h in headers]
+
+
+def daily_row(day, campaigns, totals):
+    """Linha do dia: contagens inteiras e valores em reais (de centavos)"""
+    impressions, clicks, conversions, spend, revenue = totals.tolist()
+    return (day, len(campaigns), impressions, clicks, conversions, spend / 100, revenue / 100)
+
+
+def metrics_rows(database=None, user_id=None, malformed_values=None, rollup=None):
+    """Produz as linhas de métricas (uma por dia) uma a uma
+
+    Sem ``database`` usa os dados de exemplo. Valores malformados do banco
+    são acrescentados a ``malformed_values``, sem interromper a exportação;
+    linhas sem data (``date`` nulo) entram lá e ficam de fora. Na mesma
+    leitura, cada lote é acumulado em ``rollup`` (por campanha e plataforma,
+    por dia, semana e mês).
+    """
+    if database is None:
+        yield from metrics_data
+        return
+
+    # campaignMetrics chega ordenada por data, em lotes do cursor do servidor.
+    # Cada lote é decodificado de uma vez (varchar -> int64) e totalizado por
+    # dia com reduceat; o dia que atravessa o fim do lote segue pendente.
+    metric_columns = ('impressions', 'clicks', 'conversions', 'spend', 'revenue')
+    date, key = CAMPAIGN_METRIC_COLUMNS.index('date'), CAMPAIGN_METRIC_COLUMNS.index('id')
+    pending = None
+    with DataSource.from_url(database) as source:
+        for batch in source.campaign_metrics_batches(user_id=user_id):
+            if any(row[date] is None for row in batch):
+                if malformed_values is not None:
+                    undated = (row for row in batch if row[date] is None)
+                    malformed_values.extend(MalformedValue(row[key], 'date', None) for row in undated)
+                batch = [row for row in batch if row[date] is not None]
+                if not batch:
+                    continue
+            arrays, errors = decode_columns(batch, CAMPAIGN_METRIC_COLUMNS)
+            if malformed_values is not None:
+                malformed_values.extend(errors)
+            if rollup is not None:
+                rollup.add_metric_batch(batch, arrays)
+
+            days = np.array([row[date] for row in batch], dtype='datetime64[D]')
+            starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+            ends = np.r_[starts[1:], len(batch)]
+            totals = np.add.reduceat(np.column_stack([arrays[c] for c in metric_columns]), starts, axis=0)
+
+            for day, start, end, total in zip(days[starts].tolist(), starts.tolist(), ends.tolist(), totals):
+                campaigns = {row[0] for row in batch[start:end]}
+                if pending is not None and pending[0] == day:
+                    pending[1].update(campaigns)
+                    pending[2] += total
+                    continue
+                if pending is not None:
+                    yield daily_row(*pending)
+                pending = [day, campaigns, total]
+
+    if pending is not None:
+        yield daily_row(*pending)
+
+
+def dated_rows(rows, malformed_values=None):
+    """Linhas diárias com data; as sem data vão para ``malformed_values`` (pelo índice)"""
+    for index, row in enumerate(rows):
+        if row[0] is None:
+            if malformed_values is not None:
+                malformed_values.append(MalformedValue(index, 'date', None))
+            continue
+        yield row
+
+
+def checklist_cells(rows):
+    """Linhas da checklist, com as datas como células de data nativas"""
+    for task in rows:
+        yield [
+            (task[0], BORDERED_LEFT),
+            (task[1], BORDERED_LEFT),
+            (task[2], BORDERED_LEFT),
+            (to_excel_date(task[3]), BORDERED_DATE),
+            (to_excel_date(task[4]), BORDERED_DATE),
+            (task[5], BORDERED_LEFT),
+            (task[6], BORDERED_LEFT),
+        ]
+
+
+def write_checklist(ws1, rows=tasks, package=None):
+    """ABA 1: checklist de desenvolvimento"""
+    # Ajustar largura das colunas
+    ws1.column_dimensions['A'].width = 5
+    ws1.column_dimensions['B'].width = 25
+    ws1.column_dimensions['C'].width = 15
+    ws1.column_dimensions['D'].width = 15
+    ws1.column_dimensions['E'].width = 15
+    ws1.column_dimensions['F'].width = 15
+    ws1.column_dimensions['G'].width = 25
+
+    # Headers
+    headers = ['ID', 'Tarefa', 'Status', 'Data Início', 'Data Conclusão', 'Responsável', 'Observações']
+    add_rows(ws1, header_cells, headers, rows=1, package=package)
+    add_rows(ws1, checklist_cells, rows, rows=len(rows), package=package)
+    # Colorir status (regras da aba: o Excel recolore ao editar)
+    if rows:
+        status_rules(ws1, f'C2:C{len(rows) + 1}', GAIA3_PALETTE, default=PENDING)
+
+
+def progress_cells(rows):
+    """Linhas de progresso por fase"""
+    for phase, completion, status in rows:
+        yield [(phase, BORDERED), (completion, BORDERED), (status, BORDERED)]
+
+
+def write_progress(ws2, package=None):
+    """ABA 2: progresso por fase, com gráfico de barras"""
+    ws2.column_dimensions['A'].width = 25
+    ws2.column_dimensions['B'].width = 15
+    ws2.column_dimensions['C'].width = 15
+
+    # Dados de progresso
+    add_rows(ws2, header_cells, ['Fase', 'Conclusão %', 'Status'], rows=1, package=package)
+    add_rows(ws2, progress_cells, phases, rows=len(phases), package=package)
+    # Colorir fases concluídas (conclusão e status) por formatação condicional
+    completed = FormulaRule(formula=['$B2=100'], fill=solid_fill(GAIA3_PALETTE[COMPLETED]))
+    ws2.conditional_formatting.add(f'B2:C{len(phases) + 1}', completed)
+
+    # Gráfico de progresso
+    chart = BarChart()
+    chart.type = 'col'
+    chart.title = 'Progresso do Desenvolvimento'
+    chart.y_axis.title = 'Conclusão %'
+    chart.x_axis.title = 'Fases'
+
+    data = Reference(ws2, min_col=2, min_row=1, max_row=len(phases)+1)
+    categories = Reference(ws2, min_col=1, min_row=2, max_row=len(phases)+1)
+
+    chart.add_data(data, titles_from_data=True)
+    chart.set_categories(categories)
+    ws2.add_chart(chart, 'E2')
+
+
+def metrics_table(rows):
+    """Tabela colunar das métricas diárias (METRIC_COLUMNS)
+
+    ROI, CTR, CPC, CPA, CPM e ROAS são calculados em blocos vetorizados
+    (mesmas fórmulas de calculateAdvancedMetrics). A planilha, o CSV e o
+    Parquet são gravados a partir desta mesma tabela.
+    """
+    derived_rows = derive_rows(rows, raw_columns=(2, 3, 4, 5, 6), derived=('roi', 'ctr', 'cpc', 'cpa', 'cpm', 'roas'))
+    return ColumnTable.from_rows(METRIC_COLUMNS, derived_rows)
+
+
+def metric_cells(chunk):
+    """Linhas de um bloco da tabela de métricas (``ColumnTable.chunks``)"""
+    # Datas do bloco como séries do Excel de uma vez (dias desde EXCEL_EPOCH)
+    days = (chunk['date'] - np.datetime64(EXCEL_EPOCH, 'D')).astype(np.int64).tolist()
+    styles = [BORDERED_MONEY if col_idx > 5 else BORDERED for col_idx in range(2, len(METRIC_COLUMNS) + 1)]
+    for day, *values in zip(days, *(chunk[name].tolist() for name in METRIC_COLUMNS[1:])):
+        yield [(day, BORDERED_DATE), *zip(values, styles)]
+
+
+def write_metrics(ws3, table, chart_points=DEFAULT_POINT_BUDGET, package=None):
+    """ABA 3: métricas diárias, com gráfico de ROI
+
+    Se a série de ROI passar de ``chart_points`` pontos, o gráfico usa uma
+    versão reduzida (LTTB) gravada em uma aba oculta.
+    """
+    # Ajustar largura
+    for col in range(1, len(metrics_headers) + 1):
+        ws3.column_dimensions[get_column_letter(col)].width = 15
+
+    add_rows(ws3, header_cells, metrics_headers, rows=1, package=package)
+    for chunk in table.chunks(PART_ROWS):
+        add_rows(ws3, metric_cells, chunk, rows=len(chunk['date']), package=package)
+
+    # Gráfico de ROI
+    roi_chart = LineChart()
+    roi_chart.title = 'ROI ao Longo do Tempo'
+    roi_chart.y_axis.title = 'ROI %'
+    roi_chart.y_axis.crossAx = 500
+    # Eixo de tempo real (as datas são células de data, não categorias de texto)
+    roi_chart.x_axis = DateAxis(crossAx=100)
+    roi_chart.x_axis.number_format = 'dd/mm'
+    roi_chart.x_axis.majorTimeUnit = 'days'
+    roi_chart.x_axis.title = 'Data'
+
+    metrics_count = len(table)
+    # Série de datas do Excel (dias desde EXCEL_EPOCH) para a redução
+    roi_dates = (table['date'] - np.datetime64(EXCEL_EPOCH, 'D')).astype(np.int64) if metrics_count else []
+    source = chart_source(
+        ws3.parent, 'Gráfico ROI (reduzido)', ['Data', 'ROI %'], roi_dates, table['roi'],
+        budget=chart_points, label_style=BORDERED_DATE,
+    )
+    if source is not None:
+        roi_data, roi_categories = source
+    else:
+        roi_data = Reference(ws3, min_col=8, min_row=1, max_row=metrics_count+1)
+        roi_categories = Reference(ws3, min_col=1, min_row=2, max_row=metrics_count+1)
+
+    roi_chart.add_data(roi_data, titles_from_data=True)
+    roi_chart.set_categories(roi_categories)
+    ws3.add_chart(roi_chart, 'O2')
+    return metrics_count
+
+
+def period_cells(rows, grain):
+    """Linhas de totais por período a partir de ``RollupRow`` (Rollup.rows)"""
+    rows = (
+        (period_label(row.start, grain), row.start, *row.key, row.rows, *row.totals[:3].tolist(),
+         row.totals[3] / 100, row.totals[4] / 100)
+        for row in rows
+    )
+    for data_row in derive_rows(rows, raw_columns=(5, 6, 7, 8, 9), derived=('roi', 'ctr', 'roas')):
+        yield (
+            [(data_row[0], BORDERED), (to_excel_date(data_row[1]), BORDERED_DATE)]
+            + [(value, BORDERED_LEFT) for value in data_row[2:4]]
+            + [(value, BORDERED_MONEY if col_idx > 7 else BORDERED) for col_idx, value in enumerate(data_row[4:], 4)]
+        )
+
+
+def write_periods(ws, rollup, grain, package=None):
+    """Totais por campanha/plataforma em cada semana ISO ou mês, lidos do rollup"""
+    for col in range(1, len(period_headers) + 1):
+        ws.column_dimensions[get_column_letter(col)].width = 15
+
+    add_rows(ws, header_cells, period_headers, rows=1, package=package)
+    rows = rollup.rows(grain)
+    while chunk := list(islice(rows, PART_ROWS)):
+        add_rows(ws, period_cells, chunk, grain, rows=len(chunk), package=package)
+
+
+def build_workbook(
+    output=None, database=None, user_id=None, streaming=False, chart_points=DEFAULT_POINT_BUDGET, exports=None,
+    profiler=DISABLED, metrics=None, checklist=tasks, malformed_values=None, parallel=None, compression=None,
+):
+    """Gera a planilha de controle do GAIA 3.0
+
+    ``output`` é um caminho, um arquivo binário aberto ou None (devolve os
+    bytes do .xlsx; ver relatorios.saida). As métricas vêm de ``metrics``
+    (linhas diárias brutas, como ``metrics_data``), do banco ``database`` ou,
+    sem nenhum dos dois, dos dados de exemplo.
+
+    ``exports`` (ex.: ``{'csv': 'metricas.csv', 'parquet': 'metricas.parquet'}``)
+    grava as mesmas métricas diárias em outros formatos, na mesma execução.
+    ``profiler`` (relatorios.instrumentacao) mede cada aba. Valores
+    malformados do banco são acrescentados a ``malformed_values``.
+
+    ``streaming`` usa o modo write-only do openpyxl: as células vão direto
+    para o XML das abas, sem ficar em memória. A tabela colunar das métricas
+    (metrics_table), da qual saem a aba, o gráfico e as exportações, é
+    montada inteira nos dois modos.
+
+    ``parallel`` (número de processos; 0 usa todas as CPUs) grava as linhas
+    das abas em um pool de processos (relatorios.paralelo), em blocos de
+    ``PART_ROWS`` linhas, em vez do ``wb.save`` sequencial do openpyxl. A
+    estratégia de texto escolhida para cada coluna vai para as notas do
+    ``profiler``. ``compression`` é o perfil de compressão do arquivo
+    (relatorios.saida), em qualquer modo de gravação.
+    """
+    if streaming and parallel is not None:
+        raise ValueError('streaming e parallel são modos de gravação alternativos')
+
+    # No modo streaming cada linha vai direto para o XML da aba; por isso todas
+    # as abas são preenchidas com ws.append() e larguras de coluna são definidas
+    # antes da primeira linha.
+    wb = Workbook(write_only=streaming)
+    if not streaming:
+        wb.remove(wb.active)
+
+    # Estilos (registrados uma vez; as células apenas referenciam o nome)
+    register_styles(wb, GAIA3_PALETTE)
+    # No modo paralelo o wb é só a casca: as linhas vão para o pool na gravação
+    package = ParallelWorkbook(wb, parallel or None) if parallel is not None else None
+
+    # A visão diária já é a aba Métricas; o rollup guarda só semana e mês
+    rollup = Rollup(grains=('week', 'month'))
+    with profiler.section('Checklist Desenvolvimento'):
+        write_checklist(wb.create_sheet('Checklist Desenvolvimento'), checklist, package)
+    with profiler.section('Progresso'):
+        write_progress(wb.create_sheet('Progresso'), package)
+    with profiler.section('Leitura das métricas'):
+        if metrics is not None:
+            # Linhas fornecidas pelo chamador: sem leitura do banco, sem rollup
+            table = metrics_table(dated_rows(metrics, malformed_values))
+        else:
+            table = metrics_table(metrics_rows(database, user_id, malformed_values, rollup))
+    with profiler.section('Métricas'):
+        write_metrics(wb.create_sheet('Métricas'), table, chart_points, package)
+    # Visões semanal e mensal a partir do rollup da mesma leitura
+    if rollup:
+        with profiler.section('Métricas Semanais'):
+            write_periods(wb.create_sheet('Métricas Semanais'), rollup, 'week', package)
+        with profiler.section('Métricas Mensais'):
+            write_periods(wb.create_sheet('Métricas Mensais'), rollup, 'month', package)
+
+    with profiler.section('Salvar'):
+        content = save(wb if package is None else package, output, compression)
+    if package is not None:
+        profiler.note('Textos por coluna', package.string_stats)
+    if exports:
+        with profiler.section('Exportar'):
+            export_table(table, exports)
+    return content
+
+
+def workbook_fingerprint(database, user_id=None, chart_points=DEFAULT_POINT_BUDGET, compression=None):
+    """Impressão digital das entradas da planilha (relatorios.armazem); None com banco MySQL
+
+    O modo de gravação (streaming, paralelo) não entra: a planilha é a mesma.
+    """
+    options = {'user_id': user_id, 'chart_points': chart_points, 'compression': compression}
+    return input_fingerprint(options, database=database)
+
+
+def build_tenant_workbook(
+    user_id, path, database=None, streaming=False, chart_points=DEFAULT_POINT_BUDGET, compression=None, store=None,
+):
+    """Planilha de um cliente (users.id); usada pelo modo em lote
+
+    Com ``store`` (pasta do armazém), uma planilha com as mesmas entradas é
+    copiada do armazém.
+    """
+    build = partial(
+        build_workbook, database=database, user_id=user_id, streaming=streaming, chart_points=chart_points,
+        compression=compression,
+    )
+    fingerprint = workbook_fingerprint(database, user_id, chart_points, compression) if store else None
+    stored_build(store, 'planilha-gaia3', user_id, fingerprint, build, path)
+
+
+def read_tenants(args):
+    """IDs de usuário do modo em lote: --users, --users-file ou --all-users"""
+    tenants = []
+    if args.users:
+        tenants.extend(t.strip() for t in args.users.split(',') if t.strip())
+    if args.users_file:
+        with open(args.users_file, encoding='utf-8') as f:
+            tenants.extend(line.strip() for line in f if line.strip())
+    if args.all_users:
+        with DataSource.from_url(args.database) as source:
+            for batch in source.table_batches('users'):
+                tenants.extend(row[0] for row in batch)
+    return tenants
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Gera a planilha de controle do GAIA 3.0')
+    parser.add_argument(
+        '--streaming',
+        action='store_true',
+        help=(
+            'Modo streaming (write-only): grava as linhas à medida que são produzidas, sem guardar as células; '
+            'a tabela das métricas diárias fica em memória'
+        ),
+    )
+    parser.add_argument(
+        '--parallel',
+        nargs='?',
+        type=int,
+        const=0,
+        metavar='PROCESSOS',
+        help='Grava as linhas das abas em paralelo, em um pool de processos (padrão: número de CPUs)',
+    )
+    parser.add_argument(
+        '--database',
+        help='Lê as métricas do banco (DATABASE_URL mysql://... ou sqlite:///arquivo.db) em vez dos dados de exemplo',
+    )
+    parser.add_argument('--user-id', help='Restringe as métricas às campanhas deste usuário')
+    parser.add_argument('--output', default=OUTPUT_PATH, help="Arquivo .xlsx de saída ('-' grava na saída padrão)")
+    parser.add_argument(
+        '--profile',
+        nargs='?',
+        const='-',
+        metavar='ARQUIVO.json',
+        help='Mede tempo, CPU, memória e células emitidas por aba; imprime o resumo ou grava em JSON',
+    )
+    parser.add_argument('--csv', help='Grava também as métricas diárias neste arquivo CSV')
+    parser.add_argument('--parquet', help='Grava também as métricas diárias neste arquivo Parquet (requer pyarrow)')
+    parser.add_argument(
+        '--chart-points',
+        type=int,
+        default=DEFAULT_POINT_BUDGET,
+        help='Máximo de pontos por série de gráfico; acima disso a série é reduzida (LTTB) em uma aba oculta',
+    )
+    parser.add_argument(
+        '--compression',
+        choices=COMPRESSION_PROFILES,
+        help='Compressão do arquivo: fast (mais rápido), balanced, smallest (menor) ou store (sem compressão)',
+    )
+    parser.add_argument(
+        '--store',
+        metavar='PASTA',
+        help='Armazém de artefatos (relatorios.armazem): entradas sem mudança são servidas dele sem gerar de novo',
+    )
+
+    batch = parser.add_argument_group('modo em lote (uma planilha por cliente)')
+    batch.add_argument('--users', help='IDs de usuário separados por vírgula')
+    batch.add_argument('--users-file', help='Arquivo com um ID de usuário por linha')
+    batch.add_argument('--all-users', action='store_true', help='Todos os usuários da tabela users (requer --database)')
+    batch.add_argument('--output-dir', default=os.path.dirname(OUTPUT_PATH), help='Pasta das planilhas geradas')
+    batch.add_argument('--workers', type=int, help='Processos em paralelo (padrão: número de CPUs)')
+    batch.add_argument('--summary', help='Grava o resumo do lote em JSON neste arquivo')
+    args = parser.parse_args(argv)
+
+    if args.all_users and not args.database:
+        parser.error('--all-users requer --database')
+    if args.streaming and args.parallel is not None:
+        parser.error('--streaming e --parallel não podem ser usados juntos')
+    if args.store and (args.csv or args.parquet):
+        parser.error('--store não se aplica com --csv/--parquet (as exportações saem da geração)')
+
+    if args.users or args.users_file or args.all_users:
+        if args.parallel is not None:
+            parser.error('--parallel não se aplica ao modo em lote (use --workers)')
+        build = partial(
+            build_tenant_workbook, database=args.database, streaming=args.streaming, chart_points=args.chart_points,
+            compression=args.compression, store=args.store,
+        )
+        summary = run_batch(build, read_tenants(args), args.output_dir, TENANT_FILENAME, workers=args.workers)
+        print(format_summary(summary))
+        if args.summary:
+            write_summary(summary, args.summary)
+        raise SystemExit(1 if summary.failed else 0)
+
+    profiler = from_option(args.profile)
+    malformed_values = []
+    build = partial(
+        build_workbook, database=args.database, user_id=args.user_id, streaming=args.streaming,
+        chart_points=args.chart_points, exports={'csv': args.csv, 'parquet': args.parquet}, profiler=profiler,
+        malformed_values=malformed_values, parallel=args.parallel, compression=args.compression,
+    )
+    fingerprint = None
+    if args.store:
+        fingerprint = workbook_fingerprint(args.database, args.user_id, args.chart_points, args.compression)
+    stored = stored_build(args.store, 'planilha-gaia3', args.user_id, fingerprint, build, args.output)
+    profiler.report(args.profile)
+    out = messages(args.output)
+    if stored:
+        print('📦 Planilha servida do armazém (entradas sem mudança)', file=out)
+    print(f'✅ Planilha Excel criada com sucesso: {output_label(args.output)}', file=out)
+    if malformed_values:
+        undated = sum(malformed.column == 'date' for malformed in malformed_values)
+        print(
+            f'⚠️  {len(malformed_values)} valores malformados em campaignMetrics '
+            f'(números considerados 0, {undated} linhas sem data ignoradas):',
+            file=out,
+        )
+        for malformed in malformed_values[:20]:
+            print(f'   - {malformed.row} ({malformed.column}): {malformed.raw!r}', file=out)
+
+
+if __name__ == '__main__':
+    main()
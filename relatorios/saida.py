@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""Destino dos artefatos gerados: caminho, arquivo aberto, socket, stdout ou bytes
+
+Os arquivos .xlsx e .docx são ZIPs gravados em sequência; o zipfile aceita
+destinos sem seek (pipe, socket), então nada passa por arquivo temporário.
+
+O perfil de compressão (``COMPRESSION_PROFILES``) troca tamanho por tempo
+na gravação do ZIP: 'fast' para downloads interativos, 'smallest' para o
+arquivo noturno, 'store' sem compressão. Sem perfil, vale o padrão das
+bibliotecas (deflate nível 6, igual a 'balanced').
+"""
+
+import datetime
+import io
+import os
+import socket
+import sys
+import zipfile
+
+# Valor de --output que grava o arquivo na saída padrão
+STDOUT = '-'
+
+# Perfil de compressão -> (método do ZIP, nível do zlib)
+COMPRESSION_PROFILES = {
+    'fast': (zipfile.ZIP_DEFLATED, 1),
+    'balanced': (zipfile.ZIP_DEFLATED, 6),
+    'smallest': (zipfile.ZIP_DEFLATED, 9),
+    'store': (zipfile.ZIP_STORED, None),
+}
+
+
+def compression_profile(compression):
+    """``(método, nível)`` do perfil ``compression``; None é o padrão das bibliotecas"""
+    if compression is None:
+        return zipfile.ZIP_DEFLATED, None
+    try:
+        return COMPRESSION_PROFILES[compression]
+    except KeyError:
+        raise ValueError(
+            f'Perfil de compressão desconhecido: {compression!r} (use {", ".join(COMPRESSION_PROFILES)})'
+        ) from None
+
+
+def zip_archive(target, compression=None):
+    """ZipFile aberto para escrita em ``target`` com o perfil ``compression``"""
+    method, level = compression_profile(compression)
+    return zipfile.ZipFile(target, 'w', method, allowZip64=True, compresslevel=level)
+
+
+def write_compressed(document, target, compression):
+    """Grava ``document`` em ``target`` com o perfil ``compression``
+
+    Workbook é gravado como em ``wb.save``, mas no ZipFile do perfil;
+    Document é gravado em memória por ``doc.save`` e as partes são
+    recomprimidas no ZipFile do perfil. Outros objetos (ex.:
+    ParallelWorkbook) recebem o perfil em ``save(target, compression)``.
+    O tipo de documento é reconhecido pelos atributos: cada gerador importa
+    só a sua biblioteca, e o openpyxl só é importado aqui para um Workbook.
+    """
+    if hasattr(document, 'worksheets') and hasattr(document, 'write_only'):
+        from openpyxl.writer.excel import ExcelWriter
+
+        if document.write_only and not document.worksheets:
+            document.create_sheet()
+        archive = zip_archive(target, compression)
+        document.properties.modified = datetime.datetime.now(tz=datetime.timezone.utc).replace(tzinfo=None)
+        ExcelWriter(document, archive).save()
+    elif hasattr(document, 'part') and hasattr(document, 'paragraphs'):
+        # O python-docx não escolhe o nível: o pacote é gravado e as partes, recomprimidas
+        buffer = io.BytesIO()
+        document.save(buffer)
+        with zipfile.ZipFile(buffer) as source, zip_archive(target, compression) as archive:
+            for info in source.infolist():
+                archive.writestr(info.filename, source.read(info))
+    else:
+        document.save(target, compression)
+
+
+def write_content(content, target):
+    """Grava bytes de um artefato já gerado em um caminho ou arquivo binário aberto"""
+    if isinstance(target, (str, os.PathLike)):
+        with open(target, 'wb') as f:
+            f.write(content)
+    else:
+        target.write(content)
+
+
+def save(document, output=None, compression=None):
+    """Grava um Workbook (openpyxl) ou Document (python-docx) em ``output``
+
+    ``document`` também pode ser os bytes de um artefato já gerado (ex.:
+    vindos de relatorios.armazem), gravados como estão.
+
+    ``output`` pode ser um caminho, um arquivo binário aberto (ex.: BytesIO
+    ou um pipe), um socket conectado, ``'-'`` (saída padrão) ou None: nesse
+    caso o arquivo é gerado em memória e os bytes são devolvidos. Nos demais
+    casos devolve None.
+
+    ``compression`` é um perfil de ``COMPRESSION_PROFILES`` ou None (padrão
+    das bibliotecas).
+    """
+    if isinstance(document, bytes):
+        def write(target):
+            write_content(document, target)
+    elif compression is None:
+        write = document.save
+    else:
+        compression_profile(compression)
+
+        def write(target):
+            write_compressed(document, target, compression)
+
+    if output is None:
+        buffer = io.BytesIO()
+        write(buffer)
+        return buffer.getvalue()
+    if output == STDOUT:
+        write(sys.stdout.buffer)
+        sys.stdout.buffer.flush()
+    elif isinstance(output, socket.socket):
+        with output.makefile('wb') as stream:
+            write(stream)
+    else:
+        write(output)
+    return None
+
+
+def output_label(output):
+    """Nome do destino de ``--output`` para as mensagens da linha de comando"""
+    return 'saída padrão' if output == STDOUT else str(output)
+
+
+def messages(output):
+    """Onde imprimir as mensagens da linha de comando: stderr se o arquivo vai para stdout"""
+    return sys.stderr if output == STDOUT else sys.stdout
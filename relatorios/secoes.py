@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""Diagramação de seções em sequência dentro de uma aba
+
+Em vez de âncoras fixas (A4, A28, A36...), cada seção (título, cabeçalho e
+corpo) é posicionada logo após a anterior. O corpo pode ser qualquer
+iterável, inclusive um gerador de tamanho desconhecido: as linhas são
+gravadas à medida que chegam e a linha corrente avança junto, em uma única
+passada.
+"""
+
+from collections import namedtuple
+
+from relatorios.estilos import BORDERED_LEFT, HEADER, SUBHEADER
+
+# Linhas ocupadas por uma seção já gravada (first_row > last_row se o corpo for vazio)
+Section = namedtuple('Section', 'title_row header_row first_row last_row')
+
+
+class SheetLayout:
+    """Controla a linha corrente de uma aba e posiciona blocos um após o outro"""
+
+    def __init__(self, ws, width=6, start_row=1, gap=2):
+        self.ws = ws
+        self.width = width
+        self.row = start_row
+        self.gap = gap
+
+    def skip(self, rows=1):
+        """Deixa ``rows`` linhas em branco"""
+        self.row += rows
+
+    def banner(self, text, style=None, font=None, alignment=None, height=None):
+        """Linha única mesclada na largura da aba (títulos e subtítulos)"""
+        cell = self.ws.cell(row=self.row, column=1, value=text)
+        if style is not None:
+            cell.style = style
+        if font is not None:
+            cell.font = font
+        if alignment is not None:
+            cell.alignment = alignment
+        self.ws.merge_cells(start_row=self.row, start_column=1, end_row=self.row, end_column=self.width)
+        if height is not None:
+            self.ws.row_dimensions[self.row].height = height
+        self.row += 1
+        return cell
+
+    def section(self, title, headers, rows, style=BORDERED_LEFT, cell_style=None, title_height=25, header_height=20):
+        """Grava título, cabeçalho e corpo de uma seção a partir da linha corrente
+
+        ``rows`` também pode ser uma função que recebe a ``Section`` (ainda
+        sem ``last_row``) e devolve o corpo: fórmulas que referenciam as
+        próprias linhas partem de ``first_row``. ``cell_style(col, value)``
+        escolhe o estilo de cada célula do corpo (padrão: ``style`` em todas).
+        Devolve a ``Section`` com as linhas usadas e avança a linha corrente,
+        deixando ``gap`` linhas em branco.
+        """
+        title_row = self.row
+        self.banner(title, style=SUBHEADER, height=title_height)
+
+        header_row = self.row
+        for col, header in enumerate(headers, 1):
+            self.ws.cell(row=header_row, column=col, value=header).style = HEADER
+        self.ws.row_dimensions[header_row].height = header_height
+        self.row += 1
+
+        first_row = self.row
+        if callable(rows):
+            rows = rows(Section(title_row, header_row, first_row, None))
+        for values in rows:
+            for col, value in enumerate(values, 1):
+                cell = self.ws.cell(row=self.row, column=col, value=value)
+                cell.style = cell_style(col, value) if cell_style is not None else style
+            self.row += 1
+
+        section = Section(title_row, header_row, first_row, self.row - 1)
+        self.row += self.gap
+        return section
@@ -0,0 +1,411 @@
+# -*- coding: utf-8 -*-
+"""Serviço residente de geração de relatórios em um socket Unix
+
+O backend Node pede planilhas e guias sem abrir um processo Python por
+pedido: o serviço mantém um pool de processos com openpyxl, python-docx e os
+geradores já importados, e devolve os bytes do arquivo pela conexão.
+
+    python -m relatorios.servico --socket /tmp/relatorios.sock --jobs 2
+    python -m relatorios.servico --socket /tmp/relatorios.sock --stats
+
+Protocolo (um pedido por conexão): o cliente envia uma linha JSON
+
+    {"artifact": "planilha-gaia3", "options": {"database": "sqlite:///app.db", "user_id": "u1", "compression": "fast"}}
+    {"command": "stats"}
+
+e recebe uma linha JSON de cabeçalho. Se o artefato foi gerado, o cabeçalho
+traz ``"ok": true`` e ``"bytes": N`` e é seguido de exatamente N bytes do
+arquivo; em caso de erro, ``{"ok": false, "error": "..."}``.
+
+No máximo ``jobs`` artefatos são gerados ao mesmo tempo. Até ``queue``
+pedidos aguardam a vez; além disso o pedido é recusado na hora (serviço
+ocupado), em vez de acumular conexões.
+
+Com ``--store`` (relatorios.armazem), um pedido cujas entradas não mudaram
+é atendido pelo armazém, sem ocupar o pool, e o cabeçalho traz
+``"cached": true``. Com banco MySQL o pedido só vai ao armazém se trouxer
+``"data_version"`` (versão dos dados, definida pelo backend):
+
+    {"artifact": "planilha-gaia3", "options": {"database": "mysql://..."}, "data_version": "2024-11-01T10:00"}
+"""
+
+import argparse
+import datetime
+import inspect
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import socketserver
+import stat
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from relatorios import guia_apogeu, guia_gaia3, planilha_apogeu, planilha_gaia3
+from relatorios.amostragem import DEFAULT_POINT_BUDGET
+from relatorios.armazem import ArtifactStore, input_fingerprint
+from relatorios.documentos import load_problems, parse_problems
+from relatorios.fontes import csv_rows
+
+DEFAULT_SOCKET = '/tmp/relatorios.sock'
+DEFAULT_JOBS = 2
+DEFAULT_QUEUE = 16
+
+# Tamanho máximo da linha de pedido (as opções podem trazer listas de tarefas)
+MAX_REQUEST_BYTES = 16 * 2 ** 20
+
+XLSX_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+DOCX_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+
+# ============ ARTEFATOS ============
+# Rodam nos processos do pool; as opções do pedido viram argumentos nomeados
+
+def extra_problems(problemas=None, problemas_file=None):
+    """Problemas extras dos guias: lista no próprio pedido ou arquivo JSON"""
+    if problemas is not None:
+        return parse_problems(problemas)
+    if problemas_file:
+        return load_problems(problemas_file)
+    return ()
+
+
+def planilha_gaia3_job(
+    database=None, user_id=None, streaming=False, chart_points=DEFAULT_POINT_BUDGET, compression=None,
+):
+    return planilha_gaia3.build_workbook(
+        None, database, user_id, bool(streaming), int(chart_points), compression=compression,
+    )
+
+
+def planilha_apogeu_job(tasks=None, tasks_file=None, chart_points=planilha_apogeu.CHART_POINTS, compression=None):
+    checklist = planilha_apogeu.tasks
+    if tasks is not None:
+        checklist = [tuple(task) for task in tasks]
+    elif tasks_file:
+        checklist = csv_rows(tasks_file, 6)
+    return planilha_apogeu.build_workbook(None, checklist, int(chart_points), compression=compression)
+
+
+def guia_gaia3_job(problemas=None, problemas_file=None, compression=None):
+    return guia_gaia3.build_document(None, extra_problems(problemas, problemas_file), compression=compression)
+
+
+def guia_apogeu_job(problemas=None, problemas_file=None, compression=None):
+    return guia_apogeu.build_document(None, extra_problems(problemas, problemas_file), compression=compression)
+
+
+# artefato -> (função que devolve os bytes, tipo MIME, nome de arquivo sugerido)
+JOBS = {
+    'planilha-gaia3': (planilha_gaia3_job, XLSX_TYPE, 'CONTROLE_DESENVOLVIMENTO_GAIA_3.0.xlsx'),
+    'planilha-apogeu': (planilha_apogeu_job, XLSX_TYPE, 'CONTROLE_DESENVOLVIMENTO_APOGEU.xlsx'),
+    'guia-gaia3': (guia_gaia3_job, DOCX_TYPE, 'GUIA_COMPLETO_GAIA_3.0.docx'),
+    'guia-apogeu': (guia_apogeu_job, DOCX_TYPE, 'GUIA_COMPLETO_APOGEU.docx'),
+}
+
+
+# Artefatos que imprimem a data de geração (a data entra na impressão digital)
+DATED_ARTIFACTS = {'guia-gaia3'}
+
+
+def job_fingerprint(artifact, options, data_version=None):
+    """Impressão digital das entradas de um pedido (relatorios.armazem); None se não houver"""
+    arguments = inspect.signature(JOBS[artifact][0]).bind(**options)
+    arguments.apply_defaults()
+    inputs = dict(arguments.arguments)
+    if artifact in DATED_ARTIFACTS:
+        inputs['date'] = datetime.date.today().isoformat()
+    return input_fingerprint(
+        inputs, files=(options.get('tasks_file'), options.get('problemas_file')),
+        database=options.get('database'), version=data_version,
+    )
+
+
+def run_job(artifact, options):
+    """Gera o artefato no processo do pool"""
+    return JOBS[artifact][0](**options)
+
+
+def _warm():
+    # Os módulos já vêm importados com este; a chamada só sobe o processo
+    return os.getpid()
+
+
+# ============ SERVIÇO ============
+
+class ReportService:
+    """Pool de geração com limite de concorrência, fila e contadores
+
+    ``store`` (relatorios.armazem.ArtifactStore) guarda os artefatos gerados
+    e atende os pedidos repetidos.
+    """
+
+    def __init__(self, jobs=DEFAULT_JOBS, queue=DEFAULT_QUEUE, store=None):
+        self.jobs = max(1, jobs)
+        self.queue = max(0, queue)
+        self.store = store
+        self.started = time.time()
+        self._slots = threading.BoundedSemaphore(self.jobs + self.queue)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._rejected = 0
+        self._counters = {
+            name: {'requests': 0, 'cached': 0, 'failed': 0, 'seconds': 0.0, 'bytes': 0} for name in JOBS
+        }
+        self._pool = self._new_pool()
+
+    def _new_pool(self):
+        # spawn: processos limpos, independentes das threads de conexão
+        return ProcessPoolExecutor(max_workers=self.jobs, mp_context=multiprocessing.get_context('spawn'))
+
+    def warm(self):
+        """Sobe todos os processos do pool antes do primeiro pedido"""
+        for future in [self._pool.submit(_warm) for _ in range(self.jobs)]:
+            future.result()
+
+    def close(self):
+        self._pool.shutdown(cancel_futures=True)
+
+    def handle(self, message):
+        """Atende um pedido decodificado; devolve ``(cabeçalho, conteúdo)``"""
+        if not isinstance(message, dict):
+            return {'ok': False, 'error': 'Pedido deve ser um objeto JSON'}, b''
+        command = message.get('command', 'build')
+        if command == 'stats':
+            return {'ok': True, **self.stats()}, b''
+        if command != 'build':
+            return {'ok': False, 'error': f'Comando desconhecido: {command}'}, b''
+        return self.build(message.get('artifact'), message.get('options') or {}, message.get('data_version'))
+
+    def build(self, artifact, options, data_version=None):
+        if artifact not in JOBS:
+            return {'ok': False, 'error': f'Artefato desconhecido: {artifact}'}, b''
+        if not isinstance(options, dict):
+            return {'ok': False, 'error': 'options deve ser um objeto JSON'}, b''
+        job, content_type, filename = JOBS[artifact]
+        try:
+            inspect.signature(job).bind(**options)
+        except TypeError as exc:
+            return {'ok': False, 'error': f'Opções inválidas para {artifact}: {exc}'}, b''
+
+        fingerprint = None
+        if self.store is not None:
+            fingerprint = job_fingerprint(artifact, options, data_version)
+        tenant = options.get('user_id')
+        if fingerprint is not None:
+            started = time.perf_counter()
+            content = self.store.get(artifact, tenant, fingerprint)
+            if content is not None:
+                return self._done(artifact, content_type, filename, started, content, cached=True)
+
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            return {'ok': False, 'error': 'Serviço ocupado: limite de pedidos em andamento atingido'}, b''
+        with self._lock:
+            self._pending += 1
+            pool = self._pool
+        started = time.perf_counter()
+        try:
+            content = pool.submit(run_job, artifact, options).result()
+        except BrokenProcessPool as exc:
+            # Um processo morreu (ex.: falta de memória): o pool é refeito
+            with self._lock:
+                if self._pool is pool:
+                    self._pool = self._new_pool()
+            return self._failed(artifact, started, repr(exc))
+        except Exception as exc:
+            return self._failed(artifact, started, f'{type(exc).__name__}: {exc}')
+        finally:
+            with self._lock:
+                self._pending -= 1
+            self._slots.release()
+
+        if fingerprint is not None:
+            self.store.put(artifact, tenant, fingerprint, content)
+        return self._done(artifact, content_type, filename, started, content, cached=False)
+
+    def _done(self, artifact, content_type, filename, started, content, cached):
+        seconds = time.perf_counter() - started
+        with self._lock:
+            counters = self._counters[artifact]
+            counters['requests'] += 1
+            counters['cached'] += cached
+            counters['seconds'] += seconds
+            counters['bytes'] += len(content)
+        header = {
+            'ok': True, 'artifact': artifact, 'content_type': content_type, 'filename': filename,
+            'bytes': len(content), 'seconds': round(seconds, 4), 'cached': cached,
+        }
+        return header, content
+
+    def _failed(self, artifact, started, error):
+        with self._lock:
+            counters = self._counters[artifact]
+            counters['requests'] += 1
+            counters['failed'] += 1
+            counters['seconds'] += time.perf_counter() - started
+        return {'ok': False, 'artifact': artifact, 'error': error}, b''
+
+    def stats(self):
+        """Estado do serviço (comando ``stats``, também usado como health check)"""
+        store = self.store.stats() if self.store is not None else None
+        with self._lock:
+            return {
+                'status': 'ok',
+                'pid': os.getpid(),
+                'uptime_s': round(time.time() - self.started, 1),
+                'jobs': self.jobs,
+                'queue': self.queue,
+                'running': min(self._pending, self.jobs),
+                'waiting': max(0, self._pending - self.jobs),
+                'rejected': self._rejected,
+                'artifacts': {name: dict(counters, seconds=round(counters['seconds'], 4))
+                              for name, counters in self._counters.items()},
+                'store': store,
+            }
+
+
+class _Handler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        line = self.rfile.readline(MAX_REQUEST_BYTES + 1)
+        if len(line) > MAX_REQUEST_BYTES:
+            header, content = {'ok': False, 'error': 'Pedido grande demais'}, b''
+        else:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                header, content = {'ok': False, 'error': 'Pedido não é JSON válido'}, b''
+            else:
+                header, content = self.server.service.handle(message)
+        try:
+            self.wfile.write(json.dumps(header, ensure_ascii=False).encode() + b'\n')
+            self.wfile.write(content)
+        except (BrokenPipeError, ConnectionResetError):
+            # O cliente desistiu do pedido
+            pass
+
+
+class ReportServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, service):
+        self.service = service
+        remove_stale_socket(socket_path)
+        super().__init__(socket_path, _Handler)
+        # Só o usuário do serviço (e do backend) conecta
+        os.chmod(socket_path, 0o600)
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+def remove_stale_socket(socket_path):
+    """Remove o socket de uma execução anterior; recusa se outro serviço estiver ativo"""
+    try:
+        mode = os.stat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f'{socket_path} existe e não é um socket')
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.unlink(socket_path)
+            return
+    raise FileExistsError(f'Já há um serviço ativo em {socket_path}')
+
+
+def serve(socket_path=DEFAULT_SOCKET, jobs=DEFAULT_JOBS, queue=DEFAULT_QUEUE, ready=None, store=None):
+    """Atende pedidos até SIGTERM/SIGINT (ou ``server.shutdown()``)
+
+    ``ready``, se dado, é chamado com o servidor quando ele aceita conexões.
+    ``store`` é o armazém de artefatos (ArtifactStore), se houver.
+    """
+    service = ReportService(jobs, queue, store)
+    try:
+        with ReportServer(socket_path, service) as server:
+            service.warm()
+            if threading.current_thread() is threading.main_thread():
+                signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+            if ready is not None:
+                ready(server)
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+    finally:
+        service.close()
+
+
+# ============ CLIENTE ============
+
+def request(socket_path, message, timeout=None):
+    """Envia um pedido ao serviço; devolve ``(cabeçalho, conteúdo)``
+
+    ``conteúdo`` são os bytes do artefato (vazio em erros e em ``stats``).
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path)
+        client.sendall(json.dumps(message, ensure_ascii=False).encode() + b'\n')
+        with client.makefile('rb') as response:
+            header = json.loads(response.readline())
+            content = response.read(header['bytes']) if header.get('ok') and 'bytes' in header else b''
+    if header.get('ok') and len(content) != header.get('bytes', 0):
+        raise ConnectionError(f'Resposta incompleta: {len(content)} de {header["bytes"]} bytes')
+    return header, content
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serviço residente de geração de planilhas e guias (socket Unix)')
+    parser.add_argument('--socket', default=DEFAULT_SOCKET, help='Caminho do socket Unix')
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS, help='Artefatos gerados ao mesmo tempo (processos)')
+    parser.add_argument(
+        '--queue', type=int, default=DEFAULT_QUEUE, help='Pedidos que aguardam a vez antes de o serviço recusar novos',
+    )
+    parser.add_argument(
+        '--store', metavar='PASTA', help='Armazém de artefatos: pedidos com as mesmas entradas são atendidos dele',
+    )
+    parser.add_argument(
+        '--store-max-mb', type=int, help='Tamanho máximo do armazém em MB (padrão: o gravado no armazém ou 512)',
+    )
+    parser.add_argument('--stats', action='store_true', help='Consulta o serviço ativo no socket e imprime o estado')
+    args = parser.parse_args(argv)
+
+    if args.stats:
+        try:
+            header, _ = request(args.socket, {'command': 'stats'}, timeout=5)
+        except OSError as exc:
+            print(f'❌ Serviço indisponível em {args.socket}: {exc}', file=sys.stderr)
+            raise SystemExit(1)
+        print(json.dumps(header, ensure_ascii=False, indent=2))
+        return
+
+    store = None
+    if args.store:
+        store = ArtifactStore(args.store, args.store_max_mb * 2 ** 20 if args.store_max_mb else None)
+    try:
+        serve(
+            args.socket, args.jobs, args.queue,
+            ready=lambda server: print(f'✅ Serviço de relatórios em {args.socket} ({args.jobs} processos)', flush=True),
+            store=store,
+        )
+    except FileExistsError as exc:
+        print(f'❌ {exc}', file=sys.stderr)
+        raise SystemExit(1)
+    finally:
+        if store is not None:
+            store.close()
+
+
+if __name__ == '__main__':
+    main()
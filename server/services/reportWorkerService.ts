@@ -0,0 +1,124 @@
+import net from "net";
+import { ENV } from "../_core/env";
+
+/**
+ * Report Worker Service
+ * Cliente do serviço residente de relatórios em Python (relatorios/servico.py).
+ * O serviço mantém openpyxl/python-docx carregados e responde por um socket Unix:
+ * uma linha JSON de pedido, uma linha JSON de cabeçalho e, em seguida, os bytes do arquivo.
+ * Setup: python -m relatorios.servico --socket /tmp/relatorios.sock
+ */
+
+export type ReportArtifact = "planilha-gaia3" | "planilha-apogeu" | "guia-gaia3" | "guia-apogeu";
+
+export interface ReportFile {
+  artifact: ReportArtifact;
+  contentType: string;
+  filename: string;
+  content: Buffer;
+  seconds: number;
+  cached: boolean;
+}
+
+export interface ReportWorkerStats {
+  status: string;
+  pid: number;
+  uptime_s: number;
+  jobs: number;
+  queue: number;
+  running: number;
+  waiting: number;
+  rejected: number;
+  artifacts: Record<
+    string,
+    { requests: number; failed: number; cached: number; seconds: number; bytes: number }
+  >;
+  /** Armazém de artefatos (relatorios/armazem.py); null se o serviço roda sem --store */
+  store: { entries: number; objects: number; bytes: number; max_bytes: number } | null;
+}
+
+interface ResponseHeader {
+  ok: boolean;
+  error?: string;
+  bytes?: number;
+  content_type?: string;
+  filename?: string;
+  seconds?: number;
+  cached?: boolean;
+  [key: string]: unknown;
+}
+
+const DEFAULT_TIMEOUT_MS = 120_000;
+
+function send(
+  message: Record<string, unknown>,
+  timeoutMs = DEFAULT_TIMEOUT_MS
+): Promise<{ header: ResponseHeader; content: Buffer }> {
+  return new Promise((resolve, reject) => {
+    const socket = net.createConnection(ENV.reportWorkerSocket);
+    const chunks: Buffer[] = [];
+    let received = 0;
+
+    socket.setTimeout(timeoutMs, () => socket.destroy(new Error("Report worker timeout")));
+    socket.on("connect", () => socket.write(JSON.stringify(message) + "\n"));
+    socket.on("data", (chunk: Buffer) => {
+      chunks.push(chunk);
+      received += chunk.length;
+    });
+    socket.on("error", reject);
+    socket.on("end", () => {
+      const response = Buffer.concat(chunks, received);
+      const newline = response.indexOf(0x0a);
+      if (newline < 0) {
+        reject(new Error("Report worker closed the connection without a response"));
+        return;
+      }
+      let header: ResponseHeader;
+      try {
+        header = JSON.parse(response.subarray(0, newline).toString("utf-8")) as ResponseHeader;
+      } catch (error) {
+        reject(new Error(`Invalid report worker header: ${(error as Error).message}`));
+        return;
+      }
+      const content = response.subarray(newline + 1);
+      if (header.ok && header.bytes !== undefined && content.length !== header.bytes) {
+        reject(new Error(`Incomplete report: ${content.length} of ${header.bytes} bytes`));
+        return;
+      }
+      resolve({ header, content });
+    });
+  });
+}
+
+/**
+ * Gera um relatório no serviço residente e devolve os bytes do arquivo
+ */
+export async function requestReport(
+  artifact: ReportArtifact,
+  options: Record<string, unknown> = {},
+  timeoutMs?: number
+): Promise<ReportFile> {
+  const { header, content } = await send({ artifact, options }, timeoutMs);
+  if (!header.ok) {
+    throw new Error(header.error ?? "Report worker error");
+  }
+  return {
+    artifact,
+    contentType: header.content_type ?? "application/octet-stream",
+    filename: header.filename ?? artifact,
+    content,
+    seconds: header.seconds ?? 0,
+    cached: header.cached ?? false,
+  };
+}
+
+/**
+ * Estado do serviço (health check)
+ */
+export async function getReportWorkerStats(timeoutMs = 5_000): Promise<ReportWorkerStats> {
+  const { header } = await send({ command: "stats" }, timeoutMs);
+  if (!header.ok) {
+    throw new Error(header.error ?? "Report worker error");
+  }
+  return header as unknown as ReportWorkerStats;
+}